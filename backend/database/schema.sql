@@ -130,6 +130,108 @@ CREATE TABLE IF NOT EXISTS insider_trades (
     FOREIGN KEY (ticker) REFERENCES companies(ticker)
 );
 
+--INGESTION WATERMARKS (latest stored period per ticker, maintained by fundamentals ingestion)
+
+CREATE TABLE IF NOT EXISTS ingestion_watermarks (
+    ticker            VARCHAR(20) NOT NULL,
+    period_type       VARCHAR(10) NOT NULL,  -- 'quarterly' / 'annual'
+    last_period_date  DATE,
+    last_checked_at   TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (ticker, period_type)
+);
+
+--VALIDATION WATERMARKS (last validated period/timestamp per ticker and rule, maintained by data validation)
+
+CREATE TABLE IF NOT EXISTS validation_watermarks (
+    ticker        VARCHAR(20) NOT NULL,
+    rule          VARCHAR(32) NOT NULL,  -- e.g. 'price_spikes', 'outliers_qoq'
+    last_key      TEXT,                  -- last validated period label or ISO timestamp
+    context       JSONB NOT NULL DEFAULT '{}',  -- previous close / revenue / labels the rule continues from
+    open_issues   JSONB NOT NULL DEFAULT '[]',  -- issues on already-validated rows, carried forward
+    validated_at  TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (ticker, rule)
+);
+
+--FUNDAMENTALS QUARANTINE (rows held back by inline validation during fundamentals ingestion)
+
+CREATE TABLE IF NOT EXISTS fundamentals_quarantine (
+    id             BIGSERIAL PRIMARY KEY,
+    ticker         VARCHAR(20) NOT NULL,
+    quarter        VARCHAR(10),
+    row_data       JSONB NOT NULL,  -- the fundamentals_quarterly row that was not inserted
+    issues         JSONB NOT NULL,  -- validation issues on that period
+    quarantined_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+--TECHNICAL INDICATORS (daily indicators per bar, maintained by services/indicators/engine.py)
+
+CREATE TABLE IF NOT EXISTS technical_indicators (
+    time          TIMESTAMP NOT NULL,
+    ticker        VARCHAR(10) NOT NULL,
+    sma_20        DOUBLE PRECISION,
+    sma_50        DOUBLE PRECISION,
+    sma_200       DOUBLE PRECISION,
+    ema_12        DOUBLE PRECISION,
+    ema_26        DOUBLE PRECISION,
+    macd          DOUBLE PRECISION,
+    macd_signal   DOUBLE PRECISION,
+    macd_hist     DOUBLE PRECISION,
+    rsi_14        DOUBLE PRECISION,
+    atr_14        DOUBLE PRECISION,
+    bb_upper      DOUBLE PRECISION,
+    bb_middle     DOUBLE PRECISION,
+    bb_lower      DOUBLE PRECISION,
+    high_52w      DOUBLE PRECISION,
+    low_52w       DOUBLE PRECISION,
+    volume_avg_20 DOUBLE PRECISION,
+    volume_avg_50 DOUBLE PRECISION,
+    PRIMARY KEY (time, ticker)
+);
+
+--INDICATOR STATE (last computed bar and EMA / Wilder averages per ticker, for incremental refreshes)
+
+CREATE TABLE IF NOT EXISTS indicator_state (
+    ticker      VARCHAR(20) PRIMARY KEY,
+    last_time   TIMESTAMP NOT NULL,
+    state       JSONB NOT NULL DEFAULT '{}',  -- name -> [average, seed count, seed sum]
+    updated_at  TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+--Latest indicator values per ticker, for screener filters
+CREATE OR REPLACE VIEW latest_technical_indicators AS
+SELECT DISTINCT ON (ticker) *
+FROM technical_indicators
+ORDER BY ticker, time DESC;
+
+--PRICE ROLLUPS (weekly / monthly OHLCV per ticker, maintained by services/market_ingestion/price_rollups.py)
+
+CREATE TABLE IF NOT EXISTS price_history_weekly (
+    bucket  TIMESTAMP NOT NULL,  -- Monday of the week
+    ticker  VARCHAR(10) NOT NULL,
+    open    NUMERIC(10,4),
+    high    NUMERIC(10,4),
+    low     NUMERIC(10,4),
+    close   NUMERIC(10,4),
+    volume  BIGINT,
+    bars    INTEGER NOT NULL,    -- daily bars in the bucket
+    PRIMARY KEY (bucket, ticker)
+);
+
+CREATE TABLE IF NOT EXISTS price_history_monthly (
+    bucket  TIMESTAMP NOT NULL,  -- first day of the month
+    ticker  VARCHAR(10) NOT NULL,
+    open    NUMERIC(10,4),
+    high    NUMERIC(10,4),
+    low     NUMERIC(10,4),
+    close   NUMERIC(10,4),
+    volume  BIGINT,
+    bars    INTEGER NOT NULL,
+    PRIMARY KEY (bucket, ticker)
+);
+
+-- With price_history as a hypertable, skip the two tables above: price_rollups.py
+-- creates them as continuous aggregates (time_bucket + first/last, real-time) instead.
+
 -- _______________________________________________
 --INDEXES
 --_________________________________________________
@@ -148,6 +250,16 @@ ON companies(market_cap);
 CREATE INDEX IF NOT EXISTS idx_price_history_ticker_time 
 ON price_history(ticker, time desc);
 
+--PRICE ROLLUPS
+CREATE INDEX IF NOT EXISTS idx_price_history_weekly_ticker_bucket
+ON price_history_weekly(ticker, bucket desc);
+CREATE INDEX IF NOT EXISTS idx_price_history_monthly_ticker_bucket
+ON price_history_monthly(ticker, bucket desc);
+
+--TECHNICAL INDICATORS
+CREATE INDEX IF NOT EXISTS idx_technical_indicators_ticker_time
+ON technical_indicators(ticker, time desc);
+
 --FUNDAMENTALS
 CREATE INDEX IF NOT EXISTS idx_fundamentals_qticker 
 ON fundamentals_quarterly(ticker);
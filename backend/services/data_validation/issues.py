@@ -0,0 +1,19 @@
+import sys
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Issue:
+    symbol: str
+    issue_type: str
+    severity: str  # HIGH / MEDIUM / LOW
+    affected_period: str
+    suggested_action: str
+    details: str = ""
+
+    def __post_init__(self):
+        # Categorical fields repeat across millions of issues: share one string object per value
+        self.symbol = sys.intern(self.symbol)
+        self.issue_type = sys.intern(self.issue_type)
+        self.severity = sys.intern(self.severity)
+        self.suggested_action = sys.intern(self.suggested_action)
@@ -0,0 +1,91 @@
+"""
+Streaming validation report.
+
+Issues are appended to the CSV report as they are produced, so a run never
+holds more than one batch of them. Severity and issue-type counters are kept
+as they go, plus a bounded sample (most severe first, then in arrival order)
+for the Markdown summary.
+"""
+import csv
+import heapq
+import logging
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+from services.data_validation.issues import Issue
+
+CSV_HEADER = ["Symbol", "Issue Type", "Severity", "Affected Period", "Suggested Action", "Details"]
+SEVERITY_RANK = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
+
+
+class ReportSink:
+    def __init__(self, reports_dir: Path, logger: logging.Logger, sample_size: int = 300, name: str = "validation_summary"):
+        """name: report file prefix; files are <name>_<timestamp>.csv / .md"""
+        self.logger = logger
+        self.sample_size = sample_size
+        reports_dir.mkdir(parents=True, exist_ok=True)
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.csv_path = reports_dir / f"{name}_{ts}.csv"
+        self.md_path = reports_dir / f"{name}_{ts}.md"
+
+        self.total = 0
+        self.by_severity: Counter = Counter()
+        self.by_type: Counter = Counter()
+        # Max-heap on (severity rank, arrival) via negated keys: the root is the first sample to evict
+        self._sample: List[Tuple[int, int, Issue]] = []
+
+        self._csv_file = self.csv_path.open("w", newline="", encoding="utf-8")
+        self._csv = csv.writer(self._csv_file)
+        self._csv.writerow(CSV_HEADER)
+
+    def add(self, issues: Iterable[Issue]) -> None:
+        for it in issues:
+            self._csv.writerow([it.symbol, it.issue_type, it.severity, it.affected_period, it.suggested_action, it.details])
+            self.by_severity[it.severity] += 1
+            self.by_type[it.issue_type] += 1
+
+            key = (-SEVERITY_RANK.get(it.severity, len(SEVERITY_RANK)), -self.total, it)
+            if len(self._sample) < self.sample_size:
+                heapq.heappush(self._sample, key)
+            elif self.sample_size and key[:2] > self._sample[0][:2]:
+                heapq.heapreplace(self._sample, key)
+            self.total += 1
+        # Issues arrive one batch at a time; keep the CSV current
+        self._csv_file.flush()
+
+    def sample(self) -> List[Issue]:
+        """Kept issues, most severe first, then in the order they were produced."""
+        return [it for _, _, it in sorted(self._sample, key=lambda k: (-k[0], -k[1]))]
+
+    def close(self) -> Tuple[Path, Path]:
+        self._csv_file.close()
+
+        with self.md_path.open("w", encoding="utf-8") as f:
+            f.write("# Validation Summary (Task 7)\n\n")
+            f.write(f"Generated: {datetime.now().isoformat()}\n\n")
+            if not self.total:
+                f.write("✅ No issues detected.\n")
+            else:
+                f.write(f"Total issues: **{self.total}**\n\n")
+                f.write("| Severity | Count |\n")
+                f.write("|---|---|\n")
+                for severity, count in sorted(self.by_severity.items(), key=lambda kv: SEVERITY_RANK.get(kv[0], len(SEVERITY_RANK))):
+                    f.write(f"| {severity} | {count} |\n")
+
+                f.write("\n| Issue Type | Count |\n")
+                f.write("|---|---|\n")
+                for issue_type, count in self.by_type.most_common():
+                    f.write(f"| {issue_type} | {count} |\n")
+
+                f.write("\n| Symbol | Issue Type | Severity | Period | Suggested Action |\n")
+                f.write("|---|---|---|---|---|\n")
+                for it in self.sample():
+                    f.write(f"| {it.symbol} | {it.issue_type} | {it.severity} | {it.affected_period} | {it.suggested_action} |\n")
+
+                if self.total > self.sample_size:
+                    f.write(f"\n... truncated, showing {self.sample_size} of {self.total} issues (most severe first).\n")
+
+        self.logger.info(f"Reports written: {self.csv_path} and {self.md_path}")
+        return self.csv_path, self.md_path
@@ -0,0 +1,3 @@
+# Importing the rule modules registers their rules; registration order is report order
+from services.data_validation.rules import quarterly  # noqa: F401
+from services.data_validation.rules import prices  # noqa: F401
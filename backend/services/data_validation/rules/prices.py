@@ -0,0 +1,53 @@
+"""
+Price history rules over (time, close, volume) bars in time order.
+
+Each rule has a row-by-row reference validator, (symbol, points) -> issues,
+and a kernel over the shared price SeriesFrame.
+"""
+from datetime import datetime
+from typing import List, Tuple
+
+from services.data_validation.issues import Issue
+from services.data_validation.rules.registry import register_rule
+from services.data_validation.validators.rolling import RollingPriceState
+from services.data_validation.validators.vectorized import price_spikes_kernel
+
+
+# -----------------------------
+# Reference validators
+# -----------------------------
+def validate_price_spikes(symbol: str, points: List[Tuple[datetime, float]]) -> List[Issue]:
+    issues: List[Issue] = []
+    closes = [(t, c) for (t, c, *_) in points if c is not None]
+    for i in range(1, len(closes)):
+        t0, p0 = closes[i - 1]
+        t1, p1 = closes[i]
+        if p0 != 0:
+            jump = (p1 - p0) / abs(p0)
+            if abs(jump) > 0.40:
+                issues.append(Issue(symbol, "Price spike", "MEDIUM", t1.strftime("%Y-%m-%d"), "Manual review", f"{jump*100:.1f}% day change"))
+    return issues
+
+
+def validate_rolling_prices(symbol: str, points: List[Tuple]) -> List[Issue]:
+    return RollingPriceState().update(symbol, points)
+
+
+# -----------------------------
+# Frame kernels (registration order = report order)
+# -----------------------------
+@register_rule("price_spikes", "price", ("time", "close"), validate_price_spikes, lag=("close",))
+def price_spikes(frame) -> List[Issue]:
+    return price_spikes_kernel(frame.symbols, frame.groups, frame.column("time"), frame.lag("close"))
+
+
+@register_rule("rolling_prices", "price", ("time", "close", "volume"), validate_rolling_prices, sequential=True)
+def rolling_prices(frame) -> List[Issue]:
+    # Window state is sequential: walk the shared columns instead of re-reading the bars
+    times, closes, volumes = frame.column("time"), frame.column("close"), frame.column("volume")
+    issues: List[Issue] = []
+    for sym, start, end in frame.slices():
+        state = RollingPriceState()
+        for i in range(start, end):
+            state.step(sym, times[i], closes[i], volumes[i], issues)
+    return issues
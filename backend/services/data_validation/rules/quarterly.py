@@ -0,0 +1,209 @@
+"""
+Quarterly metric rules.
+
+Each rule has a row-by-row reference validator, (symbol, rows) -> issues, and
+a kernel over the shared quarterly SeriesFrame. Both give the same issues in
+the same order.
+"""
+import re
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+
+from services.data_validation.issues import Issue
+from services.data_validation.rules.registry import register_rule
+from services.data_validation.validators.rolling import RollingFundamentalsState
+from services.data_validation.validators.vectorized import (
+    MISSING_RULES,
+    missing_quarterly_kernel,
+    numeric_types_kernel,
+    outliers_qoq_kernel,
+)
+
+NUMERIC_FIELDS = ("revenue", "ebitda", "eps", "free_cash_flow", "total_debt")
+
+# Labels the ingestion writes; only these advance a quarterly watermark
+WELL_FORMED_QUARTER = re.compile(r"^\d{4}-Q[1-4]$")
+
+
+def parse_quarter_label(q: str) -> Tuple[int, int]:
+    """
+    Accepts: '2023-Q1'
+    Returns: (year, quarter)
+    """
+    y, qn = q.split("-Q")
+    return int(y), int(qn)
+
+
+def quarter_to_date_start(year: int, quarter: int) -> date:
+    # Q1 -> Jan 1, Q2 -> Apr 1, Q3 -> Jul 1, Q4 -> Oct 1
+    month = (quarter - 1) * 3 + 1
+    return date(year, month, 1)
+
+
+def is_number(x: Any) -> bool:
+    try:
+        if x is None:
+            return False
+        float(x)
+        return True
+    except Exception:
+        return False
+
+
+def quarter_series(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [r for r in rows if r.get("period_label") is not None and WELL_FORMED_QUARTER.match(str(r["period_label"]))]
+
+
+# -----------------------------
+# Reference validators
+# -----------------------------
+def validate_missing_quarterly(symbol: str, rows: List[Dict[str, Any]]) -> List[Issue]:
+    issues: List[Issue] = []
+    # mandatory: revenue, eps (you can change to your rules)
+    for r in rows:
+        pl = str(r["period_label"])
+        if r.get("revenue") is None:
+            issues.append(Issue(symbol, "Missing revenue", "HIGH", pl, "Impute/Refetch", "revenue is NULL"))
+        if r.get("eps") is None:
+            issues.append(Issue(symbol, "Missing EPS", "MEDIUM", pl, "Impute/Refetch", "eps is NULL"))
+        # Optional: EBITDA might not exist in your current provider output
+        if r.get("ebitda") is None:
+            issues.append(Issue(symbol, "Missing EBITDA", "MEDIUM", pl, "Refetch/Compute", "ebitda is NULL"))
+    return issues
+
+
+def quarter_continuity_issues(symbol: str, labels: List[str]) -> List[Issue]:
+    issues: List[Issue] = []
+    if not labels:
+        issues.append(Issue(symbol, "No quarterly periods", "HIGH", "-", "Skip company", "No quarterly rows found"))
+        return issues
+
+    # duplicates
+    seen = set()
+    for lb in labels:
+        if lb in seen:
+            issues.append(Issue(symbol, "Duplicate quarter label", "HIGH", lb, "Deduplicate", "Duplicate period label"))
+        seen.add(lb)
+
+    # future-dated
+    today = date.today()
+    for lb in labels:
+        try:
+            y, qn = parse_quarter_label(lb)
+            start = quarter_to_date_start(y, qn)
+            if start > today + timedelta(days=31):
+                issues.append(Issue(symbol, "Future-dated quarter", "HIGH", lb, "Skip row", f"Quarter start {start} > today"))
+        except Exception:
+            issues.append(Issue(symbol, "Quarter label parse failed", "HIGH", lb, "Fix/Normalize", "Could not parse quarter label"))
+
+    # missing gaps (expect step of 3 months)
+    parsed = []
+    for lb in labels:
+        try:
+            y, qn = parse_quarter_label(lb)
+            parsed.append((y, qn, lb))
+        except Exception:
+            continue
+    parsed.sort()
+
+    for i in range(1, len(parsed)):
+        py, pq, plb = parsed[i - 1]
+        cy, cq, clb = parsed[i]
+        prev_index = py * 4 + pq
+        curr_index = cy * 4 + cq
+        if curr_index - prev_index > 1:
+            issues.append(
+                Issue(
+                    symbol,
+                    "Missing quarter gap",
+                    "HIGH",
+                    f"{plb} -> {clb}",
+                    "Refetch missing quarters",
+                    f"Gap of {curr_index - prev_index - 1} quarter(s)",
+                )
+            )
+    return issues
+
+
+def validate_quarter_continuity(symbol: str, rows: List[Dict[str, Any]]) -> List[Issue]:
+    return quarter_continuity_issues(symbol, [str(r["period_label"]) for r in rows if r.get("period_label")])
+
+
+def validate_numeric_types(symbol: str, rows: List[Dict[str, Any]]) -> List[Issue]:
+    issues: List[Issue] = []
+    for r in rows:
+        pl = str(r.get("period_label", "-"))
+        for f in NUMERIC_FIELDS:
+            v = r.get(f)
+            if v is None:
+                continue
+            if not is_number(v):
+                issues.append(Issue(symbol, "Non-numeric field", "HIGH", pl, "Fix normalization", f"{f}='{v}'"))
+    return issues
+
+
+def validate_outliers_qoq(symbol: str, rows: List[Dict[str, Any]]) -> List[Issue]:
+    issues: List[Issue] = []
+    # revenue spike > 300% QoQ
+    series = []
+    for r in rows:
+        if r.get("revenue") is not None and is_number(r.get("revenue")):
+            series.append((str(r["period_label"]), float(r["revenue"])))
+    for i in range(1, len(series)):
+        prev_label, prev_val = series[i - 1]
+        curr_label, curr_val = series[i]
+        if prev_val != 0:
+            growth = (curr_val - prev_val) / abs(prev_val)
+            if growth > 3.0:
+                issues.append(Issue(symbol, "Revenue spike QoQ", "MEDIUM", curr_label, "Manual review", f"{growth*100:.1f}% QoQ"))
+    return issues
+
+
+def validate_rolling_fundamentals(symbol: str, rows: List[Dict[str, Any]]) -> List[Issue]:
+    # Adaptive per-ticker thresholds; only well-formed quarters form the series
+    return RollingFundamentalsState().update(symbol, quarter_series(rows))
+
+
+# -----------------------------
+# Frame kernels (registration order = report order)
+# -----------------------------
+@register_rule("missing_quarterly", "quarterly", ("period_label", "revenue", "eps", "ebitda"), validate_missing_quarterly)
+def missing_quarterly(frame) -> List[Issue]:
+    masks = [frame.nulls(field) for field, _, _, _ in MISSING_RULES]
+    return missing_quarterly_kernel(frame.symbols, frame.groups, frame.column("period_label"), masks)
+
+
+@register_rule("quarter_continuity", "quarterly", ("period_label",), validate_quarter_continuity, sequential=True)
+def quarter_continuity(frame) -> List[Issue]:
+    # Duplicates and gaps look at the whole label sequence, so this one runs per ticker
+    labels = frame.column("period_label")
+    issues: List[Issue] = []
+    for sym, start, end in frame.slices():
+        issues += quarter_continuity_issues(sym, [str(lb) for lb in labels[start:end] if lb])
+    return issues
+
+
+@register_rule("numeric_types", "quarterly", ("period_label",) + NUMERIC_FIELDS, validate_numeric_types)
+def numeric_types(frame) -> List[Issue]:
+    # Present but not convertible to float
+    bad = [~frame.numeric(field)[1] & ~frame.nulls(field) for field in NUMERIC_FIELDS]
+    columns = [frame.column(field) for field in NUMERIC_FIELDS]
+    return numeric_types_kernel(frame.symbols, frame.groups, frame.column("period_label"), list(NUMERIC_FIELDS), columns, bad)
+
+
+@register_rule("outliers_qoq", "quarterly", ("period_label", "revenue"), validate_outliers_qoq, lag=("revenue",))
+def outliers_qoq(frame) -> List[Issue]:
+    return outliers_qoq_kernel(frame.symbols, frame.groups, frame.column("period_label"), frame.lag("revenue"))
+
+
+@register_rule("rolling_fundamentals", "quarterly", ("period_label", "revenue", "eps"), validate_rolling_fundamentals, sequential=True)
+def rolling_fundamentals(frame) -> List[Issue]:
+    # Window state is sequential: walk the shared columns instead of re-reading the rows
+    labels, revenue, eps = frame.column("period_label"), frame.column("revenue"), frame.column("eps")
+    issues: List[Issue] = []
+    for sym, start, end in frame.slices():
+        state = RollingFundamentalsState()
+        for i in range(start, end):
+            if labels[i] is not None and WELL_FORMED_QUARTER.match(str(labels[i])):
+                state.step(sym, labels[i], revenue[i], eps[i], issues)
+    return issues
@@ -0,0 +1,67 @@
+"""
+Validation rule registry.
+
+A rule declares which series it reads ("quarterly" metric rows or "price"
+bars), the fields it needs from each row, the fields whose previous valid
+value it compares against (lag) and whether it reads the whole ordered
+series (sequential). Rules with neither only look at one row at a time. The executor builds those columns
+and lag pairs once per ticker and hands the same frame to every rule, so
+registering a rule adds a kernel call, not another pass over the rows.
+
+Rules run (and report) in registration order.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.data_validation.issues import Issue
+
+SOURCES = ("quarterly", "price")
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    source: str  # quarterly / price
+    fields: Tuple[str, ...]
+    kernel: Callable[[Any], List[Issue]]  # fused implementation over a SeriesFrame
+    reference: Callable[[str, List[Any]], List[Issue]]  # row-by-row implementation, (symbol, rows)
+    lag: Tuple[str, ...] = ()
+    sequential: bool = False
+
+    @property
+    def row_local(self) -> bool:
+        return not self.lag and not self.sequential
+
+
+RULE_REGISTRY: Dict[str, Rule] = {}
+
+
+def register_rule(
+    name: str,
+    source: str,
+    fields: Tuple[str, ...],
+    reference: Callable[[str, List[Any]], List[Issue]],
+    lag: Tuple[str, ...] = (),
+    sequential: bool = False,
+) -> Callable:
+    """Decorator registering a frame kernel as rule `name`."""
+    if source not in SOURCES:
+        raise ValueError(f"Unknown rule source '{source}'. Choose from: {', '.join(SOURCES)}")
+
+    def decorator(kernel: Callable[[Any], List[Issue]]) -> Callable[[Any], List[Issue]]:
+        if name in RULE_REGISTRY:
+            raise ValueError(f"Rule '{name}' is already registered")
+        RULE_REGISTRY[name] = Rule(name, source, tuple(fields), kernel, reference, tuple(lag), sequential)
+        return kernel
+
+    return decorator
+
+
+def get_rules(names: Optional[List[str]] = None) -> List[Rule]:
+    """Registered rules in registration order, optionally restricted to `names`."""
+    if names is None:
+        return list(RULE_REGISTRY.values())
+    unknown = [n for n in names if n not in RULE_REGISTRY]
+    if unknown:
+        raise ValueError(f"Unknown rule(s): {', '.join(unknown)}. Choose from: {', '.join(RULE_REGISTRY)}")
+    return [rule for rule in RULE_REGISTRY.values() if rule.name in names]
@@ -1,16 +1,35 @@
+"""
+Data validation (Task 7).
+
+Run from the repository root:
+    PYTHONPATH=backend python -m services.data_validation.validate_data --max-tickers 50
+
+Runs are incremental: each (ticker, rule) resumes from its row in validation_watermarks
+and carries forward still-open issues. --full re-scans all history.
+"""
 import os
-import csv
 import sys
-import math
 import argparse
 import logging
-from dataclasses import dataclass
-from datetime import datetime, date, timedelta
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import astuple
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import psycopg2
 
+from services.data_validation.issues import Issue
+from services.data_validation.report_sink import ReportSink
+from services.data_validation.rules.quarterly import WELL_FORMED_QUARTER, is_number, quarter_series
+from services.data_validation.rules.registry import RULE_REGISTRY
+from services.data_validation.validators.executor import RuleExecutor
+from services.data_validation.validators.price_stream import PricePoint, PriceScanner, PriceSpikeState
+from services.data_validation.validators.rolling import RollingFundamentalsState, RollingPriceState
+from services.data_validation.validators.sql_pushdown import parse_pushdown_rules, run_pushdown
+from services.data_validation.watermarks import RuleWatermark, ensure_watermarks_table, load_watermarks, save_watermarks
+
 
 BASE_DIR = Path("backend/services/data_validation")
 LOG_DIR = BASE_DIR / "logs"
@@ -18,16 +37,22 @@ REPORTS_DIR = BASE_DIR / "reports"
 
 # Helpers
 
-def setup_logger() -> Tuple[logging.Logger, Path]:
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_path = LOG_DIR / f"validation_{ts}.log"
+def setup_logger(log_path: Optional[Path] = None, label: str = "") -> Tuple[logging.Logger, Path]:
+    """
+    New run log, or (for worker processes) append to the parent's log with a label prefix.
+    """
+    is_worker = log_path is not None
+    if not is_worker:
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        log_path = LOG_DIR / f"validation_{ts}.log"
 
     logger = logging.getLogger("data_validation")
     logger.setLevel(logging.INFO)
     logger.handlers.clear()
 
-    fmt = logging.Formatter("[%(levelname)s] %(asctime)s - %(message)s")
+    prefix = f"[{label}] " if label else ""
+    fmt = logging.Formatter(f"[%(levelname)s] %(asctime)s - {prefix}%(message)s")
 
     fh = logging.FileHandler(log_path, encoding="utf-8")
     fh.setFormatter(fmt)
@@ -37,7 +62,8 @@ def setup_logger() -> Tuple[logging.Logger, Path]:
     sh.setFormatter(fmt)
     logger.addHandler(sh)
 
-    logger.info(f"Logging to {log_path}")
+    if not is_worker:
+        logger.info(f"Logging to {log_path}")
     return logger, log_path
 
 
@@ -60,80 +86,10 @@ def get_db_conn():
     )
 
 
-def parse_quarter_label(q: str) -> Tuple[int, int]:
-    """
-    Accepts: '2023-Q1'
-    Returns: (year, quarter)
-    """
-    y, qn = q.split("-Q")
-    return int(y), int(qn)
-
-
-def quarter_to_date_start(year: int, quarter: int) -> date:
-    # Q1 -> Jan 1, Q2 -> Apr 1, Q3 -> Jul 1, Q4 -> Oct 1
-    month = (quarter - 1) * 3 + 1
-    return date(year, month, 1)
-
-
-def is_number(x: Any) -> bool:
-    try:
-        if x is None:
-            return False
-        float(x)
-        return True
-    except Exception:
-        return False
-
-
-def mean_std(values: List[float]) -> Tuple[float, float]:
-    if not values:
-        return 0.0, 0.0
-    m = sum(values) / len(values)
-    var = sum((v - m) ** 2 for v in values) / max(1, (len(values) - 1))
-    return m, math.sqrt(var)
-
-
-@dataclass
-class Issue:
-    symbol: str
-    issue_type: str
-    severity: str  # HIGH / MEDIUM / LOW
-    affected_period: str
-    suggested_action: str
-    details: str = ""
-
-
 def write_reports(issues: List[Issue], logger: logging.Logger) -> Tuple[Path, Path]:
-    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    csv_path = REPORTS_DIR / f"validation_summary_{ts}.csv"
-    md_path = REPORTS_DIR / f"validation_summary_{ts}.md"
-
-    # CSV
-    with csv_path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(["Symbol", "Issue Type", "Severity", "Affected Period", "Suggested Action", "Details"])
-        for it in issues:
-            w.writerow([it.symbol, it.issue_type, it.severity, it.affected_period, it.suggested_action, it.details])
-
-    # MD
-    with md_path.open("w", encoding="utf-8") as f:
-        f.write("# Validation Summary (Task 7)\n\n")
-        f.write(f"Generated: {datetime.now().isoformat()}\n\n")
-        if not issues:
-            f.write("✅ No issues detected.\n")
-        else:
-            f.write(f"Total issues: **{len(issues)}**\n\n")
-            f.write("| Symbol | Issue Type | Severity | Period | Suggested Action |\n")
-            f.write("|---|---|---|---|---|\n")
-            for it in issues[:300]:
-                f.write(f"| {it.symbol} | {it.issue_type} | {it.severity} | {it.affected_period} | {it.suggested_action} |\n")
-
-            if len(issues) > 300:
-                f.write(f"\n... truncated, showing first 300 issues.\n")
-
-    logger.info(f"Reports written: {csv_path} and {md_path}")
-    return csv_path, md_path
+    sink = ReportSink(REPORTS_DIR, logger)
+    sink.add(issues)
+    return sink.close()
 
 
 
@@ -151,10 +107,22 @@ def fetch_tickers(conn, limit: int = 0) -> List[str]:
         return [r[0] for r in cur.fetchall()]
 
 
-def fetch_quarterly_metrics(conn, ticker: str) -> List[Dict[str, Any]]:
+def _metrics_row(r: Tuple) -> Dict[str, Any]:
+    return {
+        "period_label": r[0],
+        "revenue": r[1],
+        "ebitda": r[2],
+        "eps": r[3],
+        "free_cash_flow": r[4],
+        "total_debt": r[5],
+    }
+
+
+def fetch_quarterly_metrics(conn, ticker: str, since: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Prefer metrics_normalized if it has richer fields.
     Fallback: fundamentals_quarterly
+    since: only periods labelled after this one (incremental runs)
     """
     # Try metrics_normalized
     with conn.cursor() as cur:
@@ -162,180 +130,450 @@ def fetch_quarterly_metrics(conn, ticker: str) -> List[Dict[str, Any]]:
             """
             SELECT period_label, revenue, ebitda, eps, free_cash_flow, total_debt
             FROM metrics_normalized
-            WHERE ticker=%s AND period_type='quarterly'
-            ORDER BY period_label ASC
+            WHERE ticker=%s AND period_type='quarterly' AND (%s::text IS NULL OR period_label > %s OR period_label IS NULL)
+            ORDER BY period_label ASC, revenue ASC
             """,
-            (ticker,),
+            (ticker, since, since),
         )
         rows = cur.fetchall()
 
     if rows:
-        return [
-            {
-                "period_label": r[0],
-                "revenue": r[1],
-                "ebitda": r[2],
-                "eps": r[3],
-                "free_cash_flow": r[4],
-                "total_debt": r[5],
-            }
-            for r in rows
-        ]
+        return [_metrics_row(r) for r in rows]
 
-    # Fallback fundamentals_quarterly
+    # Fallback fundamentals_quarterly (only for tickers metrics_normalized has no periods for at all)
     with conn.cursor() as cur:
         cur.execute(
             """
             SELECT quarter, revenue, NULL::numeric as ebitda, eps, NULL::numeric as free_cash_flow, NULL::numeric as total_debt
-            FROM fundamentals_quarterly
-            WHERE ticker=%s
-            ORDER BY quarter ASC
+            FROM fundamentals_quarterly f
+            WHERE ticker=%s AND (%s::text IS NULL OR quarter > %s)
+              AND NOT EXISTS (SELECT 1 FROM metrics_normalized m WHERE m.ticker = f.ticker AND m.period_type='quarterly')
+            ORDER BY quarter ASC, revenue ASC
             """,
-            (ticker,),
+            (ticker, since, since),
         )
         rows = cur.fetchall()
 
-    return [
-        {
-            "period_label": r[0],
-            "revenue": r[1],
-            "ebitda": r[2],
-            "eps": r[3],
-            "free_cash_flow": r[4],
-            "total_debt": r[5],
-        }
-        for r in rows
-    ]
+    return [_metrics_row(r) for r in rows]
+
+
+def fetch_quarterly_metrics_bulk(
+    conn, tickers: List[str], since: Optional[Dict[str, Optional[str]]] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Set-based fetch_quarterly_metrics: at most two queries for all tickers.
+    Tickers without metrics_normalized rows fall back to fundamentals_quarterly.
+    Rows are grouped per ticker in the same order as the per-ticker query.
+    since: per-ticker last validated label; only later periods are returned
+    """
+    grouped: Dict[str, List[Dict[str, Any]]] = {t: [] for t in tickers}
+    if not tickers:
+        return grouped
+    since = since or {}
+
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT m.ticker, period_label, revenue, ebitda, eps, free_cash_flow, total_debt
+            FROM metrics_normalized m
+            JOIN unnest(%s::text[], %s::text[]) AS w(ticker, since) ON w.ticker = m.ticker
+            WHERE period_type='quarterly' AND (w.since IS NULL OR period_label > w.since OR period_label IS NULL)
+            ORDER BY m.ticker ASC, period_label ASC, revenue ASC
+            """,
+            (list(tickers), [since.get(t) for t in tickers]),
+        )
+        for r in cur.fetchall():
+            grouped[r[0]].append(_metrics_row(r[1:]))
+
+    missing = [t for t in tickers if not grouped[t]]
+    if not missing:
+        return grouped
+
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT f.ticker, quarter, revenue, NULL::numeric as ebitda, eps, NULL::numeric as free_cash_flow, NULL::numeric as total_debt
+            FROM fundamentals_quarterly f
+            JOIN unnest(%s::text[], %s::text[]) AS w(ticker, since) ON w.ticker = f.ticker
+            WHERE (w.since IS NULL OR quarter > w.since)
+              AND NOT EXISTS (SELECT 1 FROM metrics_normalized m WHERE m.ticker = f.ticker AND m.period_type='quarterly')
+            ORDER BY f.ticker ASC, quarter ASC, revenue ASC
+            """,
+            (missing, [since.get(t) for t in missing]),
+        )
+        for r in cur.fetchall():
+            grouped[r[0]].append(_metrics_row(r[1:]))
+
+    return grouped
 
 
-def fetch_price_history(conn, ticker: str, days: int = 90) -> List[Tuple[datetime, float]]:
+def fetch_price_history(
+    conn, ticker: str, days: int = 90, since: Optional[str] = None
+) -> List[Tuple[datetime, Optional[float], Optional[float]]]:
+    """(time, close, volume) bars in time order."""
     with conn.cursor() as cur:
         cur.execute(
             """
-            SELECT time, close
+            SELECT time, close, volume
             FROM price_history
             WHERE ticker=%s AND time >= NOW() - (%s || ' days')::interval
+              AND (%s::timestamp IS NULL OR time > %s::timestamp)
             ORDER BY time ASC
             """,
-            (ticker, days),
+            (ticker, days, since, since),
+        )
+        return [
+            (r[0], float(r[1]) if r[1] is not None else None, float(r[2]) if r[2] is not None else None)
+            for r in cur.fetchall()
+        ]
+
+
+def fetch_price_history_bulk(
+    conn, tickers: List[str], days: int = 90, since: Optional[Dict[str, Optional[str]]] = None
+) -> Dict[str, List[Tuple[datetime, Optional[float], Optional[float]]]]:
+    """
+    Set-based fetch_price_history: one query for all tickers, grouped per ticker in time order.
+    since: per-ticker last validated timestamp; only later bars are returned
+    """
+    grouped: Dict[str, List[Tuple[datetime, Optional[float], Optional[float]]]] = {t: [] for t in tickers}
+    if not tickers:
+        return grouped
+    since = since or {}
+
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT p.ticker, time, close, volume
+            FROM price_history p
+            JOIN unnest(%s::text[], %s::timestamp[]) AS w(ticker, since) ON w.ticker = p.ticker
+            WHERE time >= NOW() - (%s || ' days')::interval AND (w.since IS NULL OR time > w.since)
+            ORDER BY p.ticker ASC, time ASC
+            """,
+            (list(tickers), [since.get(t) for t in tickers], days),
         )
-        return [(r[0], float(r[1]) if r[1] is not None else None) for r in cur.fetchall()]
+        for r in cur.fetchall():
+            grouped[r[0]].append((r[1], float(r[2]) if r[2] is not None else None, float(r[3]) if r[3] is not None else None))
+    return grouped
+
+
+def iter_price_history_chunks(
+    conn, tickers: List[str], days: int = 90, since: Optional[Dict[str, Optional[str]]] = None, itersize: int = 20000
+) -> Iterator[List[Tuple[str, datetime, Optional[float], Optional[float]]]]:
+    """
+    Streaming fetch_price_history_bulk: a named (server-side) cursor hands over (ticker, time, close, volume)
+    rows itersize at a time, ordered by ticker and time, so memory stays flat for any lookback.
+    """
+    if not tickers:
+        return
+    since = since or {}
+
+    with conn.cursor(name="price_history_stream") as cur:
+        cur.itersize = itersize
+        cur.execute(
+            """
+            SELECT p.ticker, time, close::float8, volume::float8
+            FROM price_history p
+            JOIN unnest(%s::text[], %s::timestamp[]) AS w(ticker, since) ON w.ticker = p.ticker
+            WHERE time >= NOW() - (%s || ' days')::interval AND (w.since IS NULL OR time > w.since)
+            ORDER BY p.ticker ASC, time ASC
+            """,
+            (list(tickers), [since.get(t) for t in tickers], days),
+        )
+        while True:
+            rows = cur.fetchmany(itersize)
+            if not rows:
+                break
+            yield rows
 
 
 # -----------------------------
 # Validators
 # -----------------------------
-def validate_missing_quarterly(symbol: str, rows: List[Dict[str, Any]]) -> List[Issue]:
-    issues: List[Issue] = []
-    # mandatory: revenue, eps (you can change to your rules)
-    for r in rows:
-        pl = str(r["period_label"])
-        if r.get("revenue") is None:
-            issues.append(Issue(symbol, "Missing revenue", "HIGH", pl, "Impute/Refetch", "revenue is NULL"))
-        if r.get("eps") is None:
-            issues.append(Issue(symbol, "Missing EPS", "MEDIUM", pl, "Impute/Refetch", "eps is NULL"))
-        # Optional: EBITDA might not exist in your current provider output
-        if r.get("ebitda") is None:
-            issues.append(Issue(symbol, "Missing EBITDA", "MEDIUM", pl, "Refetch/Compute", "ebitda is NULL"))
-    return issues
+# The rules live in services.data_validation.rules; they run (and report) in registration order
+RULES = tuple(RULE_REGISTRY)
+QUARTERLY_RULES = tuple(r for r in RULES if RULE_REGISTRY[r].source == "quarterly")
+PRICE_RULES = tuple(r for r in RULES if RULE_REGISTRY[r].source == "price")
+
+
+def validate_symbol(
+    sym: str,
+    q_rows: List[Dict[str, Any]],
+    p_points: List[Tuple[datetime, float]],
+    logger: logging.Logger,
+    vectorized: bool = True,
+    precomputed: Optional[Dict[str, List[Issue]]] = None,
+    executor: Optional[RuleExecutor] = None,
+) -> List[Issue]:
+    executor = executor or RuleExecutor(vectorized)
+    # Rules already evaluated elsewhere (SQL push-down, incremental state): rule -> this symbol's issues
+    precomputed = precomputed or {}
+    # Everything else in one pass: each series is turned into columns once and shared by its rules
+    results = executor.run(sym, {"quarterly": q_rows, "price": p_points}, skip=precomputed)
+
+    sym_issues = []
+    for rule in RULES:
+        sym_issues += precomputed[rule] if rule in precomputed else results.get(rule, [])
+
+    if not sym_issues:
+        logger.info(f"{sym} - Validation passed")
+    else:
+        # log them
+        for it in sym_issues[:200]:
+            lvl = logging.ERROR if it.severity == "HIGH" else logging.WARNING
+            logger.log(lvl, f"{sym} - {it.issue_type} ({it.severity}) [{it.affected_period}] -> {it.suggested_action} :: {it.details}")
+        logger.info(f"{sym} - Issues found: {len(sym_issues)}")
 
+    return sym_issues
 
-def validate_quarter_continuity(symbol: str, rows: List[Dict[str, Any]]) -> List[Issue]:
-    issues: List[Issue] = []
-    labels = [str(r["period_label"]) for r in rows if r.get("period_label")]
-    if not labels:
-        issues.append(Issue(symbol, "No quarterly periods", "HIGH", "-", "Skip company", "No quarterly rows found"))
-        return issues
-
-    # duplicates
-    seen = set()
-    for lb in labels:
-        if lb in seen:
-            issues.append(Issue(symbol, "Duplicate quarter label", "HIGH", lb, "Deduplicate", "Duplicate period label"))
-        seen.add(lb)
-
-    # future-dated
-    today = date.today()
-    for lb in labels:
-        try:
-            y, qn = parse_quarter_label(lb)
-            start = quarter_to_date_start(y, qn)
-            if start > today + timedelta(days=31):
-                issues.append(Issue(symbol, "Future-dated quarter", "HIGH", lb, "Skip row", f"Quarter start {start} > today"))
-        except Exception:
-            issues.append(Issue(symbol, "Quarter label parse failed", "HIGH", lb, "Fix/Normalize", "Could not parse quarter label"))
-
-    # missing gaps (expect step of 3 months)
-    parsed = []
-    for lb in labels:
-        try:
-            y, qn = parse_quarter_label(lb)
-            parsed.append((y, qn, lb))
-        except Exception:
-            continue
-    parsed.sort()
-
-    for i in range(1, len(parsed)):
-        py, pq, plb = parsed[i - 1]
-        cy, cq, clb = parsed[i]
-        prev_index = py * 4 + pq
-        curr_index = cy * 4 + cq
-        if curr_index - prev_index > 1:
-            issues.append(
-                Issue(
-                    symbol,
-                    "Missing quarter gap",
-                    "HIGH",
-                    f"{plb} -> {clb}",
-                    "Refetch missing quarters",
-                    f"Gap of {curr_index - prev_index - 1} quarter(s)",
-                )
-            )
-    return issues
 
+# -----------------------------
+# Incremental validation
+# -----------------------------
+def resumable_marks(
+    marks: Dict[str, RuleWatermark], rules: List[str]
+) -> Tuple[Dict[str, RuleWatermark], Dict[str, Optional[str]]]:
+    """
+    Watermarks that can be continued from, and the fetch keys they imply.
+    Rules sharing a fetch (quarterly, price) resume only if all of them stopped at the same key.
+    """
+    usable: Dict[str, RuleWatermark] = {}
+    since: Dict[str, Optional[str]] = {}
+    for group, group_rules in (("quarterly", QUARTERLY_RULES), ("price", PRICE_RULES)):
+        active = [r for r in rules if r in group_rules]
+        keys = {marks[r].last_key for r in active if r in marks}
+        # A watermark without a key validated nothing addressable, so start over
+        if active and all(r in marks for r in active) and len(keys) == 1 and None not in keys:
+            usable.update({r: marks[r] for r in active})
+            since[group] = keys.pop()
+    return usable, since
+
+
+def settled_count(q_rows: List[Dict[str, Any]]) -> int:
+    """Rows (in fetch order) up to and including the last well-formed 'YYYY-Qn' label and its duplicates."""
+    for i in range(len(q_rows) - 1, -1, -1):
+        label = q_rows[i].get("period_label")
+        if label is not None and WELL_FORMED_QUARTER.match(str(label)):
+            end = i + 1
+            while end < len(q_rows) and q_rows[end].get("period_label") == label:
+                end += 1
+            return end
+    return 0
+
+
+def price_rule_states(
+    marks: Dict[str, RuleWatermark], rules: List[str], price_cutoff: datetime, executor: RuleExecutor
+) -> Dict[str, Any]:
+    """Per-ticker price rule states, continued from the watermarks in marks (fresh when empty)."""
+    states: Dict[str, Any] = {}
+    if "price_spikes" in rules:
+        states["price_spikes"] = PriceSpikeState(executor.check("price_spikes"), price_carry(marks.get("price_spikes"), price_cutoff))
+    if "rolling_prices" in rules:
+        mark = marks.get("rolling_prices")
+        states["rolling_prices"] = RollingPriceState(mark.context if mark else None)
+    return states
+
+
+def price_carry(mark: Optional[RuleWatermark], price_cutoff: datetime) -> Optional[PricePoint]:
+    """The previous close a price watermark continues from, while it is still inside the lookback window."""
+    prev = mark.context.get("time") if mark else None
+    if prev and datetime.fromisoformat(prev) >= price_cutoff:
+        return datetime.fromisoformat(prev), mark.context["close"]
+    return None
+
+
+def validate_incremental(
+    sym: str,
+    q_rows: List[Dict[str, Any]],
+    price_scan: Optional[Tuple[Dict[str, List[Issue]], Dict[str, Any], Optional[datetime]]],
+    marks: Dict[str, RuleWatermark],
+    rules: List[str],
+    price_cutoff: datetime,
+    executor: RuleExecutor,
+) -> Tuple[Dict[str, List[Issue]], Dict[str, RuleWatermark]]:
+    """
+    Evaluate rules on the rows past their watermark and carry forward still-open issues.
+    q_rows holds only the new rows when the quarterly rules resumed, all rows otherwise; price_scan is
+    the PriceScanner result for the new price rows (states from price_rule_states).
+    Returns (rule -> issues, rule -> advanced watermark).
+    """
+    # Rows up to the last well-formed label are settled and move the watermark. Rows sorting after it
+    # (malformed or NULL labels) stay pending and are re-checked every run, so a period appended later
+    # can never land behind the watermark.
+    split = settled_count(q_rows)
+    settled, pending = q_rows[:split], q_rows[split:]
+    last_label = str(settled[-1]["period_label"]) if settled else None
+    results: Dict[str, List[Issue]] = {}
+    advanced: Dict[str, RuleWatermark] = {}
+    # Row-local rules need no context from earlier runs: one fused pass over the settled rows, one over the pending
+    row_rules = [r for r in rules if r in QUARTERLY_RULES and RULE_REGISTRY[r].row_local]
+    settled_row = executor.run(sym, {"quarterly": settled}, only=row_rules) if row_rules else {}
+    pending_row = executor.run(sym, {"quarterly": pending}, only=row_rules) if row_rules else {}
+
+    for rule in rules:
+        mark = marks.get(rule) or RuleWatermark(None)
+        check = executor.check(rule)
+
+        if rule in PRICE_RULES:
+            new_issues, states, last_time = price_scan
+            # Issues that slid out of the lookback window are no longer reported
+            cutoff_day = price_cutoff.strftime("%Y-%m-%d")
+            issues = [it for it in mark.open_issues if it.affected_period >= cutoff_day] + new_issues[rule]
+            context = states[rule].context()
+            last_key = last_time.isoformat() if last_time else mark.last_key
+            results[rule] = issues
+            advanced[rule] = RuleWatermark(last_key, context, issues)
+            continue
 
-def validate_outliers_qoq(symbol: str, rows: List[Dict[str, Any]]) -> List[Issue]:
+        if rule == "quarter_continuity":
+            # Duplicates, gaps and future dates depend on the whole label sequence (and on today),
+            # so the settled labels are kept and the rule re-runs on them without touching the database
+            labels = mark.context.get("labels", []) + [str(r["period_label"]) for r in settled if r.get("period_label")]
+            issues = check(sym, [{"period_label": lb} for lb in labels] + pending)
+            settled_issues, context = issues, {"labels": labels}
+        elif rule == "outliers_qoq":
+            prev = mark.context.get("prev")
+            settled_issues = mark.open_issues + check(sym, ([prev] if prev else []) + settled)
+            last = next((r for r in reversed(settled) if r.get("revenue") is not None and is_number(r.get("revenue"))), None)
+            if last is not None:
+                prev = {"period_label": str(last["period_label"]), "revenue": float(last["revenue"])}
+            issues = settled_issues + check(sym, ([prev] if prev else []) + pending)
+            context = {"prev": prev} if prev else {}
+        elif rule == "rolling_fundamentals":
+            # Window state continues from the last run; pending rows have no well-formed label to add
+            state = RollingFundamentalsState(mark.context)
+            issues = settled_issues = mark.open_issues + state.update(sym, quarter_series(settled))
+            context = state.context()
+        else:
+            # Row-level checks: settled rows keep their issues, new rows are checked on their own
+            settled_issues = mark.open_issues + settled_row[rule]
+            issues = settled_issues + pending_row[rule]
+            context = {}
+        results[rule] = issues
+        advanced[rule] = RuleWatermark(last_label or mark.last_key, context, settled_issues)
+
+    return results, advanced
+
+
+def validate_batch(
+    conn,
+    batch: List[str],
+    price_days: int,
+    bulk: bool,
+    vectorized: bool,
+    logger: logging.Logger,
+    pushdown: Optional[List[str]] = None,
+    incremental: bool = False,
+    full: bool = False,
+    stream_itersize: int = 0,
+    executor: Optional[RuleExecutor] = None,
+) -> List[Issue]:
+    """
+    incremental: resume each (ticker, rule) from its watermark and save the advanced watermarks
+    full: with incremental, ignore stored watermarks and re-scan everything (watermarks are still saved)
+    stream_itersize: stream price rows through a server-side cursor in chunks of this size (0 = off)
+    executor: runs the rules and accumulates per-rule timings (default: a fresh one)
+    """
     issues: List[Issue] = []
-    # revenue spike > 300% QoQ
-    series = []
-    for r in rows:
-        if r.get("revenue") is not None and is_number(r.get("revenue")):
-            series.append((str(r["period_label"]), float(r["revenue"])))
-    for i in range(1, len(series)):
-        prev_label, prev_val = series[i - 1]
-        curr_label, curr_val = series[i]
-        if prev_val != 0:
-            growth = (curr_val - prev_val) / abs(prev_val)
-            if growth > 3.0:
-                issues.append(Issue(symbol, "Revenue spike QoQ", "MEDIUM", curr_label, "Manual review", f"{growth*100:.1f}% QoQ"))
+    executor = executor or RuleExecutor(vectorized)
+    pushdown = pushdown or []
+    # Push-down rules run as window-function queries and return only offending rows
+    pushed = run_pushdown(conn, pushdown, batch, price_days)
+    # Push-down rules always scan in SQL; the rest can resume from their watermarks
+    local_rules = [r for r in RULES if r not in pushdown]
+    # With the price rules pushed down there is nothing left that needs the price rows
+    need_prices = any(r in PRICE_RULES for r in local_rules)
+    stored = load_watermarks(conn, batch, local_rules) if incremental and not full else {}
+    resume = {sym: resumable_marks(stored.get(sym, {}), local_rules) for sym in batch}
+    q_since = {sym: since.get("quarterly") for sym, (_, since) in resume.items()}
+    p_since = {sym: since.get("price") for sym, (_, since) in resume.items()}
+    price_cutoff = datetime.now() - timedelta(days=price_days)
+    advanced: List[Tuple[str, str, RuleWatermark]] = []
+
+    # Price rules go through a scanner that carries each ticker's state (last close, rolling windows)
+    # across chunks (streaming) and across runs (incremental)
+    stream = stream_itersize > 0 and need_prices
+    scanner = None
+    if need_prices and (stream or incremental):
+        price_rules = [r for r in local_rules if r in PRICE_RULES]
+        scanner = PriceScanner({sym: price_rule_states(resume[sym][0], price_rules, price_cutoff, executor) for sym in batch})
+    if stream:
+        for chunk in iter_price_history_chunks(conn, batch, price_days, p_since, stream_itersize):
+            scanner.feed(chunk)
+
+    def check(sym: str, q_rows: List[Dict[str, Any]], p_points: List[Tuple]) -> List[Issue]:
+        precomputed = {rule: by_sym[sym] for rule, by_sym in pushed.items()}
+        if scanner is not None and not stream:
+            scanner.feed((sym, *point) for point in p_points)
+        if incremental:
+            price_scan = scanner.result(sym) if scanner is not None else None
+            results, marks = validate_incremental(sym, q_rows, price_scan, resume[sym][0], local_rules, price_cutoff, executor)
+            precomputed.update(results)
+            advanced.extend((sym, rule, mark) for rule, mark in marks.items())
+        elif stream:
+            precomputed.update(scanner.result(sym)[0])
+        return validate_symbol(sym, q_rows, p_points, logger, vectorized, precomputed, executor)
+
+    # In streaming mode the price rows were already consumed above
+    fetch_prices = need_prices and not stream
+    if bulk:
+        # Bulk mode: a few ordered queries per batch of tickers instead of 2-3 per ticker
+        q_by_sym = fetch_quarterly_metrics_bulk(conn, batch, since=q_since)
+        p_by_sym = fetch_price_history_bulk(conn, batch, days=price_days, since=p_since) if fetch_prices else {}
+        for sym in batch:
+            issues.extend(check(sym, q_by_sym[sym], p_by_sym.get(sym, [])))
+    else:
+        for sym in batch:
+            q_rows = fetch_quarterly_metrics(conn, sym, since=q_since[sym])
+            p_points = fetch_price_history(conn, sym, days=price_days, since=p_since[sym]) if fetch_prices else []
+            issues.extend(check(sym, q_rows, p_points))
+
+    if incremental:
+        save_watermarks(conn, advanced)
+        conn.commit()
     return issues
 
 
-def validate_price_spikes(symbol: str, points: List[Tuple[datetime, float]]) -> List[Issue]:
-    issues: List[Issue] = []
-    closes = [(t, c) for (t, c) in points if c is not None]
-    for i in range(1, len(closes)):
-        t0, p0 = closes[i - 1]
-        t1, p1 = closes[i]
-        if p0 != 0:
-            jump = (p1 - p0) / abs(p0)
-            if abs(jump) > 0.40:
-                issues.append(Issue(symbol, "Price spike", "MEDIUM", t1.strftime("%Y-%m-%d"), "Manual review", f"{jump*100:.1f}% day change"))
-    return issues
+# -----------------------------
+# Parallel workers
+# -----------------------------
+_worker: Dict[str, Any] = {}
 
 
-def validate_numeric_types(symbol: str, rows: List[Dict[str, Any]]) -> List[Issue]:
-    issues: List[Issue] = []
-    numeric_fields = ["revenue", "ebitda", "eps", "free_cash_flow", "total_debt"]
-    for r in rows:
-        pl = str(r.get("period_label", "-"))
-        for f in numeric_fields:
-            v = r.get(f)
-            if v is None:
-                continue
-            if not is_number(v):
-                issues.append(Issue(symbol, "Non-numeric field", "HIGH", pl, "Fix normalization", f"{f}='{v}'"))
-    return issues
+def _init_worker(log_path: Path, options: Dict[str, Any]) -> None:
+    # One DB connection and logger per worker process, reused across batches
+    logger, _ = setup_logger(log_path, label=f"worker {os.getpid()}")
+    _worker.update(conn=get_db_conn(), logger=logger, executor=RuleExecutor(options["vectorized"]), **options)
+
+
+def _validate_batch_worker(batch: List[str]) -> Tuple[List[Tuple], Counter]:
+    executor = _worker["executor"]
+    issues = validate_batch(
+        _worker["conn"], batch, _worker["price_days"], _worker["bulk"], _worker["vectorized"], _worker["logger"],
+        _worker["pushdown"], _worker["incremental"], _worker["full"], _worker["stream_itersize"], executor,
+    )
+    # This batch's rule timings go back with its issues
+    timings, executor.timings = executor.timings, Counter()
+    # Compact tuples pickle much smaller than dataclass instances
+    return [astuple(it) for it in issues], timings
+
+
+def validate_parallel(
+    tickers: List[str], batch_size: int, workers: int, log_path: Path, options: Dict[str, Any],
+    timings: Optional[Counter] = None,
+) -> Iterator[List[Issue]]:
+    """
+    Validate ticker batches on a process pool, yielding each batch's issues in submission order,
+    so reports list issues in the same order as a serial run.
+    timings: per-rule seconds from the workers are added here
+    """
+    # At least ~4 batches per worker so one slow batch doesn't leave the others idle
+    batch_size = max(1, min(batch_size, -(-len(tickers) // (workers * 4))))
+    batches = [tickers[i:i + batch_size] for i in range(0, len(tickers), batch_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(log_path, options)) as pool:
+        for compact, batch_timings in pool.map(_validate_batch_worker, batches):
+            if timings is not None:
+                timings.update(batch_timings)
+            yield [Issue(*t) for t in compact]
 
 
 # -----------------------------
@@ -347,9 +585,29 @@ def main():
     parser.add_argument("--max-tickers", type=int, default=0, help="Limit tickers from DB")
     parser.add_argument("--price-days", type=int, default=90, help="Price lookback window")
     parser.add_argument("--fail-on-high", action="store_true", help="Exit code 1 if any HIGH issues exist")
+    parser.add_argument("--batch-size", type=int, default=500, help="Tickers per bulk fetch (0 = one query per ticker)")
+    parser.add_argument("--scalar-validators", action="store_true", help="Use the row-by-row reference validators")
+    parser.add_argument("--workers", type=int, default=1, help="Validate ticker batches on N processes")
+    parser.add_argument(
+        "--pushdown",
+        default="",
+        help="Run these rules as SQL window-function queries: 'all' or a comma list of price_spikes,quarter_continuity,outliers_qoq",
+    )
+    parser.add_argument("--full", action="store_true", help="Ignore validation watermarks and re-scan all history")
+    parser.add_argument(
+        "--stream-prices",
+        action="store_true",
+        help="Stream price history through a server-side cursor (flat memory for long --price-days)",
+    )
+    parser.add_argument("--itersize", type=int, default=20000, help="Rows per server-side cursor round trip with --stream-prices")
     args = parser.parse_args()
 
-    logger, _ = setup_logger()
+    try:
+        pushdown = parse_pushdown_rules(args.pushdown)
+    except ValueError as e:
+        parser.error(str(e))
+
+    logger, log_path = setup_logger()
 
     conn = get_db_conn()
 
@@ -359,38 +617,54 @@ def main():
         tickers = fetch_tickers(conn, args.max_tickers)
 
     logger.info(f"Tickers to validate: {tickers}")
+    if pushdown:
+        logger.info(f"SQL push-down rules: {', '.join(pushdown)}")
+
+    # Rules resume from per-ticker watermarks unless --full forces a complete re-scan
+    ensure_watermarks_table(conn)
+    logger.info("Full re-scan (watermarks ignored)" if args.full else "Incremental run: validating rows past each watermark")
+
+    # Issues stream into the reports batch by batch instead of accumulating for the whole run
+    sink = ReportSink(REPORTS_DIR, logger)
+
+    bulk = args.batch_size > 0
+    stream_itersize = max(1, args.itersize) if args.stream_prices else 0
+    # Per-ticker mode still needs batches to hand out to workers
+    batch_size = args.batch_size if bulk else 100
+    executor = RuleExecutor(not args.scalar_validators)
+
+    if args.workers > 1:
+        options = {
+            "price_days": args.price_days,
+            "bulk": bulk,
+            "vectorized": not args.scalar_validators,
+            "pushdown": pushdown,
+            "incremental": True,
+            "full": args.full,
+            "stream_itersize": stream_itersize,
+        }
+        logger.info(f"Validating {len(tickers)} tickers on {args.workers} worker processes")
+        for batch_issues in validate_parallel(tickers, batch_size, args.workers, log_path, options, executor.timings):
+            sink.add(batch_issues)
+    else:
+        for i in range(0, len(tickers), batch_size):
+            batch = tickers[i:i + batch_size]
+            sink.add(
+                validate_batch(
+                    conn, batch, args.price_days, bulk, not args.scalar_validators, logger,
+                    pushdown, True, args.full, stream_itersize, executor,
+                )
+            )
 
-    issues: List[Issue] = []
-
-    for sym in tickers:
-        q_rows = fetch_quarterly_metrics(conn, sym)
-        p_points = fetch_price_history(conn, sym, days=args.price_days)
-
-        sym_issues = []
-        sym_issues += validate_missing_quarterly(sym, q_rows)
-        sym_issues += validate_quarter_continuity(sym, q_rows)
-        sym_issues += validate_numeric_types(sym, q_rows)
-        sym_issues += validate_outliers_qoq(sym, q_rows)
-        sym_issues += validate_price_spikes(sym, p_points)
-
-        if not sym_issues:
-            logger.info(f"{sym} - Validation passed")
-        else:
-            # log them
-            for it in sym_issues[:200]:
-                lvl = logging.ERROR if it.severity == "HIGH" else logging.WARNING
-                logger.log(lvl, f"{sym} - {it.issue_type} ({it.severity}) [{it.affected_period}] -> {it.suggested_action} :: {it.details}")
-            logger.info(f"{sym} - Issues found: {len(sym_issues)}")
-
-        issues.extend(sym_issues)
-
-    csv_path, md_path = write_reports(issues, logger)
+    csv_path, md_path = sink.close()
 
-    high_count = sum(1 for i in issues if i.severity == "HIGH")
-    med_count = sum(1 for i in issues if i.severity == "MEDIUM")
-    low_count = sum(1 for i in issues if i.severity == "LOW")
+    high_count = sink.by_severity["HIGH"]
+    med_count = sink.by_severity["MEDIUM"]
+    low_count = sink.by_severity["LOW"]
 
     logger.info(f"Summary: HIGH={high_count}, MEDIUM={med_count}, LOW={low_count}")
+    for line in executor.timing_report():
+        logger.info(f"Rule time - {line}")
     logger.info("Task 7 validation complete.")
 
     conn.close()
@@ -0,0 +1,62 @@
+"""
+Chunked price validation.
+
+Price rows arrive in chunks ordered by (ticker, time), e.g. from a server-side
+cursor. Each price rule keeps per-ticker state (the last close, a rolling
+window) that is carried into the next chunk, so a ticker split across chunks
+gets exactly the issues of a single pass over all its rows. The same state
+continues from a watermark in incremental runs.
+"""
+from collections import defaultdict
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from services.data_validation.issues import Issue
+
+PricePoint = Tuple[datetime, Optional[float]]
+
+
+class PriceSpikeState:
+    """price_spikes continued from the last non-null close."""
+
+    def __init__(self, check: Callable[[str, List[Tuple]], List[Issue]], prev: Optional[PricePoint] = None):
+        """
+        check: a price_spikes validator, (symbol, points) -> issues
+        prev: previous (time, close) to continue from
+        """
+        self.check = check
+        self.prev = prev
+
+    def update(self, sym: str, points: List[Tuple]) -> List[Issue]:
+        # The carried close is only the left neighbour; check() never flags the first point
+        issues = self.check(sym, ([self.prev] if self.prev else []) + points)
+        last = next(((t, c) for t, c, *_ in reversed(points) if c is not None), None)
+        if last is not None:
+            self.prev = last
+        return issues
+
+    def context(self) -> Dict[str, Any]:
+        return {"time": self.prev[0].isoformat(), "close": self.prev[1]} if self.prev else {}
+
+
+class PriceScanner:
+    def __init__(self, states: Dict[str, Dict[str, Any]]):
+        """states: ticker -> rule -> state with update(symbol, points) -> issues"""
+        self.states = states
+        self.issues: Dict[str, Dict[str, List[Issue]]] = defaultdict(lambda: defaultdict(list))
+        self.last_time: Dict[str, datetime] = {}
+
+    def feed(self, rows: Iterable[Tuple]) -> None:
+        """One chunk of (ticker, time, close, volume) rows ordered by ticker, time."""
+        for sym, run in groupby(rows, key=itemgetter(0)):
+            points = [row[1:] for row in run]
+            for rule, state in self.states[sym].items():
+                self.issues[sym][rule] += state.update(sym, points)
+            self.last_time[sym] = points[-1][0]
+
+    def result(self, sym: str) -> Tuple[Dict[str, List[Issue]], Dict[str, Any], Optional[datetime]]:
+        """(rule -> issues, rule -> state, last scanned time) for one ticker."""
+        states = self.states[sym]
+        return {rule: self.issues[sym][rule] for rule in states}, states, self.last_time.get(sym)
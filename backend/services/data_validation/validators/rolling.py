@@ -0,0 +1,235 @@
+"""
+Rolling statistical anomaly validators.
+
+Every series keeps a sliding window of its last observations. A new value is
+scored against the window before it is added:
+
+- z-score: mean and variance are maintained with Welford updates, so adding a
+  value (and evicting the oldest) costs O(1)
+- robust score: (x - median) / (1.4826 * MAD). The window is also kept
+  sorted, so the median is O(1) and the MAD is a k-th-smallest selection
+  over two sorted runs in O(log w)
+
+A value is flagged when both scores exceed their thresholds: the z-score
+adapts to each ticker's volatility, and the MAD keeps earlier outliers from
+inflating that threshold. Window state round-trips through to_state() /
+from_state(), so incremental runs continue where the last one stopped.
+"""
+import math
+from bisect import bisect_left, insort
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from services.data_validation.issues import Issue
+
+Z_THRESHOLD = 4.0
+ROBUST_THRESHOLD = 5.0
+MAD_SCALE = 1.4826  # MAD -> standard deviation for normal data
+
+PRICE_WINDOW, PRICE_MIN_PERIODS = 60, 20
+FUNDAMENTALS_WINDOW, FUNDAMENTALS_MIN_PERIODS = 12, 8
+
+
+def _kth_abs_deviation(ordered: List[float], median: float, split: int, k: int) -> float:
+    """
+    k-th smallest (1-based) |x - median| over a sorted list with ordered[:split] < median <= ordered[split:].
+    The deviations form two ascending runs, walking left and right from the median, so this is
+    the classic k-th element of two sorted arrays.
+    """
+    a, a_len = 0, split                 # a-run: median - ordered[split - 1 - i]
+    b, b_len = 0, len(ordered) - split  # b-run: ordered[split + j] - median
+    while True:
+        if a == a_len:
+            return ordered[split + b + k - 1] - median
+        if b == b_len:
+            return median - ordered[split - 1 - (a + k - 1)]
+        if k == 1:
+            return min(median - ordered[split - 1 - a], ordered[split + b] - median)
+        step = k // 2
+        i = min(a + step, a_len) - 1
+        j = min(b + step, b_len) - 1
+        if median - ordered[split - 1 - i] <= ordered[split + j] - median:
+            k -= i - a + 1
+            a = i + 1
+        else:
+            k -= j - b + 1
+            b = j + 1
+
+
+class RollingWindow:
+    __slots__ = ("size", "values", "ordered", "mean", "m2")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values: deque = deque()
+        self.ordered: List[float] = []
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def push(self, x: float) -> None:
+        n = len(self.values)
+        if n < self.size:
+            delta = x - self.mean
+            self.mean += delta / (n + 1)
+            self.m2 += delta * (x - self.mean)
+        else:
+            # Replace the oldest value in one Welford step
+            y = self.values.popleft()
+            del self.ordered[bisect_left(self.ordered, y)]
+            old_mean = self.mean
+            self.mean += (x - y) / n
+            self.m2 += (x - y) * (x - self.mean + y - old_mean)
+        self.values.append(x)
+        insort(self.ordered, x)
+
+    def std(self) -> float:
+        n = len(self.values)
+        return math.sqrt(max(self.m2, 0.0) / (n - 1)) if n > 1 else 0.0
+
+    def median(self) -> float:
+        s, n = self.ordered, len(self.ordered)
+        return s[n // 2] if n % 2 else (s[n // 2 - 1] + s[n // 2]) / 2
+
+    def mad(self) -> float:
+        s, n = self.ordered, len(self.ordered)
+        median = self.median()
+        split = bisect_left(s, median)
+        if n % 2:
+            return _kth_abs_deviation(s, median, split, n // 2 + 1)
+        return (_kth_abs_deviation(s, median, split, n // 2) + _kth_abs_deviation(s, median, split, n // 2 + 1)) / 2
+
+    def scores(self, x: float) -> Tuple[float, float]:
+        """(z-score, robust score) of x against the current window; a zero spread scores any change as infinite."""
+        std, mad, median = self.std(), self.mad(), self.median()
+        z = (x - self.mean) / std if std > 0 else (0.0 if x == self.mean else math.inf)
+        robust = (x - median) / (MAD_SCALE * mad) if mad > 0 else (0.0 if x == median else math.inf)
+        return z, robust
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"values": list(self.values), "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_state(cls, size: int, state: Optional[Dict[str, Any]]) -> "RollingWindow":
+        window = cls(size)
+        if state:
+            values = state["values"][-size:]
+            window.values.extend(values)
+            window.ordered = sorted(values)
+            if len(values) == len(state["values"]):
+                window.mean, window.m2 = state["mean"], state["m2"]
+            else:
+                # Window size shrank since the state was saved: recompute once
+                window.mean = sum(values) / len(values)
+                window.m2 = sum((v - window.mean) ** 2 for v in values)
+        return window
+
+
+class RollingSeries:
+    """One observed series (e.g. daily returns) with its window and flagging rule."""
+
+    def __init__(self, name: str, size: int, min_periods: int, state: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.min_periods = min_periods
+        self.window = RollingWindow.from_state(size, state)
+
+    def observe(self, x: float) -> Optional[str]:
+        """Add x; returns issue details when it is anomalous against the preceding window."""
+        details = None
+        if len(self.window) >= self.min_periods:
+            z, robust = self.window.scores(x)
+            if abs(z) > Z_THRESHOLD and abs(robust) > ROBUST_THRESHOLD:
+                details = f"{self.name} z={z:.1f}, robust z={robust:.1f} over {len(self.window)} obs"
+        self.window.push(x)
+        return details
+
+
+def _float(x: Any) -> Optional[float]:
+    try:
+        return None if x is None else float(x)
+    except (TypeError, ValueError):
+        return None
+
+
+class RollingPriceState:
+    """Daily return and log-volume anomalies for one ticker."""
+
+    def __init__(self, context: Optional[Dict[str, Any]] = None):
+        context = context or {}
+        self.prev_close: Optional[float] = context.get("prev_close")
+        self.returns = RollingSeries("return", PRICE_WINDOW, PRICE_MIN_PERIODS, context.get("returns"))
+        self.volume = RollingSeries("log volume", PRICE_WINDOW, PRICE_MIN_PERIODS, context.get("volume"))
+
+    def update(self, sym: str, points: Iterable[Tuple]) -> List[Issue]:
+        """points: (time, close, volume) in time order."""
+        issues: List[Issue] = []
+        for t, close, *rest in points:
+            self.step(sym, t, close, rest[0] if rest else None, issues)
+        return issues
+
+    def step(self, sym: str, t: datetime, close: Any, volume: Any, issues: List[Issue]) -> None:
+        """Observe one bar, appending any anomalies to issues."""
+        day = t.strftime("%Y-%m-%d")
+        close = _float(close)
+        if close is not None and math.isfinite(close):
+            if self.prev_close:
+                ret = (close - self.prev_close) / abs(self.prev_close)
+                details = self.returns.observe(ret)
+                if details:
+                    issues.append(Issue(sym, "Price return anomaly", "LOW", day, "Manual review", f"{ret*100:.1f}% day change: {details}"))
+            self.prev_close = close
+        volume = _float(volume)
+        if volume is not None and math.isfinite(volume) and volume >= 0:
+            details = self.volume.observe(math.log1p(volume))
+            if details:
+                issues.append(Issue(sym, "Volume anomaly", "LOW", day, "Manual review", f"volume {volume:.0f}: {details}"))
+
+    def context(self) -> Dict[str, Any]:
+        return {"prev_close": self.prev_close, "returns": self.returns.window.to_state(), "volume": self.volume.window.to_state()}
+
+
+class RollingFundamentalsState:
+    """Quarter-over-quarter revenue growth and EPS change anomalies for one ticker."""
+
+    def __init__(self, context: Optional[Dict[str, Any]] = None):
+        context = context or {}
+        self.prev_revenue: Optional[float] = context.get("prev_revenue")
+        self.prev_eps: Optional[float] = context.get("prev_eps")
+        self.revenue = RollingSeries("revenue growth", FUNDAMENTALS_WINDOW, FUNDAMENTALS_MIN_PERIODS, context.get("revenue"))
+        self.eps = RollingSeries("EPS change", FUNDAMENTALS_WINDOW, FUNDAMENTALS_MIN_PERIODS, context.get("eps"))
+
+    def update(self, sym: str, rows: Iterable[Dict[str, Any]]) -> List[Issue]:
+        """rows: quarterly metrics in period order."""
+        issues: List[Issue] = []
+        for r in rows:
+            self.step(sym, r.get("period_label"), r.get("revenue"), r.get("eps"), issues)
+        return issues
+
+    def step(self, sym: str, label: Any, revenue: Any, eps: Any, issues: List[Issue]) -> None:
+        """Observe one quarter, appending any anomalies to issues."""
+        pl = str(label)
+        revenue, eps = _float(revenue), _float(eps)
+        if revenue is not None and math.isfinite(revenue):
+            if self.prev_revenue:
+                growth = (revenue - self.prev_revenue) / abs(self.prev_revenue)
+                details = self.revenue.observe(growth)
+                if details:
+                    issues.append(Issue(sym, "Revenue growth anomaly", "LOW", pl, "Manual review", f"{growth*100:.1f}% QoQ: {details}"))
+            self.prev_revenue = revenue
+        if eps is not None and math.isfinite(eps):
+            if self.prev_eps is not None:
+                details = self.eps.observe(eps - self.prev_eps)
+                if details:
+                    issues.append(Issue(sym, "EPS change anomaly", "LOW", pl, "Manual review", f"EPS {self.prev_eps:g} -> {eps:g}: {details}"))
+            self.prev_eps = eps
+
+    def context(self) -> Dict[str, Any]:
+        return {
+            "prev_revenue": self.prev_revenue,
+            "prev_eps": self.prev_eps,
+            "revenue": self.revenue.window.to_state(),
+            "eps": self.eps.window.to_state(),
+        }
@@ -0,0 +1,192 @@
+"""
+SQL push-down versions of the neighbour-comparison validators.
+
+price_spikes, quarter_continuity and outliers_qoq run as LAG()-based queries
+inside Postgres/TimescaleDB and only offending rows come back over the wire.
+Each function takes a batch of tickers and returns {ticker: [Issue, ...]} in
+the same order the Python validators emit them.
+
+Arithmetic is done in float8 so thresholds compare exactly like Python floats,
+and NaN results are dropped as Python's comparisons do. Quarter labels are
+parsed with the regex ^\\d+-Q\\d+$; labels that Python's int() would still
+accept (surrounding spaces, signs, underscores, non-ASCII digits) are reported
+as parse failures here.
+"""
+from datetime import date
+from typing import Dict, List, Optional
+
+from services.data_validation.issues import Issue
+
+PUSHDOWN_RULES = ("price_spikes", "quarter_continuity", "outliers_qoq")
+
+# Same source rule as fetch_quarterly_metrics: metrics_normalized when a ticker has
+# quarterly rows there, otherwise fundamentals_quarterly
+QUARTERLY_SOURCE_CTE = """
+    mn AS (
+        SELECT ticker, period_label AS label, revenue::float8 AS revenue
+        FROM metrics_normalized
+        WHERE ticker = ANY(%(tickers)s) AND period_type = 'quarterly'
+    ),
+    src AS (
+        SELECT ticker, label, revenue FROM mn
+        UNION ALL
+        SELECT ticker, quarter, revenue::float8
+        FROM fundamentals_quarterly
+        WHERE ticker = ANY(%(tickers)s) AND ticker NOT IN (SELECT ticker FROM mn)
+    )
+"""
+
+PRICE_SPIKES_SQL = """
+SELECT ticker, time, jump
+FROM (
+    SELECT ticker, time, close,
+           LAG(close) OVER (PARTITION BY ticker ORDER BY time) AS prev_close
+    FROM (
+        SELECT ticker, time, close::float8 AS close
+        FROM price_history
+        WHERE ticker = ANY(%(tickers)s)
+          AND time >= NOW() - (%(days)s || ' days')::interval
+          AND close IS NOT NULL
+    ) p
+) w,
+LATERAL (SELECT (close - prev_close) / ABS(prev_close) AS jump) j
+WHERE prev_close <> 0
+  AND jump <> 'NaN'::float8
+  AND ABS(jump) > %(threshold)s
+ORDER BY ticker, time
+"""
+
+OUTLIERS_QOQ_SQL = f"""
+WITH {QUARTERLY_SOURCE_CTE}
+SELECT ticker, label, growth
+FROM (
+    SELECT ticker, label, revenue,
+           -- revenue breaks ties between duplicate labels, as in the fetch queries
+           LAG(revenue) OVER (PARTITION BY ticker ORDER BY label, revenue) AS prev_revenue
+    FROM src
+    WHERE revenue IS NOT NULL
+) w,
+LATERAL (SELECT (revenue - prev_revenue) / ABS(prev_revenue) AS growth) g
+WHERE prev_revenue <> 0
+  AND growth <> 'NaN'::float8
+  AND growth > %(threshold)s
+ORDER BY ticker, label
+"""
+
+# kinds: present (ticker has labels), duplicate, parse_failed, future, gap
+QUARTER_CONTINUITY_SQL = f"""
+WITH {QUARTERLY_SOURCE_CTE},
+labels AS (
+    SELECT ticker, label FROM src WHERE label IS NOT NULL AND label <> ''
+),
+parsed AS (
+    SELECT ticker, label, m[1]::bigint AS y, m[2]::bigint AS q
+    FROM (SELECT ticker, label, regexp_match(label, '^([0-9]{{1,9}})-Q([0-9]{{1,9}})$') AS m FROM labels) x
+),
+checked AS (
+    SELECT ticker, label, y, q,
+           y IS NOT NULL AND q BETWEEN 1 AND 4 AND y BETWEEN 1 AND 9999 AS valid
+    FROM parsed
+),
+gaps AS (
+    SELECT ticker, label, prev_label, idx - prev_idx - 1 AS missing, ord
+    FROM (
+        SELECT ticker, label, y * 4 + q AS idx,
+               LAG(y * 4 + q) OVER w AS prev_idx,
+               LAG(label) OVER w AS prev_label,
+               row_number() OVER w AS ord
+        FROM checked
+        WHERE y IS NOT NULL
+        WINDOW w AS (PARTITION BY ticker ORDER BY y, q, label COLLATE "C")
+    ) l
+    WHERE idx - prev_idx > 1
+)
+-- Python emits duplicates, then parse/future issues in label order, then gaps in (year, quarter) order
+SELECT ticker, 0 AS rank, 'present' AS kind, NULL AS label, NULL AS prev_label, NULL::bigint AS n, NULL::date AS start,
+       NULL AS sort_label, NULL::bigint AS ord
+FROM labels GROUP BY ticker
+UNION ALL
+SELECT ticker, 1, 'duplicate', label, NULL, COUNT(*) - 1, NULL, label, NULL
+FROM labels GROUP BY ticker, label HAVING COUNT(*) > 1
+UNION ALL
+SELECT ticker, 2, CASE WHEN valid THEN 'future' ELSE 'parse_failed' END, label, NULL, NULL,
+       CASE WHEN valid THEN make_date(y::int, (q::int - 1) * 3 + 1, 1) END, label, NULL
+FROM checked
+WHERE CASE WHEN valid THEN make_date(y::int, (q::int - 1) * 3 + 1, 1) > %(today)s::date + 31 ELSE TRUE END
+UNION ALL
+SELECT ticker, 3, 'gap', label, prev_label, missing, NULL, NULL, ord
+FROM gaps
+ORDER BY ticker, rank, sort_label, ord
+"""
+
+
+def price_spikes_sql(conn, tickers: List[str], days: int = 90, threshold: float = 0.40) -> Dict[str, List[Issue]]:
+    out: Dict[str, List[Issue]] = {t: [] for t in tickers}
+    if not tickers:
+        return out
+    with conn.cursor() as cur:
+        cur.execute(PRICE_SPIKES_SQL, {"tickers": list(tickers), "days": days, "threshold": threshold})
+        for ticker, t, jump in cur.fetchall():
+            out[ticker].append(Issue(ticker, "Price spike", "MEDIUM", t.strftime("%Y-%m-%d"), "Manual review", f"{jump*100:.1f}% day change"))
+    return out
+
+
+def outliers_qoq_sql(conn, tickers: List[str], threshold: float = 3.0) -> Dict[str, List[Issue]]:
+    out: Dict[str, List[Issue]] = {t: [] for t in tickers}
+    if not tickers:
+        return out
+    with conn.cursor() as cur:
+        cur.execute(OUTLIERS_QOQ_SQL, {"tickers": list(tickers), "threshold": threshold})
+        for ticker, label, growth in cur.fetchall():
+            out[ticker].append(Issue(ticker, "Revenue spike QoQ", "MEDIUM", str(label), "Manual review", f"{growth*100:.1f}% QoQ"))
+    return out
+
+
+def quarter_continuity_sql(conn, tickers: List[str], today: Optional[date] = None) -> Dict[str, List[Issue]]:
+    out: Dict[str, List[Issue]] = {t: [] for t in tickers}
+    if not tickers:
+        return out
+    with conn.cursor() as cur:
+        cur.execute(QUARTER_CONTINUITY_SQL, {"tickers": list(tickers), "today": today or date.today()})
+        rows = cur.fetchall()
+
+    present = set()
+    for ticker, _, kind, label, prev_label, n, start, _, _ in rows:
+        if kind == "present":
+            present.add(ticker)
+        elif kind == "duplicate":
+            out[ticker].extend(Issue(ticker, "Duplicate quarter label", "HIGH", label, "Deduplicate", "Duplicate period label") for _ in range(n))
+        elif kind == "parse_failed":
+            out[ticker].append(Issue(ticker, "Quarter label parse failed", "HIGH", label, "Fix/Normalize", "Could not parse quarter label"))
+        elif kind == "future":
+            out[ticker].append(Issue(ticker, "Future-dated quarter", "HIGH", label, "Skip row", f"Quarter start {start} > today"))
+        else:
+            out[ticker].append(Issue(ticker, "Missing quarter gap", "HIGH", f"{prev_label} -> {label}", "Refetch missing quarters", f"Gap of {n} quarter(s)"))
+
+    for ticker in tickers:
+        if ticker not in present:
+            out[ticker] = [Issue(ticker, "No quarterly periods", "HIGH", "-", "Skip company", "No quarterly rows found")]
+    return out
+
+
+def parse_pushdown_rules(value: str) -> List[str]:
+    """'all' or a comma-separated subset of PUSHDOWN_RULES."""
+    if not value:
+        return []
+    rules = list(PUSHDOWN_RULES) if value.strip() == "all" else [r.strip() for r in value.split(",") if r.strip()]
+    unknown = [r for r in rules if r not in PUSHDOWN_RULES]
+    if unknown:
+        raise ValueError(f"Unknown push-down rule(s): {', '.join(unknown)}. Choose from: {', '.join(PUSHDOWN_RULES)}")
+    return rules
+
+
+def run_pushdown(conn, rules: List[str], tickers: List[str], price_days: int) -> Dict[str, Dict[str, List[Issue]]]:
+    """rule -> ticker -> issues for every selected push-down rule."""
+    results: Dict[str, Dict[str, List[Issue]]] = {}
+    if "price_spikes" in rules:
+        results["price_spikes"] = price_spikes_sql(conn, tickers, days=price_days)
+    if "quarter_continuity" in rules:
+        results["quarter_continuity"] = quarter_continuity_sql(conn, tickers)
+    if "outliers_qoq" in rules:
+        results["outliers_qoq"] = outliers_qoq_sql(conn, tickers)
+    return results
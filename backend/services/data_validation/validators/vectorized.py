@@ -0,0 +1,156 @@
+"""
+Array kernels behind the registered rules in rules/.
+
+The fused executor hands each kernel flat columns for a whole ticker (or a
+whole grouped universe); masks / QoQ growth / day-over-day jumps are built
+in one NumPy pass and Issue objects only for flagged positions. Output is
+identical, issue for issue and in the same order, to the scalar functions.
+"""
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from services.data_validation.issues import Issue
+
+QOQ_SPIKE_THRESHOLD = 3.0
+PRICE_SPIKE_THRESHOLD = 0.40
+
+# field, issue type, severity, suggested action (checked in this order per row)
+MISSING_RULES = [
+    ("revenue", "Missing revenue", "HIGH", "Impute/Refetch"),
+    ("eps", "Missing EPS", "MEDIUM", "Impute/Refetch"),
+    ("ebitda", "Missing EBITDA", "MEDIUM", "Refetch/Compute"),
+]
+
+
+# -----------------------------
+# Array helpers
+# -----------------------------
+def numeric_values(values: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    float(x) for every element plus the is_number() mask (None or float() failure -> False).
+    """
+    try:
+        # One C-level float() pass; None becomes NaN
+        out = np.array(values, dtype=float)
+        ok = np.ones(len(out), dtype=bool)
+    except (TypeError, ValueError, OverflowError):
+        # Non-numeric garbage somewhere: per-element float() as in is_number()
+        out = np.full(len(values), np.nan)
+        ok = np.zeros(len(values), dtype=bool)
+        for i, v in enumerate(values):
+            try:
+                out[i] = float(v)
+                ok[i] = v is not None
+            except Exception:
+                pass
+        return out, ok
+
+    # NaN is either None or a genuine NaN value; only those positions need a Python check
+    nan_positions = np.flatnonzero(np.isnan(out))
+    if len(nan_positions):
+        ok[nan_positions] = [values[i] is not None for i in nan_positions]
+    return out, ok
+
+
+def null_mask(values: List[Any], as_float: Optional[np.ndarray] = None) -> np.ndarray:
+    """Elementwise `is None` (a NaN value is not null, as in the scalar validators)."""
+    if as_float is None:
+        try:
+            as_float = np.array(values, dtype=float)
+        except (TypeError, ValueError, OverflowError):
+            return np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+    mask = np.isnan(as_float)
+    nan_positions = np.flatnonzero(mask)
+    if len(nan_positions):
+        mask[nan_positions] = [values[i] is None for i in nan_positions]
+    return mask
+
+
+def group_ids(lengths: List[int]) -> np.ndarray:
+    return np.repeat(np.arange(len(lengths)), lengths)
+
+
+def lag_pairs(groups: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(previous, current, same-ticker mask) for every consecutive pair of rows."""
+    return values[:-1], values[1:], groups[1:] == groups[:-1]
+
+
+# (valid row positions, previous value, current value, same-ticker mask) over the valid rows only
+Lag = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def valid_lag(groups: np.ndarray, values: np.ndarray, ok: np.ndarray) -> Lag:
+    """Neighbour pairs that skip invalid rows, as the list-walking validators do."""
+    rows = np.flatnonzero(ok)
+    prev, curr, same = lag_pairs(groups[rows], values[rows])
+    return rows, prev, curr, same
+
+
+# -----------------------------
+# Kernels (flat columns, one group id per row)
+# -----------------------------
+def missing_quarterly_kernel(symbols: List[str], groups: np.ndarray, labels: List[Any], masks: List[np.ndarray]) -> List[Issue]:
+    """masks: null mask per MISSING_RULES field."""
+    if not len(groups):
+        return []
+    flagged = np.flatnonzero(np.logical_or.reduce(masks))
+
+    issues: List[Issue] = []
+    for i in flagged:
+        sym, pl = symbols[groups[i]], str(labels[i])
+        for mask, (field, issue_type, severity, action) in zip(masks, MISSING_RULES):
+            if mask[i]:
+                issues.append(Issue(sym, issue_type, severity, pl, action, f"{field} is NULL"))
+    return issues
+
+
+def numeric_types_kernel(
+    symbols: List[str], groups: np.ndarray, labels: List[Any], fields: List[str],
+    columns: List[List[Any]], bad: List[np.ndarray],
+) -> List[Issue]:
+    """bad: per field, present but not convertible to float."""
+    if not len(groups):
+        return []
+    flagged = np.flatnonzero(np.logical_or.reduce(bad))
+
+    issues: List[Issue] = []
+    for i in flagged:
+        sym, pl = symbols[groups[i]], str(labels[i])
+        for field, values, mask in zip(fields, columns, bad):
+            if mask[i]:
+                issues.append(Issue(sym, "Non-numeric field", "HIGH", pl, "Fix normalization", f"{field}='{values[i]}'"))
+    return issues
+
+
+def outliers_qoq_kernel(symbols: List[str], groups: np.ndarray, labels: List[Any], lag: Lag) -> List[Issue]:
+    rows, prev, curr, same = lag
+    if len(rows) < 2:
+        return []
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (curr - prev) / np.abs(prev)
+    flagged = np.flatnonzero(same & (prev != 0) & (growth > QOQ_SPIKE_THRESHOLD))
+
+    issues: List[Issue] = []
+    for i in flagged:
+        row = rows[i + 1]
+        issues.append(Issue(symbols[groups[row]], "Revenue spike QoQ", "MEDIUM", str(labels[row]), "Manual review", f"{float(growth[i])*100:.1f}% QoQ"))
+    return issues
+
+
+def price_spikes_kernel(symbols: List[str], groups: np.ndarray, times: List[datetime], lag: Lag) -> List[Issue]:
+    rows, p0, p1, same = lag
+    if len(rows) < 2:
+        return []
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        jump = (p1 - p0) / np.abs(p0)
+    flagged = np.flatnonzero(same & (p0 != 0) & (np.abs(jump) > PRICE_SPIKE_THRESHOLD))
+
+    issues: List[Issue] = []
+    for i in flagged:
+        row = rows[i + 1]
+        issues.append(Issue(symbols[groups[row]], "Price spike", "MEDIUM", times[row].strftime("%Y-%m-%d"), "Manual review", f"{float(jump[i])*100:.1f}% day change"))
+    return issues
@@ -0,0 +1,87 @@
+"""
+Validation watermarks: how far each rule has validated each ticker.
+
+last_key is the last validated period label (quarterly rules) or price
+timestamp (ISO format). context holds what the rule needs to continue from
+there, e.g. the previous close or previous revenue. open_issues are the
+issues already raised on validated rows, which later runs carry forward.
+"""
+from dataclasses import astuple, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2.extras import Json, execute_values
+
+from services.data_validation.issues import Issue
+
+VALIDATION_WATERMARKS_DDL = """
+    CREATE TABLE IF NOT EXISTS validation_watermarks (
+        ticker        VARCHAR(20) NOT NULL,
+        rule          VARCHAR(32) NOT NULL,
+        last_key      TEXT,
+        context       JSONB NOT NULL DEFAULT '{}',
+        open_issues   JSONB NOT NULL DEFAULT '[]',
+        validated_at  TIMESTAMP NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (ticker, rule)
+    )
+"""
+
+
+@dataclass
+class RuleWatermark:
+    last_key: Optional[str]
+    context: Dict[str, Any] = field(default_factory=dict)
+    open_issues: List[Issue] = field(default_factory=list)
+
+
+def ensure_watermarks_table(conn) -> None:
+    # Created once up front so parallel workers don't race on the DDL
+    with conn.cursor() as cur:
+        cur.execute(VALIDATION_WATERMARKS_DDL)
+    conn.commit()
+
+
+def load_watermarks(conn, tickers: List[str], rules: List[str]) -> Dict[str, Dict[str, RuleWatermark]]:
+    """ticker -> rule -> watermark for the requested tickers and rules."""
+    marks: Dict[str, Dict[str, RuleWatermark]] = {}
+    if not tickers or not rules:
+        return marks
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT ticker, rule, last_key, context, open_issues
+            FROM validation_watermarks
+            WHERE ticker = ANY(%s) AND rule = ANY(%s)
+            """,
+            (list(tickers), list(rules)),
+        )
+        for ticker, rule, last_key, context, open_issues in cur.fetchall():
+            issues = [Issue(ticker, *it) for it in open_issues or []]
+            marks.setdefault(ticker, {})[rule] = RuleWatermark(last_key, context or {}, issues)
+    return marks
+
+
+def save_watermarks(conn, marks: List[Tuple[str, str, RuleWatermark]]) -> None:
+    """Upsert watermarks; the caller commits."""
+    if not marks:
+        return
+    now = datetime.now()
+    with conn.cursor() as cur:
+        execute_values(
+            cur,
+            """
+            INSERT INTO validation_watermarks (ticker, rule, last_key, context, open_issues, validated_at)
+            VALUES %s
+            ON CONFLICT (ticker, rule) DO UPDATE SET
+                last_key = EXCLUDED.last_key,
+                context = EXCLUDED.context,
+                open_issues = EXCLUDED.open_issues,
+                validated_at = EXCLUDED.validated_at
+            """,
+            [
+                # Issues are stored without the symbol, which is the row's ticker
+                (ticker, rule, mark.last_key, Json(mark.context), Json([astuple(it)[1:] for it in mark.open_issues]), now)
+                for ticker, rule, mark in marks
+            ],
+            page_size=1000,
+        )
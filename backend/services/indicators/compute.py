@@ -0,0 +1,234 @@
+"""
+Vectorized technical indicators over a bar-aligned price matrix.
+
+Bars are laid out as a (bars x tickers) matrix, right-aligned: every
+ticker's latest bar sits in the last row and its history runs upwards,
+with NaN above its first bar. Windows therefore count bars rather than
+calendar days, and one pandas rolling call covers the whole universe.
+Recursive averages (EMA, Wilder smoothing) step down the rows with one
+NumPy operation per row for all tickers at once.
+
+Recursive averages are seeded with the simple average of their first
+`period` inputs (the usual charting convention). Their state round-trips
+through state_records() / state_from_records(), so an incremental run
+only steps through the newest bars. The saved state stops just before each
+ticker's latest bar, which is recomputed on the next run in case ingestion
+corrected it.
+"""
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+SMA_PERIODS = (20, 50, 200)
+EMA_PERIODS = (12, 26)
+MACD_SIGNAL_PERIOD = 9
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+BOLLINGER_PERIOD, BOLLINGER_WIDTH = 20, 2.0
+YEAR_BARS = 252
+VOLUME_PERIODS = (20, 50)
+
+INDICATOR_COLUMNS = (
+    [f"sma_{n}" for n in SMA_PERIODS]
+    + [f"ema_{n}" for n in EMA_PERIODS]
+    + ["macd", "macd_signal", "macd_hist", f"rsi_{RSI_PERIOD}", f"atr_{ATR_PERIOD}",
+       "bb_upper", "bb_middle", "bb_lower", "high_52w", "low_52w"]
+    + [f"volume_avg_{n}" for n in VOLUME_PERIODS]
+)
+
+# Bars before the first recomputed bar that the rolling windows still need
+LOOKBACK_BARS = max(max(SMA_PERIODS), BOLLINGER_PERIOD, YEAR_BARS, max(VOLUME_PERIODS)) - 1
+
+# Recursive averages carried between runs: name -> (period, smoothing factor)
+RECURSIVE_AVERAGES = {
+    **{f"ema_{n}": (n, 2.0 / (n + 1)) for n in EMA_PERIODS},
+    "macd_signal": (MACD_SIGNAL_PERIOD, 2.0 / (MACD_SIGNAL_PERIOD + 1)),
+    "rsi_gain": (RSI_PERIOD, 1.0 / RSI_PERIOD),
+    "rsi_loss": (RSI_PERIOD, 1.0 / RSI_PERIOD),
+    "atr": (ATR_PERIOD, 1.0 / ATR_PERIOD),
+}
+
+PRICE_FIELDS = ["open", "high", "low", "close", "volume"]
+
+
+# -----------------------------
+# Bar matrix
+# -----------------------------
+@dataclass
+class BarMatrix:
+    tickers: List[str]
+    times: np.ndarray              # (bars, tickers) datetime64[ns], NaT above a ticker's first bar
+    fields: Dict[str, np.ndarray]  # open/high/low/close/volume -> (bars, tickers) float
+
+
+def bar_matrix(prices: pd.DataFrame) -> BarMatrix:
+    """(ticker, time)-indexed OHLCV rows -> right-aligned bar matrices."""
+    prices = prices.sort_index()
+    codes, tickers = pd.factorize(prices.index.get_level_values(0))
+    counts = np.bincount(codes, minlength=len(tickers))
+    rows = int(counts.max()) if len(counts) else 0
+
+    # Rows are sorted by ticker then time, so each ticker's bars are one contiguous run
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    row = rows - counts[codes] + (np.arange(len(codes)) - starts[codes])
+
+    times = np.full((rows, len(tickers)), np.datetime64("NaT"), dtype="datetime64[ns]")
+    times[row, codes] = prices.index.get_level_values(1).to_numpy(dtype="datetime64[ns]")
+    fields = {}
+    for field in PRICE_FIELDS:
+        matrix = np.full((rows, len(tickers)), np.nan)
+        matrix[row, codes] = prices[field].to_numpy(dtype=float, na_value=np.nan)
+        fields[field] = matrix
+    return BarMatrix(list(tickers), times, fields)
+
+
+# -----------------------------
+# Recursive averages
+# -----------------------------
+@dataclass
+class AverageState:
+    value: np.ndarray  # current average (NaN until seeded)
+    count: np.ndarray  # inputs seen while seeding, capped at the period
+    total: np.ndarray  # sum of those inputs
+
+    @classmethod
+    def empty(cls, size: int) -> "AverageState":
+        return cls(np.full(size, np.nan), np.zeros(size), np.zeros(size))
+
+    def copy(self) -> "AverageState":
+        return AverageState(self.value.copy(), self.count.copy(), self.total.copy())
+
+
+def recursive_average(x: np.ndarray, period: int, alpha: float,
+                      state: AverageState) -> Tuple[np.ndarray, AverageState]:
+    """
+    avg += alpha * (x - avg) down the rows of x, per column, after a simple-average seed of
+    `period` inputs. NaN inputs are skipped. Returns the averages (NaN while seeding) and the
+    state before the last row.
+    """
+    state = state.copy()
+    out = np.full(x.shape, np.nan)
+    before_last = state.copy()
+    for r in range(len(x)):
+        if r == len(x) - 1:
+            before_last = state.copy()
+        xr = x[r]
+        has = ~np.isnan(xr)
+        seeding = has & (state.count < period)
+        stepping = has & ~seeding
+
+        state.total[seeding] += xr[seeding]
+        state.count[seeding] += 1
+        seeded = seeding & (state.count == period)
+        state.value[seeded] = state.total[seeded] / period
+        state.value[stepping] += alpha * (xr[stepping] - state.value[stepping])
+
+        out[r] = np.where(has, state.value, np.nan)
+    return out, before_last
+
+
+def state_from_records(records: Sequence[Optional[Dict[str, Any]]]) -> Dict[str, AverageState]:
+    """Per-ticker saved states (None for none) -> name -> AverageState over those tickers."""
+    states = {name: AverageState.empty(len(records)) for name in RECURSIVE_AVERAGES}
+    for i, record in enumerate(records):
+        for name, saved in (record or {}).items():
+            if name in states:
+                value, count, total = saved
+                states[name].value[i] = np.nan if value is None else value
+                states[name].count[i] = count
+                states[name].total[i] = total
+    return states
+
+
+def state_records(states: Dict[str, AverageState]) -> List[Dict[str, Any]]:
+    """name -> AverageState -> one JSON-safe dict per ticker ({name: [value, count, total]})."""
+    size = len(next(iter(states.values())).value)
+    return [
+        {
+            name: [None if math.isnan(s.value[i]) else float(s.value[i]), int(s.count[i]), float(s.total[i])]
+            for name, s in states.items()
+        }
+        for i in range(size)
+    ]
+
+
+# -----------------------------
+# Indicators
+# -----------------------------
+def _rolling(matrix: np.ndarray, window: int, how: str, min_periods: Optional[int] = None) -> np.ndarray:
+    rolling = pd.DataFrame(matrix).rolling(window, min_periods=min_periods or window)
+    if how == "std":
+        return rolling.std(ddof=0).to_numpy()
+    return getattr(rolling, how)().to_numpy()
+
+
+def compute_indicators(bars: BarMatrix, since: Sequence[Optional[np.datetime64]],
+                       states: Dict[str, AverageState]) -> Tuple[pd.DataFrame, Dict[str, AverageState]]:
+    """
+    Indicators for every bar at or after each ticker's `since` (None: every bar)
+
+    Args:
+        bars: Bar matrix, including up to LOOKBACK_BARS bars before `since`
+        since: First bar to compute per ticker (bars.tickers order)
+        states: Recursive average state just before `since` (state_from_records)
+
+    Returns:
+        (indicator rows indexed by (ticker, time), recursive state before each ticker's last bar)
+    """
+    close, high, low, volume = (bars.fields[f] for f in ("close", "high", "low", "volume"))
+    since = np.array([np.datetime64("NaT") if s is None else s for s in since], dtype="datetime64[ns]")
+    # Rows to compute: every bar from `since` on. Comparisons with NaT are False, so padding stays out
+    active = ~np.isnat(bars.times) & (np.isnat(since) | (bars.times >= since))
+
+    out: Dict[str, np.ndarray] = {}
+    new_states: Dict[str, AverageState] = {}
+
+    def recurse(name: str, x: np.ndarray) -> np.ndarray:
+        period, alpha = RECURSIVE_AVERAGES[name]
+        values, new_states[name] = recursive_average(np.where(active, x, np.nan), period, alpha, states[name])
+        return values
+
+    for n in SMA_PERIODS:
+        out[f"sma_{n}"] = _rolling(close, n, "mean")
+    for n in EMA_PERIODS:
+        out[f"ema_{n}"] = recurse(f"ema_{n}", close)
+
+    macd = out[f"ema_{EMA_PERIODS[0]}"] - out[f"ema_{EMA_PERIODS[1]}"]
+    out["macd"] = macd
+    out["macd_signal"] = recurse("macd_signal", macd)
+    out["macd_hist"] = macd - out["macd_signal"]
+
+    prev_close = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+    change = close - prev_close
+    gain = recurse("rsi_gain", np.where(np.isnan(change), np.nan, np.maximum(change, 0.0)))
+    loss = recurse("rsi_loss", np.where(np.isnan(change), np.nan, np.maximum(-change, 0.0)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+    # No losses in the window: 100, or 50 for a flat series
+    out[f"rsi_{RSI_PERIOD}"] = np.where(loss == 0, np.where(gain > 0, 100.0, 50.0), rsi)
+
+    # True range; the first bar (no previous close) falls back to high - low
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    out[f"atr_{ATR_PERIOD}"] = recurse("atr", true_range)
+
+    middle = _rolling(close, BOLLINGER_PERIOD, "mean")
+    width = BOLLINGER_WIDTH * _rolling(close, BOLLINGER_PERIOD, "std")
+    out["bb_upper"], out["bb_middle"], out["bb_lower"] = middle + width, middle, middle - width
+
+    # Over the bars available for tickers with less than a year of history
+    out["high_52w"] = _rolling(high, YEAR_BARS, "max", min_periods=1)
+    out["low_52w"] = _rolling(low, YEAR_BARS, "min", min_periods=1)
+
+    for n in VOLUME_PERIODS:
+        out[f"volume_avg_{n}"] = _rolling(volume, n, "mean")
+
+    # Active cells back to rows, ticker-major like the input
+    cols, rows = np.nonzero(active.T)
+    index = pd.MultiIndex.from_arrays(
+        [np.array(bars.tickers, dtype=object)[cols], bars.times[rows, cols]], names=["ticker", "time"]
+    )
+    frame = pd.DataFrame({name: out[name][rows, cols] for name in INDICATOR_COLUMNS}, index=index)
+    return frame, new_states
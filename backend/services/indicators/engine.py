@@ -0,0 +1,311 @@
+"""
+Technical Indicator Engine
+Materializes daily technical indicators from price_history into technical_indicators
+
+- SMA 20/50/200, EMA 12/26, MACD, RSI 14, ATR 14, Bollinger bands (20, 2),
+  52-week high/low and 20/50-day volume averages (services.indicators.compute)
+- Whole batches of tickers are computed at once on a bar-aligned matrix
+- Incremental: indicator_state keeps each ticker's last computed bar and its
+  EMA / Wilder averages, so a run only reads the newest bars plus the rolling
+  window lookback, and only writes the newest bars
+- Bars can be read from the local price store (services.price_store)
+  instead of price_history
+
+Run from the backend directory:
+    python -m services.indicators.engine
+    python -m services.indicators.engine --tickers AAPL,MSFT --full
+    python -m services.indicators.engine --store ../storage/price_store
+"""
+
+import os
+import io
+import time
+import logging
+import argparse
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import psycopg2
+from psycopg2.extras import Json, execute_values
+
+from services.indicators.compute import (
+    INDICATOR_COLUMNS, LOOKBACK_BARS, PRICE_FIELDS, bar_matrix, compute_indicators,
+    state_from_records, state_records,
+)
+from services.price_store import PriceStore
+
+# Configure logging
+log_dir = Path(__file__).parent.parent.parent / 'logs'
+log_dir.mkdir(exist_ok=True)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler(log_dir / f'indicators_{datetime.now().strftime("%Y%m%d")}.log'),
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger(__name__)
+
+INDICATORS_DDL = f"""
+    CREATE TABLE IF NOT EXISTS technical_indicators (
+        time    TIMESTAMP NOT NULL,
+        ticker  VARCHAR(10) NOT NULL,
+        {', '.join(f'{name} DOUBLE PRECISION' for name in INDICATOR_COLUMNS)},
+        PRIMARY KEY (time, ticker)
+    )
+"""
+
+INDICATOR_STATE_DDL = """
+    CREATE TABLE IF NOT EXISTS indicator_state (
+        ticker      VARCHAR(20) PRIMARY KEY,
+        last_time   TIMESTAMP NOT NULL,
+        state       JSONB NOT NULL DEFAULT '{}',
+        updated_at  TIMESTAMP NOT NULL DEFAULT NOW()
+    )
+"""
+
+STAGING_DDL = """
+    CREATE TEMP TABLE IF NOT EXISTS technical_indicators_staging
+        (LIKE technical_indicators INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+"""
+
+OUTPUT_COLUMNS = ['time', 'ticker'] + INDICATOR_COLUMNS
+
+MERGE_SQL = f"""
+    INSERT INTO technical_indicators ({', '.join(OUTPUT_COLUMNS)})
+    SELECT {', '.join(OUTPUT_COLUMNS)} FROM technical_indicators_staging
+    ON CONFLICT (time, ticker) DO UPDATE SET
+        {', '.join(f'{name} = EXCLUDED.{name}' for name in INDICATOR_COLUMNS)}
+"""
+
+# Bars from each ticker's last computed bar on, plus the rolling-window lookback before it
+BARS_SQL = f"""
+    SELECT w.ticker, p.time, p.open::float8, p.high::float8, p.low::float8, p.close::float8, p.volume::float8
+    FROM unnest(%s::text[], %s::timestamp[]) AS w(ticker, since)
+    CROSS JOIN LATERAL (
+        (SELECT time, open, high, low, close, volume FROM price_history
+         WHERE ticker = w.ticker AND (w.since IS NULL OR time >= w.since))
+        UNION ALL
+        (SELECT time, open, high, low, close, volume FROM price_history
+         WHERE ticker = w.ticker AND time < w.since
+         ORDER BY time DESC LIMIT {LOOKBACK_BARS})
+    ) p
+    ORDER BY w.ticker, p.time
+"""
+
+
+class IndicatorEngine:
+    """Incremental technical_indicators refresh"""
+
+    def __init__(self, batch_size: Optional[int] = None, store_dir: Optional[str] = None):
+        """
+        Initialize engine
+
+        Args:
+            batch_size: Tickers computed and committed per batch (env INDICATOR_BATCH_SIZE)
+            store_dir: Read bars from this local price store instead of price_history
+        """
+        self.batch_size = batch_size or int(os.getenv('INDICATOR_BATCH_SIZE', '500'))
+        self.store_dir = store_dir
+
+        # Database connection
+        self.db_config = {
+            'host': os.getenv('DB_HOST', 'localhost'),
+            'port': int(os.getenv('DB_PORT', '5433')),
+            'database': os.getenv('DB_NAME', 'stock_screener'),
+            'user': os.getenv('DB_USER', 'postgres'),
+            'password': os.getenv('DB_PASSWORD', '25101974')
+        }
+
+        # Seconds spent per stage
+        self.stage_timings: Dict[str, float] = defaultdict(float)
+
+    def get_db_connection(self):
+        """Get database connection"""
+        try:
+            conn = psycopg2.connect(**self.db_config)
+            logger.info("PostgreSQL connection established")
+            return conn
+        except Exception as e:
+            logger.error(f"Database connection failed: {e}")
+            raise
+
+    def ensure_tables(self, conn):
+        """Create technical_indicators and indicator_state if missing"""
+        with conn.cursor() as cursor:
+            cursor.execute(INDICATORS_DDL)
+            cursor.execute(INDICATOR_STATE_DDL)
+        conn.commit()
+
+    def fetch_tickers(self, conn) -> List[str]:
+        """Every ticker in the companies table"""
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT ticker FROM companies ORDER BY ticker")
+            return [ticker for (ticker,) in cursor.fetchall()]
+
+    def load_state(self, conn, tickers: List[str]) -> Dict[str, Tuple[datetime, Dict[str, Any]]]:
+        """ticker -> (last computed bar time, saved recursive averages)"""
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT ticker, last_time, state FROM indicator_state WHERE ticker = ANY(%s)",
+                (list(tickers),)
+            )
+            return {ticker: (last_time, state) for ticker, last_time, state in cursor.fetchall()}
+
+    def load_bars(self, conn, tickers: List[str], since: List[Optional[datetime]]) -> pd.DataFrame:
+        """(ticker, time)-indexed OHLCV rows from price_history"""
+        with conn.cursor() as cursor:
+            cursor.execute(BARS_SQL, (list(tickers), since))
+            rows = cursor.fetchall()
+        frame = pd.DataFrame(rows, columns=['ticker', 'time'] + PRICE_FIELDS)
+        return frame.set_index(['ticker', 'time'])
+
+    def load_store_bars(self, store: PriceStore, tickers: List[str],
+                        since: List[Optional[datetime]]) -> pd.DataFrame:
+        """Same rows as load_bars, sliced from the local price store"""
+        frames = []
+        for ticker, first in zip(tickers, since):
+            columns = store.read(ticker)
+            if not len(columns['time']):
+                continue
+            start = 0
+            if first is not None:
+                start = max(0, int(np.searchsorted(columns['time'], np.datetime64(first, 's'))) - LOOKBACK_BARS)
+            index = pd.MultiIndex.from_arrays(
+                [np.full(len(columns['time']) - start, ticker, dtype=object), columns['time'][start:]],
+                names=['ticker', 'time']
+            )
+            frames.append(pd.DataFrame({f: columns[f][start:].astype(float) for f in PRICE_FIELDS}, index=index))
+        if not frames:
+            empty = pd.MultiIndex.from_arrays([[], pd.DatetimeIndex([])], names=['ticker', 'time'])
+            return pd.DataFrame(columns=PRICE_FIELDS, index=empty, dtype=float)
+        return pd.concat(frames)
+
+    def write_indicators(self, conn, indicators: pd.DataFrame, states: List[Tuple[str, datetime, Dict]]):
+        """Merge indicator rows and save the new state in one transaction"""
+        frame = indicators.reset_index()[OUTPUT_COLUMNS]
+        buffer = io.StringIO()
+        frame.to_csv(buffer, header=False, index=False, date_format='%Y-%m-%d %H:%M:%S')
+        buffer.seek(0)
+        now = datetime.now()
+        with conn.cursor() as cursor:
+            try:
+                cursor.execute(STAGING_DDL)
+                cursor.copy_expert(
+                    f"COPY technical_indicators_staging ({', '.join(OUTPUT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                    buffer
+                )
+                cursor.execute(MERGE_SQL)
+                execute_values(
+                    cursor,
+                    """
+                    INSERT INTO indicator_state (ticker, last_time, state, updated_at) VALUES %s
+                    ON CONFLICT (ticker) DO UPDATE SET
+                        last_time = EXCLUDED.last_time,
+                        state = EXCLUDED.state,
+                        updated_at = EXCLUDED.updated_at
+                    """,
+                    [(ticker, last_time, Json(state), now) for ticker, last_time, state in states],
+                    page_size=1000
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def refresh_batch(self, conn, tickers: List[str], saved: Dict[str, Tuple[datetime, Dict[str, Any]]],
+                      store: Optional[PriceStore]) -> int:
+        """Compute and write one batch; returns indicator rows written"""
+        since = [saved[t][0] if t in saved else None for t in tickers]
+
+        load_start = time.monotonic()
+        if store is not None:
+            prices = self.load_store_bars(store, tickers, since)
+        else:
+            prices = self.load_bars(conn, tickers, since)
+        self.stage_timings['load'] += time.monotonic() - load_start
+        if prices.empty:
+            return 0
+
+        compute_start = time.monotonic()
+        bars = bar_matrix(prices)
+        first = {t: s for t, s in zip(tickers, since)}
+        states = state_from_records([saved[t][1] if t in saved else None for t in bars.tickers])
+        since_bars = [None if first[t] is None else np.datetime64(first[t], 'ns') for t in bars.tickers]
+        indicators, new_states = compute_indicators(bars, since_bars, states)
+        last_times = [pd.Timestamp(t).to_pydatetime() for t in bars.times[-1]]
+        self.stage_timings['compute'] += time.monotonic() - compute_start
+
+        write_start = time.monotonic()
+        self.write_indicators(conn, indicators, list(zip(bars.tickers, last_times, state_records(new_states))))
+        self.stage_timings['write'] += time.monotonic() - write_start
+        return len(indicators)
+
+    def refresh(self, tickers: Optional[List[str]] = None, full: bool = False) -> Dict:
+        """
+        Refresh technical_indicators for the given tickers (default: every company)
+
+        Args:
+            tickers: Tickers to refresh
+            full: Ignore saved state and recompute every bar
+
+        Returns:
+            Run summary: tickers, indicator rows written, failed tickers, per-stage seconds
+        """
+        conn = self.get_db_connection()
+        store = PriceStore(self.store_dir) if self.store_dir else None
+        start_time = time.monotonic()
+        summary = {'tickers': 0, 'rows': 0, 'failed': []}
+        try:
+            self.ensure_tables(conn)
+            tickers = tickers or self.fetch_tickers(conn)
+            summary['tickers'] = len(tickers)
+            saved = {} if full else self.load_state(conn, tickers)
+            logger.info(f"Refreshing indicators for {len(tickers)} tickers, "
+                        f"{len(tickers) - len(saved)} from their first bar")
+
+            for i in range(0, len(tickers), self.batch_size):
+                batch = tickers[i:i + self.batch_size]
+                try:
+                    rows = self.refresh_batch(conn, batch, saved, store)
+                except Exception as e:
+                    logger.error(f"[FAILED] Indicator batch of {len(batch)} tickers ({batch[0]}..{batch[-1]}): {e}")
+                    summary['failed'].extend(batch)
+                    continue
+                summary['rows'] += rows
+                logger.info(f"[OK] {len(batch)} tickers ({batch[0]}..{batch[-1]}): {rows} indicator rows")
+        finally:
+            conn.close()
+
+        summary['stage_timings'] = dict(self.stage_timings)
+        summary['elapsed_s'] = time.monotonic() - start_time
+        logger.info(f"Indicator refresh complete: {summary['rows']} rows for {summary['tickers']} tickers "
+                    f"in {summary['elapsed_s']:.1f}s")
+        if summary['failed']:
+            logger.info(f"Failed tickers: {len(summary['failed'])} (re-run to retry)")
+        return summary
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Incremental technical indicator refresh")
+    parser.add_argument("--tickers", help="Comma-separated tickers (default: every company)")
+    parser.add_argument("--full", action="store_true", help="Ignore saved state and recompute every bar")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="Tickers computed and committed per batch (default: 500)")
+    parser.add_argument("--store", default=None, help="Read bars from this local price store directory")
+    args = parser.parse_args()
+
+    tickers = [t.strip().upper() for t in args.tickers.split(',') if t.strip()] if args.tickers else None
+    engine = IndicatorEngine(batch_size=args.batch_size, store_dir=args.store)
+    engine.refresh(tickers, full=args.full)
+
+
+if __name__ == "__main__":
+    main()
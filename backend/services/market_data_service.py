@@ -1,30 +1,102 @@
+import numpy as np
+import pandas as pd
 import yfinance as yf
 
+# yfinance price fields -> output columns
+OHLCV_FIELDS = {"Open": "open", "High": "high", "Low": "low", "Close": "close", "Volume": "volume"}
+
+# Symbols per yf.download request; larger requests get throttled or come back partially empty
+DOWNLOAD_CHUNK_SIZE = 100
+
+
+def _tidy_chunk(raw, symbols):
+    """
+    One yf.download frame (dates x (field, ticker) columns) -> rows per (ticker, date).
+    Dates a ticker has no prices for are dropped.
+    """
+    if not isinstance(raw.columns, pd.MultiIndex):
+        # Single-symbol downloads can come back with flat columns
+        raw = raw.copy()
+        raw.columns = pd.MultiIndex.from_product([raw.columns, symbols[:1]])
+
+    dates = pd.DatetimeIndex(raw.index)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    dates = dates.normalize()
+
+    # dates x fields x tickers -> (ticker, date) rows x fields in one reshape
+    columns = pd.MultiIndex.from_product([list(OHLCV_FIELDS), symbols])
+    values = raw.reindex(columns=columns).to_numpy(dtype=float)
+    values = values.reshape(len(dates), len(OHLCV_FIELDS), len(symbols)).transpose(2, 0, 1).reshape(-1, len(OHLCV_FIELDS))
+    keep = ~np.isnan(values).all(axis=1)
+
+    index = pd.MultiIndex.from_arrays(
+        [np.repeat(np.array(symbols, dtype=object), len(dates))[keep], np.tile(dates.to_numpy(), len(symbols))[keep]],
+        names=["ticker", "date"],
+    )
+    return pd.DataFrame(values[keep], index=index, columns=list(OHLCV_FIELDS.values()))
+
+
+def download_daily_ohlcv(symbols, period="1y", start=None, end=None, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """
+    Fetch daily OHLCV price data for many stocks, chunk_size symbols per request.
+    Returns one DataFrame indexed by (ticker, date) with open/high/low/close/volume columns,
+    sorted by ticker and date. Symbols without data are absent.
+    start/end (YYYY-MM-DD, end exclusive) take precedence over period.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    frames = []
+    for i in range(0, len(symbols), chunk_size):
+        chunk = symbols[i:i + chunk_size]
+        raw = yf.download(
+            tickers=chunk,
+            period=None if start else period,
+            start=start,
+            end=end,
+            interval="1d",
+            group_by="column",
+            auto_adjust=True,
+            actions=False,
+            threads=True,
+            progress=False,
+        )
+        if raw is None or raw.empty:
+            print(f"No price data returned for {len(chunk)} symbols ({chunk[0]}..{chunk[-1]})")
+            continue
+        frames.append(_tidy_chunk(raw, chunk))
+
+    if not frames:
+        empty = pd.MultiIndex.from_arrays([[], pd.DatetimeIndex([])], names=["ticker", "date"])
+        return pd.DataFrame(columns=list(OHLCV_FIELDS.values()), index=empty, dtype=float)
+
+    prices = pd.concat(frames).sort_index()
+    prices["volume"] = prices["volume"].fillna(0).astype(np.int64)
+    return prices
+
 
 def get_daily_ohlcv(symbol, period="1y"):
     """
     Fetch daily OHLCV price data for a stock.
     Returns dict keys by date.
     """
-    ticker = yf.Ticker(symbol)
-    hist = ticker.history(period=period)
-
-    if hist.empty:
+    prices = download_daily_ohlcv([symbol], period=period)
+    if prices.empty:
         print(f"No price data returned for {symbol}")
         return {}
 
-    data = {}
-    for index, row in hist.iterrows():
-        date_str = index.strftime("%Y-%m-%d")
-        data[date_str] = {
-            "open": float(row["Open"]),
-            "high": float(row["High"]),
-            "low": float(row["Low"]),
-            "close": float(row["Close"]),
-            "volume": int(row["Volume"]),
-        }
-
-    return data
+    rows = prices.xs(symbol, level="ticker")
+    dates = rows.index.strftime("%Y-%m-%d")
+    return {
+        date_str: {"open": o, "high": h, "low": lo, "close": c, "volume": v}
+        for date_str, o, h, lo, c, v in zip(
+            dates,
+            rows["open"].tolist(),
+            rows["high"].tolist(),
+            rows["low"].tolist(),
+            rows["close"].tolist(),
+            rows["volume"].tolist(),
+        )
+    }
 
 
 def get_company_metadata(symbol):
@@ -45,4 +117,4 @@ def get_company_metadata(symbol):
         "sector": info.get("sector"),
         "industry": info.get("industry"),
         "market_cap": info.get("marketCap"),
-    }
\ No newline at end of file
+    }
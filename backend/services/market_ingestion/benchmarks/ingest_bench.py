@@ -0,0 +1,371 @@
+"""
+End-to-end fundamentals ingestion benchmark, fully offline
+
+Yahoo is replaced by FakeTicker (synthetic or recorded statement frames with
+a configurable per-call latency) and Postgres by a SQLite sink, so runs are
+repeatable and can gate pipeline changes against a saved baseline. Each
+scenario runs in its own process so peak RSS is per scenario.
+
+Run from the backend directory:
+    python -m services.market_ingestion.benchmarks.ingest_bench --scenario all
+    python -m services.market_ingestion.benchmarks.ingest_bench --scenario medium --json bench.json
+    python -m services.market_ingestion.benchmarks.ingest_bench --scenario medium --baseline bench.json
+    python -m services.market_ingestion.benchmarks.ingest_bench --scenario small --validate
+
+Record real Yahoo payloads once, then replay them instead of synthetic frames:
+    python -m services.market_ingestion.benchmarks.ingest_bench --record recorded/ --record-symbols TCS.NS,INFY.NS
+    python -m services.market_ingestion.benchmarks.ingest_bench --scenario small --recorded recorded/
+"""
+
+import argparse
+import json
+import logging
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services.market_ingestion.benchmarks.transform_bench import synthetic_statement
+from services.market_ingestion.fundamentals_ingest import (
+    FundamentalsIngestionPipeline,
+    INCOME_FIELDS,
+    BALANCE_FIELDS,
+    CASHFLOW_FIELDS,
+    FUNDAMENTALS_COLUMNS,
+)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SCENARIOS = {'small': 70, 'medium': 1000, 'large': 5000}
+
+# Every yf.Ticker attribute the pipeline reads
+TICKER_ATTRS = [
+    'quarterly_financials', 'financials', 'quarterly_balance_sheet', 'balance_sheet',
+    'quarterly_cashflow', 'cashflow', 'info', 'institutional_holders', 'major_holders',
+    'earnings_estimate', 'dividends', 'splits',
+]
+
+SQLITE_DDL = f"""
+CREATE TABLE IF NOT EXISTS companies (ticker TEXT PRIMARY KEY, name TEXT, exchange TEXT);
+CREATE TABLE IF NOT EXISTS fundamentals_quarterly ({', '.join(FUNDAMENTALS_COLUMNS)});
+CREATE TABLE IF NOT EXISTS ingestion_watermarks (
+    ticker TEXT, period_type TEXT, last_period_date TEXT, last_checked_at TEXT,
+    PRIMARY KEY (ticker, period_type)
+);
+CREATE TABLE IF NOT EXISTS fundamentals_quarantine (
+    ticker TEXT, quarter TEXT, row_data TEXT, issues TEXT, quarantined_at TEXT,
+    PRIMARY KEY (ticker, quarter)
+);
+"""
+
+
+class FakeTicker:
+    """Stands in for yf.Ticker: serves prepared payloads, sleeping `latency_s` per attribute read"""
+
+    def __init__(self, payloads: Dict[str, Any], latency_s: float = 0.0):
+        self.__dict__['_payloads'] = payloads
+        self.__dict__['_latency_s'] = latency_s
+
+    def __getattr__(self, name: str):
+        payloads = self.__dict__['_payloads']
+        if name not in payloads:
+            raise AttributeError(name)
+        if self._latency_s > 0:
+            time.sleep(self._latency_s)
+        return payloads[name]
+
+
+def synthetic_payloads(periods: int, rng: np.random.Generator, line_items: int = 40) -> Dict[str, Any]:
+    """Yahoo-shaped payloads for one symbol"""
+    return {
+        'quarterly_financials': synthetic_statement(INCOME_FIELDS, periods, rng, line_items),
+        'financials': synthetic_statement(INCOME_FIELDS, periods, rng, line_items),
+        'quarterly_balance_sheet': synthetic_statement(BALANCE_FIELDS, periods, rng, line_items),
+        'balance_sheet': synthetic_statement(BALANCE_FIELDS, periods, rng, line_items),
+        'quarterly_cashflow': synthetic_statement(CASHFLOW_FIELDS, periods, rng, line_items),
+        'cashflow': synthetic_statement(CASHFLOW_FIELDS, periods, rng, line_items),
+        'info': {
+            'trailingPE': float(rng.uniform(5, 60)),
+            'pegRatio': float(rng.uniform(0.5, 3)),
+            'priceToBook': float(rng.uniform(0.5, 15)),
+            'priceToSalesTrailing12Months': float(rng.uniform(0.5, 20)),
+            'targetHighPrice': 1200.0,
+            'targetLowPrice': 800.0,
+            'targetMeanPrice': 1000.0,
+            'sharesOutstanding': int(rng.integers(1e8, 1e10)),
+        },
+        'institutional_holders': pd.DataFrame({'Holder': ['Fund A', 'Fund B'], '% Out': rng.uniform(0, 0.05, 2)}),
+        'major_holders': pd.DataFrame([[float(rng.uniform(0, 0.7))], [float(rng.uniform(0, 0.3))]]),
+        'earnings_estimate': pd.DataFrame({'0q': [float(rng.uniform(5, 50))]}, index=['Avg. Estimate']),
+        'dividends': pd.Series([float(rng.uniform(1, 20))], index=pd.to_datetime(['2024-07-15'])),
+        'splits': pd.Series(dtype=float),
+    }
+
+
+class TickerFactory:
+    """Builds FakeTickers from synthetic or recorded payloads, deterministically per symbol"""
+
+    def __init__(self, symbols: List[str], latency_s: float, periods: int, seed: int,
+                 recorded: Optional[List[Dict[str, Any]]] = None):
+        self.index = {symbol: i for i, symbol in enumerate(symbols)}
+        self.latency_s = latency_s
+        self.periods = periods
+        self.seed = seed
+        self.recorded = recorded
+
+    def __call__(self, symbol: str) -> FakeTicker:
+        i = self.index[symbol]
+        if self.recorded:
+            payloads = self.recorded[i % len(self.recorded)]
+        else:
+            payloads = synthetic_payloads(self.periods, np.random.default_rng([self.seed, i]))
+        return FakeTicker(payloads, self.latency_s)
+
+
+def record_payloads(symbols: List[str], out_dir: Path):
+    """Capture real yf.Ticker payloads as pickles for replay"""
+    import yfinance as yf
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for symbol in symbols:
+        ticker = yf.Ticker(symbol)
+        payloads = {}
+        for attr in TICKER_ATTRS:
+            try:
+                payloads[attr] = getattr(ticker, attr)
+            except Exception as e:
+                print(f"  {symbol}.{attr}: {e}")
+        pd.to_pickle(payloads, out_dir / f"{symbol}.pkl")
+        print(f"Recorded {symbol}")
+
+
+def load_recorded(recorded_dir: Path) -> List[Dict[str, Any]]:
+    return [pd.read_pickle(path) for path in sorted(recorded_dir.glob('*.pkl'))]
+
+
+class SQLiteBenchPipeline(FundamentalsIngestionPipeline):
+    """Pipeline with Postgres swapped for a SQLite file and all output under a scratch directory"""
+
+    def __init__(self, work_dir: Path, **kwargs):
+        super().__init__(**kwargs)
+        self.db_path = work_dir / 'bench.sqlite'
+        self.runs_dir = work_dir / 'runs'
+        self.dataset_dir = work_dir / 'dataset'
+        self.validation_reports_dir = work_dir / 'validation'
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(SQLITE_DDL)
+        conn.close()
+
+    def get_db_connection(self):
+        return sqlite3.connect(self.db_path)
+
+    def ensure_companies_exist(self, tickers: List[str], cursor):
+        cursor.executemany(
+            "INSERT OR IGNORE INTO companies (ticker, name, exchange) VALUES (?, ?, 'NSE')",
+            [(ticker, ticker.replace('.NS', '')) for ticker in sorted(set(tickers))]
+        )
+
+    def copy_fundamentals_rows(self, rows: List[Tuple], cursor):
+        placeholders = ', '.join('?' for _ in FUNDAMENTALS_COLUMNS)
+        cursor.executemany(
+            f"INSERT INTO fundamentals_quarterly ({', '.join(FUNDAMENTALS_COLUMNS)}) VALUES ({placeholders})",
+            [tuple(v.isoformat() if isinstance(v, datetime) else v for v in row) for row in rows]
+        )
+
+    def load_watermarks(self, conn, period: str) -> Dict[str, Tuple[Optional[date], Optional[datetime]]]:
+        rows = conn.execute(
+            "SELECT ticker, last_period_date, last_checked_at FROM ingestion_watermarks WHERE period_type = ?",
+            (period,)
+        ).fetchall()
+        return {
+            ticker: (date.fromisoformat(last_period) if last_period else None,
+                     datetime.fromisoformat(last_checked) if last_checked else None)
+            for ticker, last_period, last_checked in rows
+        }
+
+    def update_watermarks(self, cursor, period: str, batch: List[Tuple[str, List[Tuple], Optional[str]]]):
+        now = datetime.now().isoformat()
+        cursor.executemany(
+            """INSERT INTO ingestion_watermarks (ticker, period_type, last_period_date, last_checked_at)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT (ticker, period_type) DO UPDATE SET
+                   last_period_date = MAX(COALESCE(last_period_date, excluded.last_period_date),
+                                          COALESCE(excluded.last_period_date, last_period_date)),
+                   last_checked_at = excluded.last_checked_at""",
+            [(symbol, period, latest_period, now) for symbol, _, latest_period in batch]
+        )
+
+    def load_quarantined(self, conn) -> Dict[str, Set[str]]:
+        quarantined: Dict[str, Set[str]] = defaultdict(set)
+        for ticker, quarter in conn.execute("SELECT ticker, quarter FROM fundamentals_quarantine"):
+            quarantined[ticker].add(quarter)
+        return dict(quarantined)
+
+    def copy_quarantine_rows(self, symbols: List[str], cursor):
+        now = datetime.now().isoformat()
+        cursor.executemany(
+            """INSERT INTO fundamentals_quarantine (ticker, quarter, row_data, issues, quarantined_at)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT (ticker, quarter) DO UPDATE SET
+                   row_data = excluded.row_data,
+                   issues = excluded.issues,
+                   quarantined_at = excluded.quarantined_at""",
+            [(row[0], row[1], json.dumps(dict(zip(FUNDAMENTALS_COLUMNS, row)), default=str),
+              json.dumps([issue.issue_type for issue in issues]), now)
+             for symbol in symbols for row, issues in self.quarantine.get(symbol, [])]
+        )
+        cursor.executemany(
+            "DELETE FROM fundamentals_quarantine WHERE ticker = ? AND quarter = ?",
+            [(symbol, quarter) for symbol in symbols for quarter in self.released.get(symbol, [])]
+        )
+
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_scenario(name: str, symbol_count: int, options: Dict) -> Dict:
+    """Run one scenario end to end (called in a fresh process)"""
+    logging.getLogger('services.market_ingestion').setLevel(logging.INFO if options['verbose'] else logging.WARNING)
+
+    work_dir = Path(tempfile.mkdtemp(prefix=f'ingest_bench_{name}_'))
+    try:
+        symbols = [f"BENCH{i:05d}.NS" for i in range(symbol_count)]
+        recorded = load_recorded(Path(options['recorded'])) if options['recorded'] else None
+        pipeline = SQLiteBenchPipeline(
+            work_dir,
+            max_workers=options['fetch_workers'],
+            requests_per_second=options['rps'],
+            full_refresh=True,
+            validate=options['validate'],
+        )
+        pipeline.ticker_factory = TickerFactory(symbols, options['latency_ms'] / 1000, options['periods'],
+                                                options['seed'], recorded)
+
+        start = time.perf_counter()
+        summary = pipeline.run_full_ingestion(symbols)
+        elapsed = time.perf_counter() - start
+
+        conn = sqlite3.connect(pipeline.db_path)
+        stored_rows = conn.execute("SELECT COUNT(*) FROM fundamentals_quarterly").fetchone()[0]
+        quarantined_rows = conn.execute("SELECT COUNT(*) FROM fundamentals_quarantine").fetchone()[0]
+        conn.close()
+
+        return {
+            'scenario': name,
+            'symbols': symbol_count,
+            'rows': summary['total_records'],
+            'stored_rows': stored_rows,
+            'quarantined_rows': quarantined_rows,
+            'failures': len(summary['failures']),
+            'elapsed_s': elapsed,
+            'symbols_per_sec': symbol_count / elapsed,
+            'rows_per_sec': summary['total_records'] / elapsed,
+            'peak_rss_mb': peak_rss_mb(),
+            'stage_timings': summary['stage_timings'],
+        }
+    finally:
+        if not options['keep']:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def print_result(result: Dict):
+    rss = f"{result['peak_rss_mb']:.0f} MB" if result['peak_rss_mb'] is not None else 'n/a'
+    print(f"[{result['scenario']}] {result['symbols']} symbols, {result['rows']} rows "
+          f"({result['stored_rows']} stored, {result['quarantined_rows']} quarantined, {result['failures']} failures) in {result['elapsed_s']:.2f}s")
+    print(f"    {result['symbols_per_sec']:,.1f} symbols/sec, {result['rows_per_sec']:,.0f} rows/sec, peak RSS {rss}")
+    stages = ', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in sorted(result['stage_timings'].items()))
+    print(f"    stage time: {stages}")
+
+
+def check_baseline(results: List[Dict], baseline_path: Path, tolerance: float) -> bool:
+    """Compare symbols/sec against a saved run; False if any scenario regressed beyond tolerance"""
+    baseline = {result['scenario']: result for result in json.loads(baseline_path.read_text())}
+    ok = True
+    for result in results:
+        previous = baseline.get(result['scenario'])
+        if previous is None:
+            continue
+        ratio = result['symbols_per_sec'] / previous['symbols_per_sec']
+        status = 'OK' if ratio >= 1 - tolerance else 'REGRESSION'
+        ok = ok and status == 'OK'
+        print(f"[{status}] {result['scenario']}: {ratio:.2f}x baseline symbols/sec")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline fundamentals ingestion benchmark")
+    parser.add_argument("--scenario", choices=list(SCENARIOS) + ['all'], default='small')
+    parser.add_argument("--symbols", type=int, help="Custom universe size (overrides --scenario)")
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="Simulated latency per Yahoo call")
+    parser.add_argument("--rps", type=float, default=0, help="Request budget per second (0 = unlimited)")
+    parser.add_argument("--fetch-workers", type=int, default=8)
+    parser.add_argument("--periods", type=int, default=5, help="Periods per synthetic statement")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--recorded", help="Replay payloads captured with --record instead of synthetic ones")
+    parser.add_argument("--record", help="Capture real Yahoo payloads into this directory and exit")
+    parser.add_argument("--record-symbols", default='TCS.NS,INFY.NS,HDFCBANK.NS,RELIANCE.NS',
+                        help="Comma-separated symbols for --record")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", help="Fail if symbols/sec regressed against this results file")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed regression ratio for --baseline")
+    parser.add_argument("--validate", action="store_true", help="Validate quarterly rows inline (quarantine)")
+    parser.add_argument("--keep", action="store_true", help="Keep scratch databases and datasets")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline logs")
+    args = parser.parse_args()
+
+    if args.record:
+        record_payloads(args.record_symbols.split(','), Path(args.record))
+        return
+
+    if args.symbols:
+        scenarios = [('custom', args.symbols)]
+    elif args.scenario == 'all':
+        scenarios = list(SCENARIOS.items())
+    else:
+        scenarios = [(args.scenario, SCENARIOS[args.scenario])]
+
+    options = {
+        'latency_ms': args.latency_ms,
+        'rps': args.rps,
+        'fetch_workers': args.fetch_workers,
+        'periods': args.periods,
+        'seed': args.seed,
+        'recorded': args.recorded,
+        'validate': args.validate,
+        'keep': args.keep,
+        'verbose': args.verbose,
+    }
+
+    results = []
+    for name, symbol_count in scenarios:
+        # A fresh process per scenario so peak RSS is not inherited from a larger run
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(run_scenario, name, symbol_count, options).result()
+        print_result(result)
+        results.append(result)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    if args.baseline and not check_baseline(results, Path(args.baseline), args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Statement transform benchmark: legacy iterrows + safe_get path vs the columnar path
+
+Run from the backend directory:
+    python -m services.market_ingestion.benchmarks.transform_bench --symbols 500
+"""
+
+import argparse
+import math
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from services.market_ingestion.fundamentals_ingest import (
+    FundamentalsIngestionPipeline,
+    INCOME_FIELDS,
+    BALANCE_FIELDS,
+    CASHFLOW_FIELDS,
+)
+
+
+def synthetic_statement(fields: Dict[str, str], periods: int, rng: np.random.Generator,
+                        line_items: int = 40, missing_ratio: float = 0.1) -> pd.DataFrame:
+    """Build a Yahoo-shaped statement (line items as rows, newest period first)"""
+    dates = pd.date_range(end='2024-12-31', periods=periods, freq='QE')[::-1]
+    index = list(fields) + [f"Other Line Item {i}" for i in range(max(0, line_items - len(fields)))]
+    values = rng.normal(1e9, 5e8, size=(len(index), periods))
+    values[rng.random(values.shape) < missing_ratio] = np.nan
+    return pd.DataFrame(values, index=index, columns=dates)
+
+
+def legacy_transform(pipeline: FundamentalsIngestionPipeline, symbol: str, raw: Dict[str, pd.DataFrame]) -> List[Dict]:
+    """The per-row transform the pipeline used before the columnar path"""
+    def rows(df):
+        return df.T.sort_index().iterrows()
+    
+    income = []
+    for date, row in rows(raw['income']):
+        income.append({
+            'ticker': symbol,
+            'date': date.strftime('%Y-%m-%d'),
+            'quarter': f"Q{((date.month - 1) // 3) + 1} {date.year}",
+            'fiscal_year': date.year,
+            **{out: pipeline.safe_get(row, src) for src, out in INCOME_FIELDS.items()},
+            'diluted_eps': None,
+        })
+    
+    balance = {}
+    for date, row in rows(raw['balance']):
+        balance[date.strftime('%Y-%m-%d')] = {out: pipeline.safe_get(row, src) for src, out in BALANCE_FIELDS.items()}
+    
+    cashflow = {}
+    for date, row in rows(raw['cashflow']):
+        record = {out: pipeline.safe_get(row, src) for src, out in CASHFLOW_FIELDS.items()}
+        record['free_cash_flow'] = None
+        if record['operating_cash_flow'] is not None and record['capex'] is not None:
+            record['free_cash_flow'] = record['operating_cash_flow'] + record['capex']
+        cashflow[date.strftime('%Y-%m-%d')] = record
+    
+    merged = []
+    for inc in income:
+        bal = balance.get(inc['date'], {})
+        cf = cashflow.get(inc['date'], {})
+        record = {**inc, **bal, **cf}
+        merged.append(pipeline.calculate_derived_metrics(record))
+    return merged
+
+
+class RecordedTicker:
+    """Serves pre-built statement frames in place of yf.Ticker"""
+    
+    def __init__(self, raw: Dict[str, pd.DataFrame]):
+        self.quarterly_financials = raw['income']
+        self.quarterly_balance_sheet = raw['balance']
+        self.quarterly_cashflow = raw['cashflow']
+
+
+def columnar_transform(pipeline: FundamentalsIngestionPipeline, symbol: str, raw: Dict[str, pd.DataFrame]) -> List[Dict]:
+    """The current columnar transform, driven through the pipeline's fetchers"""
+    income = pipeline.fetch_income_columns(symbol)
+    balance = pipeline.fetch_balance_columns(symbol)
+    cashflow = pipeline.fetch_cashflow_columns(symbol)
+    merged = pipeline.merge_financial_columns(income, balance, cashflow, {}, {}, {})
+    return pipeline.columns_to_records(merged)
+
+
+def same_value(a, b) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    if isinstance(a, float) and isinstance(b, float):
+        return a == b or (math.isnan(a) and math.isnan(b))
+    return a == b
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=500, help="Number of synthetic symbols")
+    parser.add_argument("--periods", type=int, default=5, help="Periods per statement")
+    parser.add_argument("--line-items", type=int, default=40, help="Line items per statement")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    pipeline = FundamentalsIngestionPipeline(requests_per_second=0)
+    universe = {
+        f"SYM{i:05d}.NS": {
+            'income': synthetic_statement(INCOME_FIELDS, args.periods, rng, args.line_items),
+            'balance': synthetic_statement(BALANCE_FIELDS, args.periods, rng, args.line_items),
+            'cashflow': synthetic_statement(CASHFLOW_FIELDS, args.periods, rng, args.line_items),
+        }
+        for i in range(args.symbols)
+    }
+    
+    # Statements are served from memory so only transform time is measured
+    pipeline.start_fetch_session().ticker_factory = lambda symbol: RecordedTicker(universe[symbol])
+    
+    results = {}
+    timings = {}
+    for name, transform in (('legacy', legacy_transform), ('columnar', columnar_transform)):
+        start = time.perf_counter()
+        results[name] = {symbol: transform(pipeline, symbol, raw) for symbol, raw in universe.items()}
+        timings[name] = time.perf_counter() - start
+    
+    # Derived and statement fields must agree record for record
+    compared = [
+        'revenue', 'net_income', 'total_debt', 'total_equity', 'free_cash_flow', 'debt_to_equity',
+        'current_ratio', 'operating_margin', 'net_profit_margin', 'roe', 'roa', 'debt_to_fcf_ratio',
+        'ebitda_margin', 'quarter', 'fiscal_year',
+    ]
+    mismatches = 0
+    for symbol, legacy_records in results['legacy'].items():
+        columnar_records = results['columnar'][symbol]
+        if len(legacy_records) != len(columnar_records):
+            mismatches += 1
+            continue
+        for old, new in zip(legacy_records, columnar_records):
+            mismatches += sum(1 for field in compared if not same_value(old.get(field), new.get(field)))
+    
+    rows = sum(len(records) for records in results['legacy'].values())
+    print(f"Symbols: {args.symbols}, periods: {args.periods}, records: {rows}")
+    for name, seconds in timings.items():
+        print(f"{name:>9}: {seconds:.3f}s ({rows / seconds:,.0f} records/sec)")
+    print(f"  speedup: {timings['legacy'] / timings['columnar']:.2f}x")
+    print(f"mismatched fields: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Columnar fundamentals dataset
+
+Processed fundamentals are kept as one Parquet dataset, hive-partitioned by
+period_type and ingest_date:
+
+    storage/datasets/fundamentals/period_type=quarterly/ingest_date=2024-05-01/<run_id>-<writer>-<token>-<n>-0.parquet
+
+Each writer buffers rows and writes them once per DB write batch, so a run
+adds a file per batch instead of one JSON and one CSV per symbol, and a
+crash loses no output of symbols already committed. The token is unique
+per writer process, so a resumed run (same run_id and writer name) adds
+files next to the first attempt's instead of overwriting them.
+Readers load the whole universe with load_fundamentals_dataset.
+"""
+
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+# Numeric output columns (the former normalized CSV layout)
+NUMERIC_COLUMNS = [
+    'revenue', 'gross_profit', 'ebitda', 'operating_income', 'net_income', 'diluted_eps',
+    'total_debt', 'cash_and_equivalents', 'free_cash_flow', 'debt_to_equity',
+    'debt_to_fcf_ratio', 'pe_ratio', 'peg_ratio', 'pb_ratio', 'ps_ratio',
+    'promoter_holding', 'institutional_holding', 'price_target_high',
+    'price_target_low', 'price_target_avg', 'eps_estimate',
+    'buybacks', 'dividends', 'splits', 'roe', 'roa', 'operating_margin',
+    'ebitda_margin', 'current_ratio', 'total_assets', 'operating_cash_flow'
+]
+
+DATASET_SCHEMA = pa.schema(
+    [('ticker', pa.string()), ('date', pa.date32()), ('quarter', pa.string()), ('fiscal_year', pa.int32())]
+    + [(name, pa.float64()) for name in NUMERIC_COLUMNS]
+)
+
+PARTITIONING = ds.partitioning(
+    pa.schema([('period_type', pa.string()), ('ingest_date', pa.string())]),
+    flavor='hive'
+)
+
+
+def columns_to_table(columns: Dict[str, np.ndarray]) -> pa.Table:
+    """
+    Build a table with the dataset schema from pipeline columns
+
+    Missing columns become nulls and NaN becomes null, so every file in the
+    dataset shares one schema regardless of which line items Yahoo returned.
+    """
+    size = len(columns['ticker'])
+    arrays = []
+    for field in DATASET_SCHEMA:
+        values = columns.get(field.name)
+        if values is None:
+            arrays.append(pa.nulls(size, type=field.type))
+        elif field.name == 'date':
+            arrays.append(pa.array(np.asarray(values, dtype='datetime64[D]'), type=field.type))
+        elif pa.types.is_floating(field.type):
+            numeric = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype=float)
+            arrays.append(pa.array(numeric, type=field.type, from_pandas=True))
+        else:
+            arrays.append(pa.array(pd.Series(values, dtype=object), type=field.type, from_pandas=True))
+    return pa.Table.from_arrays(arrays, schema=DATASET_SCHEMA)
+
+
+class FundamentalsDatasetWriter:
+    """Buffers processed fundamentals and writes them to the dataset in batches"""
+
+    def __init__(self, root: Path, run_id: str, writer: str = 'main', ingest_date: Optional[str] = None):
+        """
+        Args:
+            root: Dataset root directory
+            run_id: Run identifier, part of every file name
+            writer: Writer name (one per process), part of every file name
+            ingest_date: Partition value, defaults to today
+        """
+        self.root = Path(root)
+        self.run_id = run_id
+        self.writer = writer
+        self.ingest_date = ingest_date or datetime.now().strftime('%Y-%m-%d')
+        self._tables: List[pa.Table] = []
+        # _flushes restarts in every process; the token keeps file names unique across processes
+        self._token = uuid.uuid4().hex[:12]
+        self._flushes = 0
+        self.rows_written = 0
+
+    @property
+    def rows_buffered(self) -> int:
+        return sum(table.num_rows for table in self._tables)
+
+    def add(self, columns: Dict[str, np.ndarray], period: str):
+        """Buffer one symbol's processed columns for a period"""
+        table = columns_to_table(columns)
+        if table.num_rows == 0:
+            return
+        table = table.append_column('period_type', pa.array([period] * table.num_rows, type=pa.string()))
+        table = table.append_column('ingest_date', pa.array([self.ingest_date] * table.num_rows, type=pa.string()))
+        self._tables.append(table)
+
+    def flush(self) -> int:
+        """
+        Write buffered rows as new files in the dataset
+
+        Returns:
+            Number of rows written
+        """
+        if not self._tables:
+            return 0
+        table = pa.concat_tables(self._tables)
+        self._tables = []
+        self.root.mkdir(parents=True, exist_ok=True)
+        ds.write_dataset(
+            table, self.root, format='parquet', partitioning=PARTITIONING,
+            basename_template=f'{self.run_id}-{self.writer}-{self._token}-{self._flushes}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore'
+        )
+        self._flushes += 1
+        self.rows_written += table.num_rows
+        return table.num_rows
+
+
+def load_fundamentals_dataset(root: Path, columns: Optional[List[str]] = None,
+                              period_type: Optional[str] = None,
+                              ingest_date: Optional[str] = None,
+                              tickers: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Load the fundamentals dataset into one DataFrame
+
+    Args:
+        root: Dataset root directory
+        columns: Columns to read (others are never decoded); None reads all
+        period_type: 'quarterly' or 'annual'; None reads both
+        ingest_date: Restrict to one ingestion date partition
+        tickers: Restrict to these tickers
+
+    Returns:
+        One row per ticker and period per ingestion
+    """
+    root = Path(root)
+    if not root.exists():
+        names = columns or DATASET_SCHEMA.names + ['period_type', 'ingest_date']
+        return pd.DataFrame(columns=names)
+
+    dataset = ds.dataset(root, format='parquet', partitioning=PARTITIONING)
+    condition = None
+    for expression in (
+        ds.field('period_type') == period_type if period_type else None,
+        ds.field('ingest_date') == ingest_date if ingest_date else None,
+        ds.field('ticker').isin(tickers) if tickers else None,
+    ):
+        if expression is not None:
+            condition = expression if condition is None else condition & expression
+    return dataset.to_table(columns=columns, filter=condition).to_pandas()
@@ -8,26 +8,54 @@ Features:
 - Cash flow statement ingestion
 - Financial ratios calculation
 - Data normalization and validation
+- Concurrent, rate-limited fetching with a single DB writer
+- Incremental runs driven by per-ticker watermarks (--full-refresh to bypass)
+- Processed output as one Parquet dataset partitioned by period and ingest date
+- Checkpointed runs: per-symbol progress is recorded in a run manifest and
+  an interrupted run continues with --resume <run_id>
+- Multi-process mode (--workers N) sharding the symbol universe across processes
+- Optional inline validation (--validate): quarterly rows are checked in memory
+  before the write and rows with HIGH severity issues are quarantined; held
+  periods are re-validated on later runs until they pass
+
+Run from the backend directory:
+    python -m services.market_ingestion.fundamentals_ingest
 """
 
 import os
+import io
+import csv
 import json
+import math
+import time
 import logging
-from datetime import datetime
+import argparse
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Callable, List, Dict, Optional, Iterator, Set, Tuple
+import numpy as np
 import pandas as pd
 import psycopg2
-from psycopg2.extras import execute_values
-import yfinance as yf
+from psycopg2.extras import Json, execute_values
+
+from services.market_ingestion.fundamentals_dataset import FundamentalsDatasetWriter
+from services.market_ingestion.inline_validation import QUARANTINE_DDL, InlineValidator, to_period_label
+from services.market_ingestion.rate_limit import TokenBucket
+from services.market_ingestion.run_manifest import RunManifest
+from services.market_ingestion.yahoo_session import YahooFetchSession
 
 # Configure logging
 log_dir = Path(__file__).parent.parent.parent / 'logs'
 log_dir.mkdir(exist_ok=True)
 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
         logging.FileHandler(log_dir / f'fundamentals_ingestion_{datetime.now().strftime("%Y%m%d")}.log'),
         logging.StreamHandler()
@@ -35,14 +63,112 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Column name -> one array element per reporting period
+Columns = Dict[str, np.ndarray]
+
+# Yahoo statement line items -> pipeline columns
+INCOME_FIELDS = {
+    'Total Revenue': 'revenue',
+    'Gross Profit': 'gross_profit',
+    'Operating Income': 'operating_income',
+    'EBITDA': 'ebitda',
+    'Net Income': 'net_income',
+}
+
+BALANCE_FIELDS = {
+    'Total Assets': 'total_assets',
+    'Current Assets': 'current_assets',
+    'Total Liabilities Net Minority Interest': 'total_liabilities',
+    'Current Liabilities': 'current_liabilities',
+    'Total Debt': 'total_debt',
+    'Total Equity Gross Minority Interest': 'total_equity',
+    'Cash And Cash Equivalents': 'cash_and_equivalents',
+}
+
+CASHFLOW_FIELDS = {
+    'Operating Cash Flow': 'operating_cash_flow',
+    'Investing Cash Flow': 'investing_cash_flow',
+    'Financing Cash Flow': 'financing_cash_flow',
+    'Capital Expenditure': 'capex',
+}
+
+# Statement columns carried into merged records, in output order
+MERGE_BALANCE_COLUMNS = [
+    'total_assets', 'total_liabilities', 'total_equity', 'total_debt',
+    'cash_and_equivalents', 'current_assets', 'current_liabilities'
+]
+MERGE_CASHFLOW_COLUMNS = [
+    'operating_cash_flow', 'investing_cash_flow', 'financing_cash_flow', 'free_cash_flow', 'capex'
+]
+
+# yf.Ticker attributes read by both the quarterly and the annual pass (statements are per pass)
+SHARED_YAHOO_ATTRS = ('info', 'institutional_holders', 'major_holders', 'earnings_estimate', 'dividends', 'splits')
+
+# Minimum gap before the next period can exist after the latest stored one
+PERIOD_LENGTHS = {
+    'quarterly': timedelta(days=90),
+    'annual': timedelta(days=365),
+}
+
+WATERMARKS_DDL = """
+    CREATE TABLE IF NOT EXISTS ingestion_watermarks (
+        ticker            VARCHAR(20) NOT NULL,
+        period_type       VARCHAR(10) NOT NULL,
+        last_period_date  DATE,
+        last_checked_at   TIMESTAMP NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (ticker, period_type)
+    )
+"""
+
+# fundamentals_quarterly columns written by the bulk writer, in row order
+FUNDAMENTALS_COLUMNS = [
+    'ticker', 'quarter', 'revenue', 'net_income', 'eps', 'operating_margin', 'roe', 'roa',
+    'pe_ratio', 'pb_ratio', 'debt_to_equity', 'current_ratio', 'total_assets', 'total_debt',
+    'free_cash_flow', 'ebitda', 'ebitda_margin', 'operating_cash_flow', 'created_at'
+]
+
 
 class FundamentalsIngestionPipeline:
     """Pipeline for ingesting fundamental financial data"""
     
-    def __init__(self, provider: str = 'yahoo'):
-        """Initialize pipeline"""
+    def __init__(self, provider: str = 'yahoo', max_workers: Optional[int] = None,
+                 requests_per_second: Optional[float] = None, full_refresh: bool = False,
+                 validate: bool = False):
+        """
+        Initialize pipeline
+        
+        Args:
+            provider: Data provider name
+            max_workers: Number of concurrent fetch threads (env INGEST_FETCH_WORKERS)
+            requests_per_second: Remote call budget shared by all fetch threads,
+                0 disables limiting (env YAHOO_REQUESTS_PER_SECOND)
+            full_refresh: Ignore watermarks, re-fetch every symbol and write every period
+            validate: Run the validation rules on quarterly rows before they are written
+                and quarantine rows with HIGH severity issues
+        """
         self.provider = provider
         
+        # Concurrent fetch stage
+        self.max_workers = max_workers or int(os.getenv('INGEST_FETCH_WORKERS', '8'))
+        if requests_per_second is None:
+            requests_per_second = float(os.getenv('YAHOO_REQUESTS_PER_SECOND', '5'))
+        self.requests_per_second = requests_per_second
+        self.rate_limiter = TokenBucket(requests_per_second) if requests_per_second > 0 else None
+        self.fetch_session: Optional[YahooFetchSession] = None
+        # Symbols a later pass of this run still reads from the fetch session. After each pass
+        # they keep only SHARED_YAHOO_ATTRS; every other symbol is released completely
+        self.retain_symbols: Set[str] = set()
+        
+        # Builds per-symbol ticker objects (None -> yf.Ticker); benchmarks inject a fake here
+        self.ticker_factory: Optional[Callable[[str], Any]] = None
+        
+        # Symbols committed per write transaction
+        self.write_batch_size = int(os.getenv('INGEST_WRITE_BATCH_SIZE', '50'))
+        
+        # Incremental ingestion: symbols checked more recently than this are skipped
+        self.full_refresh = full_refresh
+        self.recheck_interval = timedelta(hours=float(os.getenv('INGEST_RECHECK_HOURS', '20')))
+        
         # Database connection
         self.db_config = {
             'host': os.getenv('DB_HOST', 'localhost'),
@@ -54,14 +180,33 @@ class FundamentalsIngestionPipeline:
         
         # Storage paths
         self.storage_root = Path(__file__).parent.parent.parent.parent / 'storage'
-        self.processed_dir = self.storage_root / 'processed' / 'fundamentals' / datetime.now().strftime('%Y-%m-%d')
-        self.processed_dir.mkdir(parents=True, exist_ok=True)
+        self.runs_dir = self.storage_root / 'runs'
+        self.manifest: Optional[RunManifest] = None
+        
+        # Writer name for manifest events and dataset files ('shard<i>' in --workers runs)
+        self.writer_name = 'main'
+        
+        # (symbol, period, error) for every unit that failed in this process
+        self.failures: List[Tuple[str, str, str]] = []
+        
+        # Seconds spent per stage (fetch is summed over fetch threads)
+        self.stage_timings: Dict[str, float] = defaultdict(float)
+        self._timings_lock = threading.Lock()
         
-        # Data processed directory for CSV files
-        self.data_processed_dir = Path(__file__).parent.parent.parent.parent / 'data' / 'processed' / 'fundamentals'
-        self.data_processed_dir.mkdir(parents=True, exist_ok=True)
+        # Processed output: Parquet dataset, written with every DB write batch
+        self.dataset_dir = self.storage_root / 'datasets' / 'fundamentals'
+        self.dataset_writer: Optional[FundamentalsDatasetWriter] = None
         
-        logger.info(f"Initialized FundamentalsIngestionPipeline with provider: {provider}")
+        # Inline validation: issue report next to validate_data's, quarantined rows per symbol until written
+        self.validate = validate
+        self.validation_reports_dir = Path(__file__).parent.parent / 'data_validation' / 'reports'
+        self.validator: Optional[InlineValidator] = None
+        self.quarantine: Dict[str, List[Tuple[Tuple, List]]] = {}
+        # Previously quarantined quarters per symbol that now pass and go out with its write
+        self.released: Dict[str, List[str]] = {}
+        
+        logger.info(f"Initialized FundamentalsIngestionPipeline with provider: {provider}, "
+                    f"fetch workers: {self.max_workers}, rate limit: {requests_per_second or 'off'} req/s")
     
     def get_db_connection(self):
         """Get database connection"""
@@ -73,51 +218,6 @@ class FundamentalsIngestionPipeline:
             logger.error(f"Database connection failed: {e}")
             raise
     
-    def save_processed_data(self, data: Dict, filename: str):
-        """Save processed data to file"""
-        filepath = self.processed_dir / filename
-        try:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-            logger.debug(f"Saved processed data to {filepath}")
-        except Exception as e:
-            logger.error(f"Failed to save processed data: {e}")
-    
-    def save_normalized_csv(self, data: List[Dict], symbol: str, period: str):
-        """Save normalized data as CSV to data/processed/fundamentals/"""
-        try:
-            # Create period-specific directory
-            period_dir = self.data_processed_dir / period
-            period_dir.mkdir(exist_ok=True)
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(data)
-            
-            # Select and order columns for CSV output
-            csv_columns = [
-                'ticker', 'date', 'quarter', 'revenue', 'gross_profit', 'ebitda', 
-                'operating_income', 'net_income', 'diluted_eps', 'total_debt', 
-                'cash_and_equivalents', 'free_cash_flow', 'debt_to_equity', 
-                'debt_to_fcf_ratio', 'pe_ratio', 'peg_ratio', 'pb_ratio', 'ps_ratio',
-                'promoter_holding', 'institutional_holding', 'price_target_high',
-                'price_target_low', 'price_target_avg', 'eps_estimate',
-                'buybacks', 'dividends', 'splits', 'roe', 'roa', 'operating_margin',
-                'ebitda_margin', 'current_ratio', 'total_assets', 'operating_cash_flow'
-            ]
-            
-            # Keep only columns that exist in the data
-            available_columns = [col for col in csv_columns if col in df.columns]
-            df_output = df[available_columns]
-            
-            # Save CSV
-            csv_filename = f"{symbol}_{period}_normalized.csv"
-            csv_path = period_dir / csv_filename
-            df_output.to_csv(csv_path, index=False)
-            logger.info(f"Saved normalized CSV: {csv_path}")
-            
-        except Exception as e:
-            logger.error(f"Failed to save normalized CSV for {symbol}: {e}")
-    
     def safe_get(self, row, key: str) -> Optional[float]:
         """Safely get value from row, handling missing keys and NaN"""
         try:
@@ -129,163 +229,194 @@ class FundamentalsIngestionPipeline:
         except Exception:
             return None
     
-    def fetch_income_statement(self, symbol: str, period: str = 'quarterly') -> List[Dict]:
+    def start_fetch_session(self) -> YahooFetchSession:
+        """Start a fresh per-run fetch session shared by all ingestion passes"""
+        self.fetch_session = YahooFetchSession(rate_limiter=self.rate_limiter, ticker_factory=self.ticker_factory)
+        return self.fetch_session
+    
+    def end_fetch_session(self):
+        """Log fetch session counters and release cached payloads"""
+        if self.fetch_session is None:
+            return
+        stats = self.fetch_session.stats()
+        logger.info(f"Fetch session: {stats['symbols']} symbols, {stats['remote_calls']} remote calls, "
+                    f"{stats['cache_hits']} served from cache")
+        self.fetch_session.clear()
+        self.fetch_session = None
+    
+    def _yahoo_attr(self, symbol: str, name: str):
+        """Read a yf.Ticker attribute through the per-run fetch session (created on first direct use)"""
+        if self.fetch_session is None:
+            self.start_fetch_session()
+        return self.fetch_session.get(symbol, name)
+    
+    def statement_columns(self, raw: Optional[pd.DataFrame], symbol: str, fields: Dict[str, str],
+                          fiscal_year: bool = False) -> Columns:
+        """
+        Select and rename statement line items in one columnar step
+        
+        Args:
+            raw: Yahoo statement frame (line items as rows, period dates as columns)
+            symbol: Stock symbol
+            fields: Mapping of Yahoo line item -> output column
+            fiscal_year: Include a fiscal_year column after quarter
+        
+        Returns:
+            Column name -> array, one element per period in date order (NaN when missing)
         """
-        Fetch income statement data
+        if raw is None or raw.empty:
+            dates = np.array([], dtype='datetime64[ns]')
+            values = np.empty((len(fields), 0))
+        else:
+            dates = pd.DatetimeIndex(raw.columns)
+            if dates.tz is not None:
+                dates = dates.tz_localize(None)
+            dates = dates.to_numpy()
+            order = np.argsort(dates, kind='stable')
+            dates = dates[order]
+            
+            # One positional take for all requested line items; absent items stay NaN
+            positions = {}
+            for i, label in enumerate(raw.index.tolist()):
+                positions.setdefault(label, i)
+            rows = np.array([positions.get(label, -1) for label in fields], dtype=np.int64)
+            found = rows >= 0
+            
+            raw_values = raw.to_numpy()
+            if raw_values.dtype.kind not in 'fiu':
+                raw_values = raw.apply(pd.to_numeric, axis=1, errors='coerce').to_numpy()
+            values = np.full((len(fields), len(dates)), np.nan)
+            values[found] = raw_values[rows[found]].astype(float)[:, order]
+        
+        days = dates.astype('datetime64[D]')
+        months = (days.astype('datetime64[M]').astype(np.int64) % 12) + 1
+        years = days.astype('datetime64[Y]').astype(np.int64) + 1970
+        columns = {
+            'ticker': np.full(len(dates), symbol, dtype=object),
+            'date': np.datetime_as_string(days, unit='D').astype(object),
+            'quarter': np.array([f"Q{((m - 1) // 3) + 1} {y}" for m, y in zip(months.tolist(), years.tolist())],
+                                dtype=object),
+        }
+        if fiscal_year:
+            columns['fiscal_year'] = years
+        for i, column in enumerate(fields.values()):
+            columns[column] = values[i]
+        return columns
+    
+    def columns_to_records(self, columns: Columns) -> List[Dict]:
+        """Convert columns to record dicts at the output boundary (NaN -> None)"""
+        names = list(columns)
+        values = [
+            [None if isinstance(v, float) and math.isnan(v) else v for v in np.asarray(columns[name]).tolist()]
+            for name in names
+        ]
+        return [dict(zip(names, row)) for row in zip(*values)]
+    
+    def records_to_columns(self, records: List[Dict], names: List[str]) -> Columns:
+        """Convert record dicts to columns (missing values -> NaN for numeric fields)"""
+        columns = {}
+        for name in names:
+            values = [r.get(name) for r in records]
+            if name in ('ticker', 'date', 'quarter', 'fiscal_year'):
+                columns[name] = np.array(values, dtype=object)
+            else:
+                columns[name] = np.array([np.nan if v is None else v for v in values], dtype=float)
+        return columns
+    
+    def fetch_income_columns(self, symbol: str, period: str = 'quarterly') -> Columns:
+        """
+        Fetch income statement data as columns
         
         Args:
             symbol: Stock symbol
             period: 'quarterly' or 'annual'
         
         Returns:
-            List of income statement records
+            Income statement columns, one element per period
         """
         try:
-            ticker = yf.Ticker(symbol)
-            
             if period == 'quarterly':
-                df = ticker.quarterly_financials
+                df = self._yahoo_attr(symbol, 'quarterly_financials')
             else:
-                df = ticker.financials
+                df = self._yahoo_attr(symbol, 'financials')
             
-            if df is None or df.empty:
-                return []
-            
-            # Transpose so dates are rows
-            df = df.T
-            df = df.sort_index()
-            
-            records = []
-            for date, row in df.iterrows():
-                fiscal_year = date.year
-                fiscal_quarter = f"Q{((date.month - 1) // 3) + 1} {fiscal_year}"
-                
-                records.append({
-                    'ticker': symbol,
-                    'date': date.strftime('%Y-%m-%d'),
-                    'quarter': fiscal_quarter,
-                    'fiscal_year': fiscal_year,
-                    'revenue': self.safe_get(row, 'Total Revenue'),
-                    'gross_profit': self.safe_get(row, 'Gross Profit'),
-                    'operating_income': self.safe_get(row, 'Operating Income'),
-                    'ebitda': self.safe_get(row, 'EBITDA'),
-                    'net_income': self.safe_get(row, 'Net Income'),
-                    'diluted_eps': None,
-                })
-            
-            return records
+            columns = self.statement_columns(df, symbol, INCOME_FIELDS, fiscal_year=True)
             
         except Exception as e:
             logger.error(f"Error fetching income statement for {symbol}: {e}")
-            return []
+            columns = self.statement_columns(None, symbol, INCOME_FIELDS, fiscal_year=True)
+        
+        columns['diluted_eps'] = np.full(len(columns['ticker']), None, dtype=object)
+        return columns
     
-    def fetch_balance_sheet(self, symbol: str, period: str = 'quarterly') -> List[Dict]:
+    def fetch_balance_columns(self, symbol: str, period: str = 'quarterly') -> Columns:
         """
-        Fetch balance sheet data
+        Fetch balance sheet data as columns
         
         Args:
             symbol: Stock symbol
             period: 'quarterly' or 'annual'
         
         Returns:
-            List of balance sheet records
+            Balance sheet columns, one element per period
         """
         try:
-            ticker = yf.Ticker(symbol)
-            
             if period == 'quarterly':
-                df = ticker.quarterly_balance_sheet
+                df = self._yahoo_attr(symbol, 'quarterly_balance_sheet')
             else:
-                df = ticker.balance_sheet
-            
-            if df is None or df.empty:
-                return []
+                df = self._yahoo_attr(symbol, 'balance_sheet')
             
-            df = df.T
-            df = df.sort_index()
-            
-            records = []
-            for date, row in df.iterrows():
-                fiscal_quarter = f"Q{((date.month - 1) // 3) + 1} {date.year}"
-                
-                records.append({
-                    'ticker': symbol,
-                    'date': date.strftime('%Y-%m-%d'),
-                    'quarter': fiscal_quarter,
-                    'total_assets': self.safe_get(row, 'Total Assets'),
-                    'current_assets': self.safe_get(row, 'Current Assets'),
-                    'total_liabilities': self.safe_get(row, 'Total Liabilities Net Minority Interest'),
-                    'current_liabilities': self.safe_get(row, 'Current Liabilities'),
-                    'total_debt': self.safe_get(row, 'Total Debt'),
-                    'total_equity': self.safe_get(row, 'Total Equity Gross Minority Interest'),
-                    'cash_and_equivalents': self.safe_get(row, 'Cash And Cash Equivalents'),
-                })
-            
-            return records
+            columns = self.statement_columns(df, symbol, BALANCE_FIELDS)
             
         except Exception as e:
             logger.error(f"Error fetching balance sheet for {symbol}: {e}")
-            return []
+            columns = self.statement_columns(None, symbol, BALANCE_FIELDS)
+        
+        return columns
     
-    def fetch_cash_flow(self, symbol: str, period: str = 'quarterly') -> List[Dict]:
+    def fetch_cashflow_columns(self, symbol: str, period: str = 'quarterly') -> Columns:
         """
-        Fetch cash flow statement data
+        Fetch cash flow statement data as columns
         
         Args:
             symbol: Stock symbol
             period: 'quarterly' or 'annual'
         
         Returns:
-            List of cash flow records
+            Cash flow columns, one element per period
         """
         try:
-            ticker = yf.Ticker(symbol)
-            
             if period == 'quarterly':
-                df = ticker.quarterly_cashflow
+                df = self._yahoo_attr(symbol, 'quarterly_cashflow')
             else:
-                df = ticker.cashflow
-            
-            if df is None or df.empty:
-                return []
+                df = self._yahoo_attr(symbol, 'cashflow')
             
-            df = df.T
-            df = df.sort_index()
-            
-            records = []
-            for date, row in df.iterrows():
-                fiscal_quarter = f"Q{((date.month - 1) // 3) + 1} {date.year}"
-                
-                operating_cf = self.safe_get(row, 'Operating Cash Flow')
-                capex = self.safe_get(row, 'Capital Expenditure')
-                
-                # Calculate Free Cash Flow
-                free_cash_flow = None
-                if operating_cf is not None and capex is not None:
-                    free_cash_flow = operating_cf + capex  # capex is negative
-                
-                records.append({
-                    'ticker': symbol,
-                    'date': date.strftime('%Y-%m-%d'),
-                    'quarter': fiscal_quarter,
-                    'operating_cash_flow': operating_cf,
-                    'investing_cash_flow': self.safe_get(row, 'Investing Cash Flow'),
-                    'financing_cash_flow': self.safe_get(row, 'Financing Cash Flow'),
-                    'capex': capex,
-                    'free_cash_flow': free_cash_flow,
-                })
-            
-            return records
+            columns = self.statement_columns(df, symbol, CASHFLOW_FIELDS)
             
         except Exception as e:
             logger.error(f"Error fetching cash flow for {symbol}: {e}")
-            return []
+            columns = self.statement_columns(None, symbol, CASHFLOW_FIELDS)
+        
+        # Calculate Free Cash Flow (capex is negative, NaN if either side is missing)
+        columns['free_cash_flow'] = columns['operating_cash_flow'] + columns['capex']
+        return columns
+    
+    def fetch_income_statement(self, symbol: str, period: str = 'quarterly') -> List[Dict]:
+        """Fetch income statement records (see fetch_income_columns)"""
+        return self.columns_to_records(self.fetch_income_columns(symbol, period))
+    
+    def fetch_balance_sheet(self, symbol: str, period: str = 'quarterly') -> List[Dict]:
+        """Fetch balance sheet records (see fetch_balance_columns)"""
+        return self.columns_to_records(self.fetch_balance_columns(symbol, period))
+    
+    def fetch_cash_flow(self, symbol: str, period: str = 'quarterly') -> List[Dict]:
+        """Fetch cash flow records (see fetch_cashflow_columns)"""
+        return self.columns_to_records(self.fetch_cashflow_columns(symbol, period))
     
     def fetch_market_data(self, symbol: str) -> Dict:
         """Fetch current market data and ratios"""
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            info = self._yahoo_attr(symbol, 'info')
             
             return {
                 'pe_ratio': info.get('trailingPE') or info.get('forwardPE'),
@@ -303,16 +434,14 @@ class FundamentalsIngestionPipeline:
     def fetch_shareholding_data(self, symbol: str) -> Dict:
         """Fetch shareholding information"""
         try:
-            ticker = yf.Ticker(symbol)
-            
             # Get institutional holders
-            institutional = ticker.institutional_holders
+            institutional = self._yahoo_attr(symbol, 'institutional_holders')
             institutional_pct = 0
             if institutional is not None and not institutional.empty:
                 institutional_pct = institutional['% Out'].sum() if '% Out' in institutional.columns else 0
             
             # Get major holders (includes insider/promoter data)
-            major_holders = ticker.major_holders
+            major_holders = self._yahoo_attr(symbol, 'major_holders')
             promoter_pct = 0
             if major_holders is not None and not major_holders.empty:
                 # First row typically shows insider percentage
@@ -330,11 +459,10 @@ class FundamentalsIngestionPipeline:
     def fetch_estimates_and_actions(self, symbol: str) -> Dict:
         """Fetch analyst estimates, buybacks, dividends, splits"""
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            info = self._yahoo_attr(symbol, 'info')
             
             # Get earnings estimates
-            earnings_estimate = ticker.earnings_estimate
+            earnings_estimate = self._yahoo_attr(symbol, 'earnings_estimate')
             eps_estimate = None
             if earnings_estimate is not None and not earnings_estimate.empty:
                 current_quarter = earnings_estimate.columns[0] if len(earnings_estimate.columns) > 0 else None
@@ -342,11 +470,11 @@ class FundamentalsIngestionPipeline:
                     eps_estimate = earnings_estimate.loc['Avg. Estimate', current_quarter] if 'Avg. Estimate' in earnings_estimate.index else None
             
             # Get dividends
-            dividends = ticker.dividends
+            dividends = self._yahoo_attr(symbol, 'dividends')
             latest_dividend = dividends.iloc[-1] if dividends is not None and not dividends.empty else None
             
             # Get splits
-            splits = ticker.splits
+            splits = self._yahoo_attr(symbol, 'splits')
             latest_split = splits.iloc[-1] if splits is not None and not splits.empty else None
             
             return {
@@ -359,24 +487,73 @@ class FundamentalsIngestionPipeline:
             logger.warning(f"Error fetching estimates/actions for {symbol}: {e}")
             return {}
     
-    def fetch_all_fundamentals(self, symbol: str) -> Dict:
+    def fetch_all_fundamentals(self, symbol: str, periods: Tuple[str, ...] = ('quarterly', 'annual')) -> Dict:
         """
         Fetch all fundamental data for a symbol
         
+        Args:
+            symbol: Stock symbol
+            periods: Periods whose statements to fetch; the others are not requested
+        
         Returns:
-            Dict with all financial statements (quarterly and annual)
+            Dict with the financial statement columns of each period
+            ('income_quarterly', ...) plus market, shareholding and estimates dicts
         """
-        return {
-            'income_quarterly': self.fetch_income_statement(symbol, 'quarterly'),
-            'income_annual': self.fetch_income_statement(symbol, 'annual'),
-            'balance_quarterly': self.fetch_balance_sheet(symbol, 'quarterly'),
-            'balance_annual': self.fetch_balance_sheet(symbol, 'annual'),
-            'cashflow_quarterly': self.fetch_cash_flow(symbol, 'quarterly'),
-            'cashflow_annual': self.fetch_cash_flow(symbol, 'annual'),
-            'market_data': self.fetch_market_data(symbol),
-            'shareholding': self.fetch_shareholding_data(symbol),
-            'estimates': self.fetch_estimates_and_actions(symbol),
+        data = {}
+        for period in periods:
+            data[f'income_{period}'] = self.fetch_income_columns(symbol, period)
+            data[f'balance_{period}'] = self.fetch_balance_columns(symbol, period)
+            data[f'cashflow_{period}'] = self.fetch_cashflow_columns(symbol, period)
+        data['market_data'] = self.fetch_market_data(symbol)
+        data['shareholding'] = self.fetch_shareholding_data(symbol)
+        data['estimates'] = self.fetch_estimates_and_actions(symbol)
+        return data
+    
+    def merge_financial_columns(self, income: Columns, balance: Columns, cashflow: Columns,
+                                market_data: Dict, shareholding: Dict, estimates: Dict) -> Columns:
+        """
+        Merge income, balance sheet, cash flow, and market data by date
+        
+        Returns:
+            Merged columns with derived metrics, one element per income statement period
+        """
+        size = len(income['ticker'])
+        columns = dict(income)
+        income_keys = list(zip(income['ticker'].tolist(), income['date'].tolist()))
+        
+        # Align balance sheet and cash flow rows to income dates (last row wins on duplicates)
+        for statement, names in ((balance, MERGE_BALANCE_COLUMNS), (cashflow, MERGE_CASHFLOW_COLUMNS)):
+            positions = {key: i for i, key in enumerate(zip(statement['ticker'].tolist(), statement['date'].tolist()))}
+            index = np.array([positions.get(key, -1) for key in income_keys], dtype=np.int64)
+            found = index >= 0
+            for name in names:
+                source = np.asarray(statement[name], dtype=float)
+                columns[name] = np.where(found, source[index], np.nan) if len(source) else np.full(size, np.nan)
+        
+        # Broadcast per-symbol market, shareholding and estimate values
+        scalars = {
+            'pe_ratio': market_data.get('pe_ratio'),
+            'peg_ratio': market_data.get('peg_ratio'),
+            'pb_ratio': market_data.get('pb_ratio'),
+            'ps_ratio': market_data.get('ps_ratio'),
+            'price_target_high': market_data.get('price_target_high'),
+            'price_target_low': market_data.get('price_target_low'),
+            'price_target_avg': market_data.get('price_target_avg'),
+            'promoter_holding': shareholding.get('promoter_holding'),
+            'institutional_holding': shareholding.get('institutional_holding'),
+            'eps_estimate': estimates.get('eps_estimate'),
+            'dividends': estimates.get('latest_dividend'),
+            'splits': estimates.get('latest_split'),
+            'buybacks': estimates.get('buybacks'),
         }
+        for name, value in scalars.items():
+            column = np.empty(size, dtype=object)
+            column[:] = [value] * size
+            columns[name] = column
+        
+        # Calculate derived metrics
+        columns.update(self.calculate_derived_metrics_columns(columns))
+        return columns
     
     def merge_financial_data(self, income: List[Dict], balance: List[Dict], cashflow: List[Dict], 
                             market_data: Dict, shareholding: Dict, estimates: Dict) -> List[Dict]:
@@ -386,89 +563,51 @@ class FundamentalsIngestionPipeline:
         Returns:
             List of merged financial records
         """
-        # Create lookup dictionaries
-        balance_lookup = {(r['ticker'], r['date']): r for r in balance}
-        cashflow_lookup = {(r['ticker'], r['date']): r for r in cashflow}
-        
-        merged = []
-        for inc in income:
-            key = (inc['ticker'], inc['date'])
-            bal = balance_lookup.get(key, {})
-            cf = cashflow_lookup.get(key, {})
-            
-            # Merge all data
-            record = {
-                **inc,
-                'total_assets': bal.get('total_assets'),
-                'total_liabilities': bal.get('total_liabilities'),
-                'total_equity': bal.get('total_equity'),
-                'total_debt': bal.get('total_debt'),
-                'cash_and_equivalents': bal.get('cash_and_equivalents'),
-                'current_assets': bal.get('current_assets'),
-                'current_liabilities': bal.get('current_liabilities'),
-                'operating_cash_flow': cf.get('operating_cash_flow'),
-                'investing_cash_flow': cf.get('investing_cash_flow'),
-                'financing_cash_flow': cf.get('financing_cash_flow'),
-                'free_cash_flow': cf.get('free_cash_flow'),
-                'capex': cf.get('capex'),
-                # Add market data
-                'pe_ratio': market_data.get('pe_ratio'),
-                'peg_ratio': market_data.get('peg_ratio'),
-                'pb_ratio': market_data.get('pb_ratio'),
-                'ps_ratio': market_data.get('ps_ratio'),
-                'price_target_high': market_data.get('price_target_high'),
-                'price_target_low': market_data.get('price_target_low'),
-                'price_target_avg': market_data.get('price_target_avg'),
-                # Add shareholding
-                'promoter_holding': shareholding.get('promoter_holding'),
-                'institutional_holding': shareholding.get('institutional_holding'),
-                # Add estimates
-                'eps_estimate': estimates.get('eps_estimate'),
-                'dividends': estimates.get('latest_dividend'),
-                'splits': estimates.get('latest_split'),
-                'buybacks': estimates.get('buybacks'),
-            }
-            
-            # Calculate derived metrics
-            record = self.calculate_derived_metrics(record)
-            
-            merged.append(record)
-        
-        return merged
-        cashflow_lookup = {(r['ticker'], r['date']): r for r in cashflow}
+        if not income:
+            return []
+        merged = self.merge_financial_columns(
+            self.records_to_columns(income, ['ticker', 'date', 'quarter', 'fiscal_year']
+                                    + list(INCOME_FIELDS.values()) + ['diluted_eps']),
+            self.records_to_columns(balance, ['ticker', 'date'] + MERGE_BALANCE_COLUMNS),
+            self.records_to_columns(cashflow, ['ticker', 'date'] + MERGE_CASHFLOW_COLUMNS),
+            market_data, shareholding, estimates
+        )
+        return self.columns_to_records(merged)
+    
+    def _ratio(self, numerator: np.ndarray, denominator: np.ndarray, scale: float = 1.0,
+               positive_denominator: bool = True) -> np.ndarray:
+        """
+        Whole-column ratio with the same guards as calculate_derived_metrics
         
-        merged = []
-        for inc in income:
-            key = (inc['ticker'], inc['date'])
-            bal = balance_lookup.get(key, {})
-            cf = cashflow_lookup.get(key, {})
-            
-            # Merge all data
-            record = {
-                **inc,
-                'total_assets': bal.get('total_assets'),
-                'total_liabilities': bal.get('total_liabilities'),
-                'total_equity': bal.get('total_equity'),
-                'total_debt': bal.get('total_debt'),
-                'cash_and_equivalents': bal.get('cash_and_equivalents'),
-                'current_assets': bal.get('current_assets'),
-                'current_liabilities': bal.get('current_liabilities'),
-                'operating_cash_flow': cf.get('operating_cash_flow'),
-                'investing_cash_flow': cf.get('investing_cash_flow'),
-                'financing_cash_flow': cf.get('financing_cash_flow'),
-                'free_cash_flow': cf.get('free_cash_flow'),
-                'capex': cf.get('capex'),
-            }
-            
-            # Calculate derived metrics
-            record = self.calculate_derived_metrics(record)
-            
-            merged.append(record)
+        The numerator must be present and non-zero; the denominator present and
+        positive (or just non-zero). Rows failing the guard are NaN.
+        """
+        num = np.asarray(numerator, dtype=float)
+        den = np.asarray(denominator, dtype=float)
+        valid = ~np.isnan(num) & (num != 0) & ~np.isnan(den)
+        valid &= (den > 0) if positive_denominator else (den != 0)
         
-        return merged
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = num / den
+            if scale != 1.0:
+                values = values * scale
+        return np.where(valid, values, np.nan)
+    
+    def calculate_derived_metrics_columns(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Calculate derived financial metrics as whole columns (NaN when not computable)"""
+        return {
+            'debt_to_equity': self._ratio(columns['total_debt'], columns['total_equity'], positive_denominator=False),
+            'current_ratio': self._ratio(columns['current_assets'], columns['current_liabilities']),
+            'operating_margin': self._ratio(columns['operating_income'], columns['revenue'], 100),
+            'net_profit_margin': self._ratio(columns['net_income'], columns['revenue'], 100),
+            'roe': self._ratio(columns['net_income'], columns['total_equity'], 100),
+            'roa': self._ratio(columns['net_income'], columns['total_assets'], 100),
+            'debt_to_fcf_ratio': self._ratio(columns['total_debt'], columns['free_cash_flow']),
+            'ebitda_margin': self._ratio(columns['ebitda'], columns['revenue'], 100),
+        }
     
     def calculate_derived_metrics(self, record: Dict) -> Dict:
-        """Calculate derived financial metrics"""
+        """Calculate derived financial metrics for a single record (see calculate_derived_metrics_columns)"""
         try:
             # Debt to Equity
             if record.get('total_debt') and record.get('total_equity'):
@@ -541,24 +680,217 @@ class FundamentalsIngestionPipeline:
         except (ValueError, OverflowError, TypeError):
             return None
     
-    def ensure_company_exists(self, ticker: str, cursor):
-        """Ensure company exists in companies table"""
-        cursor.execute("SELECT ticker FROM companies WHERE ticker = %s", (ticker,))
-        result = cursor.fetchone()
-        
-        if not result:
+    def ensure_companies_exist(self, tickers: List[str], cursor):
+        """Upsert every missing ticker into the companies table in one statement"""
+        rows = []
+        for ticker in sorted(set(tickers)):
             # Extract exchange and name from ticker
             exchange = 'NSE' if '.NS' in ticker else 'BSE' if '.BO' in ticker else 'NASDAQ'
             name = ticker.replace('.NS', '').replace('.BO', '')
-            
-            # Insert new company
+            rows.append((ticker, name, exchange))
+        
+        if not rows:
+            return
+        
+        created = execute_values(
+            cursor,
+            """INSERT INTO companies (ticker, name, exchange) 
+               VALUES %s 
+               ON CONFLICT (ticker) DO NOTHING
+               RETURNING ticker""",
+            rows,
+            page_size=len(rows),
+            fetch=True
+        )
+        for (ticker,) in created:
+            logger.info(f"Created company record: {ticker}")
+    
+    def build_fundamentals_row(self, record: Dict) -> Tuple:
+        """Normalize a merged record into a fundamentals_quarterly row (FUNDAMENTALS_COLUMNS order)"""
+        # Standardize field names
+        record = self.standardize_field_names(record)
+        
+        return (
+            record['ticker'],
+            record.get('quarter'),
+            self.safe_int(record.get('revenue')),
+            self.safe_int(record.get('net_income')),
+            self.safe_float(record.get('diluted_eps') or record.get('eps_estimate')),
+            self.safe_float(record.get('operating_margin')),
+            self.safe_float(record.get('roe')),
+            self.safe_float(record.get('roa')),
+            self.safe_float(record.get('pe_ratio')),
+            self.safe_float(record.get('pb_ratio')),
+            self.safe_float(record.get('debt_to_equity')),
+            self.safe_float(record.get('current_ratio')),
+            self.safe_int(record.get('total_assets')),
+            self.safe_int(record.get('total_debt')),
+            self.safe_int(record.get('free_cash_flow')),
+            self.safe_int(record.get('ebitda')),
+            self.safe_float(record.get('ebitda_margin')),
+            self.safe_int(record.get('operating_cash_flow')),
+            datetime.now()
+        )
+    
+    def copy_fundamentals_rows(self, rows: List[Tuple], cursor):
+        """Stream normalized rows into fundamentals_quarterly with COPY"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            # Unquoted empty fields load as NULL
+            writer.writerow(['' if v is None else v for v in row])
+        buffer.seek(0)
+        
+        cursor.copy_expert(
+            f"COPY fundamentals_quarterly ({', '.join(FUNDAMENTALS_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+    
+    def load_quarantined(self, conn) -> Dict[str, Set[str]]:
+        """
+        Quarters currently held in fundamentals_quarantine
+
+        Returns:
+            ticker -> quarter labels awaiting a clean re-fetch
+        """
+        with conn.cursor() as cursor:
+            cursor.execute(QUARANTINE_DDL)
+            cursor.execute("SELECT ticker, quarter FROM fundamentals_quarantine")
+            quarantined: Dict[str, Set[str]] = defaultdict(set)
+            for ticker, quarter in cursor.fetchall():
+                quarantined[ticker].add(quarter)
+        conn.commit()
+        return dict(quarantined)
+    
+    def copy_quarantine_rows(self, symbols: List[str], cursor):
+        """
+        Store the held-back rows of these symbols in fundamentals_quarantine with their issues
+        
+        A quarter held again replaces its earlier entry; quarters that now pass are
+        removed, as they are written in the same transaction.
+        """
+        rows = {
+            (row[0], row[1]): (
+                row[0], row[1],
+                Json(dict(zip(FUNDAMENTALS_COLUMNS, row)), dumps=lambda v: json.dumps(v, default=str)),
+                Json([{'issue_type': it.issue_type, 'severity': it.severity, 'suggested_action': it.suggested_action,
+                       'details': it.details} for it in issues])
+            )
+            for symbol in symbols for row, issues in self.quarantine.get(symbol, [])
+        }
+        if rows:
+            execute_values(
+                cursor,
+                """INSERT INTO fundamentals_quarantine (ticker, quarter, row_data, issues) VALUES %s
+                   ON CONFLICT (ticker, quarter) DO UPDATE SET
+                       row_data = EXCLUDED.row_data,
+                       issues = EXCLUDED.issues,
+                       quarantined_at = NOW()""",
+                list(rows.values()),
+                page_size=len(rows)
+            )
+        
+        released = [(symbol, quarter) for symbol in symbols for quarter in self.released.get(symbol, [])]
+        if released:
             cursor.execute(
-                """INSERT INTO companies (ticker, name, exchange) 
-                   VALUES (%s, %s, %s) 
-                   ON CONFLICT (ticker) DO NOTHING""",
-                (ticker, name, exchange)
+                """DELETE FROM fundamentals_quarantine q
+                   USING unnest(%s::text[], %s::text[]) AS r(ticker, quarter)
+                   WHERE q.ticker = r.ticker AND q.quarter = r.quarter""",
+                ([symbol for symbol, _ in released], [quarter for _, quarter in released])
             )
-            logger.info(f"Created company record: {ticker}")
+    
+    def load_watermarks(self, conn, period: str) -> Dict[str, Tuple[Optional[date], Optional[datetime]]]:
+        """
+        Load per-ticker watermarks for a period type
+        
+        Returns:
+            ticker -> (latest stored period date, last time the ticker was checked)
+        """
+        with conn.cursor() as cursor:
+            cursor.execute(WATERMARKS_DDL)
+            cursor.execute(
+                "SELECT ticker, last_period_date, last_checked_at FROM ingestion_watermarks WHERE period_type = %s",
+                (period,)
+            )
+            watermarks = {ticker: (last_period, last_checked) for ticker, last_period, last_checked in cursor.fetchall()}
+        conn.commit()
+        return watermarks
+    
+    def is_due(self, watermark: Optional[Tuple[Optional[date], Optional[datetime]]], period: str,
+               now: datetime) -> bool:
+        """Whether a ticker needs a refresh given its watermark"""
+        if self.full_refresh or watermark is None:
+            return True
+        last_period, last_checked = watermark
+        
+        # Checked recently (e.g. by last night's run)
+        if last_checked is not None and now - last_checked < self.recheck_interval:
+            return False
+        
+        # The period after the latest stored one has not closed yet
+        if last_period is not None and now.date() < last_period + PERIOD_LENGTHS[period]:
+            return False
+        return True
+    
+    def update_watermarks(self, cursor, period: str, batch: List[Tuple[str, List[Tuple], Optional[str]]]):
+        """Advance watermarks for every symbol in the batch (same transaction as its rows)"""
+        now = datetime.now()
+        execute_values(
+            cursor,
+            """INSERT INTO ingestion_watermarks (ticker, period_type, last_period_date, last_checked_at)
+               VALUES %s
+               ON CONFLICT (ticker, period_type) DO UPDATE SET
+                   last_period_date = GREATEST(ingestion_watermarks.last_period_date, EXCLUDED.last_period_date),
+                   last_checked_at = EXCLUDED.last_checked_at""",
+            [(symbol, period, latest_period, now) for symbol, _, latest_period in batch],
+            template="(%s, %s, %s::date, %s)",
+            page_size=len(batch)
+        )
+    
+    def write_batch(self, conn, batch: List[Tuple[str, List[Tuple], Optional[str]]],
+                    period: str = 'quarterly') -> Tuple[int, List[str]]:
+        """
+        Write a batch of symbols in one transaction
+        
+        Companies are upserted in one statement, all rows are loaded with a
+        single COPY, quarantined rows are stored alongside and the symbols'
+        watermarks advance in the same commit. If
+        the batch fails, each symbol is retried in its own transaction so one
+        bad symbol cannot sink the rest.
+        
+        Args:
+            conn: Database connection
+            batch: List of (symbol, rows, latest period date) tuples; rows may
+                be empty when a symbol was checked but had nothing new
+            period: 'quarterly' or 'annual'
+        
+        Returns:
+            (rows written, symbols that were written)
+        """
+        cursor = conn.cursor()
+        try:
+            self.ensure_companies_exist([symbol for symbol, _, _ in batch], cursor)
+            self.copy_fundamentals_rows([row for _, rows, _ in batch for row in rows], cursor)
+            self.copy_quarantine_rows([symbol for symbol, _, _ in batch], cursor)
+            self.update_watermarks(cursor, period, batch)
+            conn.commit()
+            return sum(len(rows) for _, rows, _ in batch), [symbol for symbol, _, _ in batch]
+        except Exception as e:
+            conn.rollback()
+            if len(batch) == 1:
+                logger.error(f"[FAILED] Failed to ingest fundamentals for {batch[0][0]}: {e}")
+                return 0, []
+            logger.warning(f"Batch write of {len(batch)} symbols failed ({e}), retrying per symbol")
+        finally:
+            cursor.close()
+        
+        written_rows = 0
+        written_symbols = []
+        for item in batch:
+            count, symbols = self.write_batch(conn, [item], period)
+            written_rows += count
+            written_symbols += symbols
+        return written_rows, written_symbols
     
     def quarter_to_timestamp(self, quarter_str: str) -> Optional[str]:
         """Convert quarter string (Q1 2024) to ISO timestamp"""
@@ -646,6 +978,60 @@ class FundamentalsIngestionPipeline:
         
         return standardized
     
+    def add_stage_time(self, stage: str, seconds: float):
+        """Accumulate time spent in a pipeline stage (thread-safe)"""
+        with self._timings_lock:
+            self.stage_timings[stage] += seconds
+    
+    def record_failure(self, symbol: str, period: str, error: str):
+        """Track a failed unit for the run summary and the run manifest"""
+        self.failures.append((symbol, period, error))
+        if self.manifest is not None:
+            self.manifest.record(symbol, period, 'failed', error=error)
+    
+    def _fetch_symbol(self, symbol: str, periods: Tuple[str, ...]) -> Dict:
+        """Fetch worker: runs on the fetch thread pool"""
+        logger.info(f"Fetching data for {symbol}...")
+        fetch_start = time.monotonic()
+        try:
+            return self.fetch_all_fundamentals(symbol, periods)
+        finally:
+            self.add_stage_time('fetch', time.monotonic() - fetch_start)
+    
+    def fetch_concurrently(self, symbols: List[str],
+                           periods: Tuple[str, ...] = ('quarterly', 'annual')) -> Iterator[Tuple[str, Optional[Dict], Optional[Exception]]]:
+        """
+        Fetch symbols on a bounded thread pool
+        
+        At most 2 x max_workers fetches are in flight, so a slow writer never
+        lets fetched data pile up in memory. Remote calls share self.rate_limiter.
+        
+        Yields:
+            (symbol, data, error) in completion order; exactly one of data/error is set
+        """
+        pending_symbols = iter(symbols)
+        max_in_flight = self.max_workers * 2
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='fetch') as executor:
+            in_flight = {}
+            for symbol in pending_symbols:
+                in_flight[executor.submit(self._fetch_symbol, symbol, periods)] = symbol
+                if len(in_flight) >= max_in_flight:
+                    break
+            
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    symbol = in_flight.pop(future)
+                    try:
+                        yield symbol, future.result(), None
+                    except Exception as e:
+                        yield symbol, None, e
+                    
+                    next_symbol = next(pending_symbols, None)
+                    if next_symbol is not None:
+                        in_flight[executor.submit(self._fetch_symbol, next_symbol, periods)] = next_symbol
+    
     def ingest_fundamentals(self, symbols: List[str], period: str = 'quarterly') -> int:
         """
         Ingest fundamental data for given symbols
@@ -660,14 +1046,84 @@ class FundamentalsIngestionPipeline:
         logger.info(f"Starting {period} fundamentals ingestion for {len(symbols)} symbols")
         
         conn = self.get_db_connection()
-        cursor = conn.cursor()
         total_records = 0
+        start_time = time.monotonic()
+        write_seconds = 0.0
+        batch: List[Tuple[str, List[Tuple], Optional[str]]] = []
+        
+        # Incremental mode: only symbols that may have filed since their watermark
+        watermarks = self.load_watermarks(conn, period)
+        now = datetime.now()
+        due_symbols = [symbol for symbol in symbols if self.is_due(watermarks.get(symbol), period, now)]
+        if len(due_symbols) < len(symbols):
+            logger.info(f"Skipping {len(symbols) - len(due_symbols)} symbols not due for a {period} refresh")
         
-        for symbol in symbols:
+        # Resumed runs: units already written by this run are not fetched again
+        if self.manifest is not None:
+            pending_symbols = self.manifest.pending(due_symbols, period)
+            if len(pending_symbols) < len(due_symbols):
+                logger.info(f"Skipping {len(due_symbols) - len(pending_symbols)} symbols already written "
+                            f"in run {self.manifest.run_id}")
+            due_symbols = pending_symbols
+        
+        def flush_batch() -> int:
+            nonlocal write_seconds
+            if not batch:
+                return 0
+            # Processed output goes to the dataset before the DB commit, so symbols a resumed run
+            # skips as written never miss their Parquet rows
+            self.flush_dataset()
+            write_start = time.monotonic()
+            rows_written, symbols_written = self.write_batch(conn, batch, period)
+            elapsed = time.monotonic() - write_start
+            write_seconds += elapsed
+            self.add_stage_time('write', elapsed)
+            rows_by_symbol = {symbol: len(rows) for symbol, rows, _ in batch}
+            for symbol in symbols_written:
+                if self.manifest is not None:
+                    self.manifest.record(symbol, period, 'written')
+                if rows_by_symbol[symbol]:
+                    logger.info(f"[OK] Ingested {rows_by_symbol[symbol]} {period} records for {symbol}")
+                else:
+                    logger.info(f"[OK] No new {period} periods for {symbol}")
+            logger.info(f"Wrote batch of {len(symbols_written)}/{len(batch)} symbols: {rows_written} rows "
+                        f"in {elapsed:.2f}s ({rows_written / elapsed if elapsed > 0 else 0:.0f} rows/sec)")
+            for symbol in set(rows_by_symbol) - set(symbols_written):
+                self.record_failure(symbol, period, 'write failed')
+            for symbol in rows_by_symbol:
+                held = self.quarantine.pop(symbol, [])
+                released = self.released.pop(symbol, [])
+                if held and symbol in symbols_written:
+                    logger.warning(f"[QUARANTINE] Held back {len(held)} {period} rows for {symbol}")
+                if released and symbol in symbols_written:
+                    logger.info(f"[QUARANTINE] Released {len(released)} {period} rows for {symbol}: "
+                                f"{', '.join(released)}")
+            if self.manifest is not None:
+                self.manifest.sync()
+            batch.clear()
+            return rows_written
+        
+        # Standalone calls get their own session; run_full_ingestion shares one across passes
+        owns_session = self.fetch_session is None
+        if owns_session:
+            self.start_fetch_session()
+        owns_writer = self.dataset_writer is None
+        if owns_writer:
+            self.start_dataset_writer()
+        owns_validator = self.validate and self.validator is None
+        if owns_validator:
+            self.start_validator()
+        validate = self.validator is not None and period == 'quarterly'
+        quarantined = self.load_quarantined(conn) if validate else {}
+        
+        # Fetching runs on a thread pool; this loop is the single DB writer. Only this period's
+        # statements are requested; the annual ones are fetched by the annual pass if it is due
+        for symbol, data, fetch_error in self.fetch_concurrently(due_symbols, periods=(period,)):
             try:
-                # Fetch all fundamental data
-                logger.info(f"Fetching data for {symbol}...")
-                data = self.fetch_all_fundamentals(symbol)
+                if fetch_error is not None:
+                    raise fetch_error
+                if self.manifest is not None:
+                    self.manifest.record(symbol, period, 'fetched')
                 
                 # Select appropriate period data
                 if period == 'quarterly':
@@ -679,8 +1135,9 @@ class FundamentalsIngestionPipeline:
                     balance = data['balance_annual']
                     cashflow = data['cashflow_annual']
                 
-                if not income:
+                if len(income['ticker']) == 0:
                     logger.warning(f"No {period} data for {symbol}")
+                    batch.append((symbol, [], None))
                     continue
                 
                 # Get additional data
@@ -688,100 +1145,294 @@ class FundamentalsIngestionPipeline:
                 shareholding = data.get('shareholding', {})
                 estimates = data.get('estimates', {})
                 
-                # Merge financial statements
-                merged_data = self.merge_financial_data(income, balance, cashflow, 
-                                                       market_data, shareholding, estimates)
+                # Merge financial statements; dicts are only built at the output boundary
+                transform_start = time.monotonic()
+                merged_columns = self.merge_financial_columns(income, balance, cashflow,
+                                                              market_data, shareholding, estimates)
+                latest_period = max(merged_columns['date'].tolist())
                 
-                # Save processed JSON data
-                self.save_processed_data(
-                    {'symbol': symbol, 'period': period, 'data': merged_data},
-                    f'{period}_{symbol}.json'
-                )
+                # Keep only periods newer than the watermark
+                watermark = watermarks.get(symbol)
+                is_new = np.ones(len(merged_columns['date']), dtype=bool)
+                if not self.full_refresh and watermark is not None and watermark[0] is not None:
+                    is_new = merged_columns['date'] > watermark[0].isoformat()
                 
-                # Save normalized CSV
-                self.save_normalized_csv(merged_data, symbol, period)
+                # Validate in memory against the whole fetched history; rows with HIGH row-level issues
+                # are held back in fundamentals_quarantine (keyed by ticker and quarter) and the clean
+                # periods are written. The watermark moves past held periods: they are tracked in the
+                # quarantine instead and validated again whenever the symbol is re-fetched.
+                if validate:
+                    validate_start = time.monotonic()
+                    held_quarters = quarantined.get(symbol, set())
+                    if held_quarters:
+                        is_new |= np.isin(merged_columns['quarter'], list(held_quarters))
+                    held, issues = self.validator.validate(symbol, merged_columns, is_new)
+                    if held.any():
+                        self.quarantine[symbol] = [
+                            (self.build_fundamentals_row(record), issues[str(to_period_label(record['quarter']))])
+                            for record in self.columns_to_records({name: values[held] for name, values in merged_columns.items()})
+                        ]
+                        is_new &= ~held
+                    if held_quarters:
+                        self.released[symbol] = sorted(held_quarters & set(merged_columns['quarter'][is_new].tolist()))
+                    self.add_stage_time('validate', time.monotonic() - validate_start)
                 
-                # Prepare for database insertion with preprocessing
-                for record in merged_data:
-                    # Ensure company exists in companies table (normalization)
-                    self.ensure_company_exists(record['ticker'], cursor)
-                    
-                    # Standardize field names
-                    record = self.standardize_field_names(record)
-                    
-                    # Convert reporting period to ISO timestamp
-                    period_timestamp = self.quarter_to_timestamp(record.get('quarter', ''))
-                    
-                    values = (
-                        record['ticker'],
-                        record.get('quarter'),
-                        self.safe_int(record.get('revenue')),
-                        self.safe_int(record.get('net_income')),
-                        self.safe_float(record.get('diluted_eps') or record.get('eps_estimate')),
-                        self.safe_float(record.get('operating_margin')),
-                        self.safe_float(record.get('roe')),
-                        self.safe_float(record.get('roa')),
-                        self.safe_float(record.get('pe_ratio')),
-                        self.safe_float(record.get('pb_ratio')),
-                        self.safe_float(record.get('debt_to_equity')),
-                        self.safe_float(record.get('current_ratio')),
-                        self.safe_int(record.get('total_assets')),
-                        self.safe_int(record.get('total_debt')),
-                        self.safe_int(record.get('free_cash_flow')),
-                        self.safe_int(record.get('ebitda')),
-                        self.safe_float(record.get('ebitda_margin')),
-                        self.safe_int(record.get('operating_cash_flow')),
-                        datetime.now()
-                    )
-                    
-                    # Insert individual record
-                    insert_query = """
-                        INSERT INTO fundamentals_quarterly 
-                        (ticker, quarter, revenue, net_income, eps, operating_margin, roe, roa, 
-                         pe_ratio, pb_ratio, debt_to_equity, current_ratio, total_assets, total_debt, 
-                         free_cash_flow, ebitda, ebitda_margin, operating_cash_flow, created_at)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
-                    """
-                    
-                    cursor.execute(insert_query, values)
+                if not is_new.all():
+                    merged_columns = {name: values[is_new] for name, values in merged_columns.items()}
+                merged_data = self.columns_to_records(merged_columns)
                 
-                conn.commit()
+                # Buffer processed output; written with the symbol's DB batch
+                self.dataset_writer.add(merged_columns, period)
                 
-                total_records += len(merged_data)
-                logger.info(f"[OK] Ingested {len(merged_data)} {period} records for {symbol}")
+                # Normalize for the bulk writer; rows are committed per batch
+                batch.append((symbol, [self.build_fundamentals_row(record) for record in merged_data], latest_period))
+                self.add_stage_time('transform', time.monotonic() - transform_start)
+                if self.manifest is not None:
+                    self.manifest.record(symbol, period, 'transformed')
+                if len(batch) >= self.write_batch_size:
+                    total_records += flush_batch()
                 
             except Exception as e:
                 logger.error(f"[FAILED] Failed to ingest fundamentals for {symbol}: {e}")
-                conn.rollback()
+                self.record_failure(symbol, period, str(e))
+                self.quarantine.pop(symbol, None)
+                self.released.pop(symbol, None)
                 continue
+            finally:
+                self.fetch_session.release(symbol, keep=SHARED_YAHOO_ATTRS if symbol in self.retain_symbols else ())
         
-        cursor.close()
+        total_records += flush_batch()
         conn.close()
         
-        logger.info(f"{period.capitalize()} fundamentals ingestion complete: {total_records} total records")
+        if owns_session:
+            self.end_fetch_session()
+        if owns_writer:
+            self.end_dataset_writer()
+        if owns_validator:
+            self.end_validator()
+        
+        elapsed = time.monotonic() - start_time
+        rate = len(due_symbols) / elapsed if elapsed > 0 else 0.0
+        write_rate = total_records / write_seconds if write_seconds > 0 else 0.0
+        logger.info(f"{period.capitalize()} fundamentals ingestion complete: {total_records} total records "
+                    f"({len(due_symbols)} symbols in {elapsed:.1f}s, {rate:.2f} symbols/sec, "
+                    f"{write_rate:.0f} rows/sec written)")
         return total_records
     
-    def run_full_ingestion(self, symbols: List[str]):
-        """Run complete fundamentals ingestion"""
+    def start_run(self, symbols: List[str], resume_run_id: Optional[str] = None, workers: int = 1) -> RunManifest:
+        """
+        Open the run manifest for a new run, or reopen an interrupted one
+        
+        A resumed run keeps the mode it was started with, so a full refresh
+        that died halfway still rewrites its remaining symbols.
+        """
+        if resume_run_id:
+            self.manifest = RunManifest.resume(self.runs_dir, resume_run_id)
+            self.full_refresh = self.full_refresh or self.manifest.metadata.get('full_refresh', False)
+        else:
+            self.manifest = RunManifest(self.runs_dir, metadata={
+                'provider': self.provider,
+                'full_refresh': self.full_refresh,
+                'workers': workers,
+                'symbols': list(symbols),
+            })
+        return self.manifest
+    
+    def start_dataset_writer(self) -> FundamentalsDatasetWriter:
+        """Start the processed output writer (flushed with every DB write batch)"""
+        run_id = self.manifest.run_id if self.manifest is not None else datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.dataset_writer = FundamentalsDatasetWriter(self.dataset_dir, run_id, writer=self.writer_name)
+        return self.dataset_writer
+    
+    def flush_dataset(self):
+        """Write the buffered processed rows as new Parquet files"""
+        if self.dataset_writer is None:
+            return
+        try:
+            flush_start = time.monotonic()
+            rows = self.dataset_writer.flush()
+            self.add_stage_time('dataset', time.monotonic() - flush_start)
+            if rows:
+                logger.info(f"[OK] Wrote {rows} processed rows to {self.dataset_dir}")
+        except Exception as e:
+            logger.error(f"[FAILED] Failed to write processed dataset: {e}")
+    
+    def end_dataset_writer(self):
+        """Write anything still buffered and close the dataset writer"""
+        try:
+            self.flush_dataset()
+        finally:
+            self.dataset_writer = None
+    
+    def start_validator(self) -> InlineValidator:
+        """Start the inline validation stage and its issue report"""
+        self.validator = InlineValidator(self.validation_reports_dir, name=f'ingest_validation_{self.writer_name}')
+        return self.validator
+    
+    def end_validator(self):
+        """Close the inline validation report"""
+        if self.validator is None:
+            return
+        try:
+            self.validator.close()
+        finally:
+            self.validator = None
+    
+    def end_run(self):
+        """Close the run manifest"""
+        if self.manifest is not None:
+            self.manifest.close()
+    
+    def run_passes(self, symbols: List[str]) -> Tuple[int, int]:
+        """
+        Quarterly then annual pass over one fetch session
+        
+        Both passes read from one fetch session, so each payload is downloaded once,
+        and their processed output goes to one dataset writer. The quarterly pass
+        keeps only the symbols the annual pass will fetch in the session.
+        
+        Returns:
+            (quarterly records, annual records)
+        """
+        conn = self.get_db_connection()
+        try:
+            annual_watermarks = self.load_watermarks(conn, 'annual')
+        finally:
+            conn.close()
+        now = datetime.now()
+        annual_due = [symbol for symbol in symbols if self.is_due(annual_watermarks.get(symbol), 'annual', now)]
+        if self.manifest is not None:
+            annual_due = self.manifest.pending(annual_due, 'annual')
+        
+        self.start_fetch_session()
+        self.start_dataset_writer()
+        if self.validate:
+            self.start_validator()
+        try:
+            # Ingest quarterly data
+            logger.info("\n[1/2] Ingesting quarterly fundamentals...")
+            self.retain_symbols = set(annual_due)
+            quarterly_records = self.ingest_fundamentals(symbols, period='quarterly')
+            self.retain_symbols = set()
+            
+            # Ingest annual data
+            logger.info("\n[2/2] Ingesting annual fundamentals...")
+            annual_records = self.ingest_fundamentals(symbols, period='annual')
+        finally:
+            self.retain_symbols = set()
+            self.end_fetch_session()
+            self.end_dataset_writer()
+            self.end_validator()
+        return quarterly_records, annual_records
+    
+    def run_sharded(self, symbols: List[str], workers: int) -> List[Dict]:
+        """
+        Run both passes on `workers` processes, each over a round-robin shard of the symbols
+        
+        Every shard builds its own pipeline, DB connection and fetch session and
+        gets an equal share of the request budget.
+        
+        Returns:
+            Per-shard results (see run_shard), in shard order
+        """
+        # Create the watermarks table up front so shards don't race on its DDL
+        conn = self.get_db_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(WATERMARKS_DDL)
+            conn.commit()
+        finally:
+            conn.close()
+        
+        options = {
+            'provider': self.provider,
+            'max_workers': self.max_workers,
+            'requests_per_second': self.requests_per_second / workers,
+            'full_refresh': self.full_refresh,
+            'validate': self.validate,
+        }
+        shards = [symbols[i::workers] for i in range(workers)]
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(run_shard, i, workers, shard, self.manifest.run_id, options): i
+                for i, shard in enumerate(shards) if shard
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    result = future.result()
+                    logger.info(f"[OK] Shard {i + 1}/{workers} finished: {result['quarterly_records']} quarterly, "
+                                f"{result['annual_records']} annual records, {len(result['failures'])} failures")
+                except Exception as e:
+                    logger.error(f"[FAILED] Shard {i + 1}/{workers} crashed: {e}")
+                    result = {
+                        'shard': i,
+                        'quarterly_records': 0,
+                        'annual_records': 0,
+                        'failures': [(symbol, 'all', f'shard crashed: {e}') for symbol in shards[i]],
+                        'stage_timings': {},
+                    }
+                results.append(result)
+        return sorted(results, key=lambda result: result['shard'])
+    
+    def run_full_ingestion(self, symbols: List[str], resume_run_id: Optional[str] = None,
+                           workers: int = 1) -> Dict:
+        """
+        Run complete fundamentals ingestion
+        
+        Args:
+            symbols: List of stock symbols
+            resume_run_id: Continue an interrupted run, skipping units it already wrote
+            workers: Number of processes; above 1 the symbols are sharded across processes
+        
+        Returns:
+            Run summary: run_id, record counts, failures, per-stage seconds and elapsed seconds
+        """
+        manifest = self.start_run(symbols, resume_run_id, workers)
+        if resume_run_id:
+            symbols = manifest.metadata.get('symbols', symbols)
+        workers = max(1, min(workers, len(symbols)))
+        
         logger.info("="*60)
         logger.info("STARTING FUNDAMENTALS INGESTION PIPELINE")
         logger.info("="*60)
         logger.info(f"Provider: {self.provider}")
         logger.info(f"Symbols: {len(symbols)}")
+        logger.info(f"Mode: {'full refresh' if self.full_refresh else 'incremental'}")
+        logger.info(f"Inline validation: {'on' if self.validate else 'off'}")
+        logger.info(f"Workers: {workers} process{'es' if workers > 1 else ''}")
+        logger.info(f"Run ID: {manifest.run_id}{' (resumed)' if resume_run_id else ''}")
         logger.info("="*60)
         
         start_time = datetime.now()
         
-        # Ingest quarterly data
-        logger.info("\n[1/2] Ingesting quarterly fundamentals...")
-        quarterly_records = self.ingest_fundamentals(symbols, period='quarterly')
+        try:
+            if workers > 1:
+                shard_results = self.run_sharded(symbols, workers)
+            else:
+                quarterly_records, annual_records = self.run_passes(symbols)
+                shard_results = [{
+                    'shard': 0,
+                    'quarterly_records': quarterly_records,
+                    'annual_records': annual_records,
+                    'failures': list(self.failures),
+                    'stage_timings': dict(self.stage_timings),
+                }]
+        finally:
+            self.end_run()
         
-        # Ingest annual data
-        logger.info("\n[2/2] Ingesting annual fundamentals...")
-        annual_records = self.ingest_fundamentals(symbols, period='annual')
+        # Coordinator: merge per-shard counts and failures
+        quarterly_records = sum(result['quarterly_records'] for result in shard_results)
+        annual_records = sum(result['annual_records'] for result in shard_results)
+        failures = [failure for result in shard_results for failure in result['failures']]
+        stage_timings = defaultdict(float)
+        for result in shard_results:
+            for stage, seconds in result['stage_timings'].items():
+                stage_timings[stage] += seconds
+        elapsed = datetime.now() - start_time
         
         # Summary
-        elapsed = datetime.now() - start_time
         logger.info("\n" + "="*60)
         logger.info("FUNDAMENTALS INGESTION COMPLETE")
         logger.info("="*60)
@@ -789,12 +1440,77 @@ class FundamentalsIngestionPipeline:
         logger.info(f"Annual records: {annual_records}")
         logger.info(f"Total records: {quarterly_records + annual_records}")
         logger.info(f"Time elapsed: {elapsed}")
-        logger.info(f"Processed data saved to: {self.processed_dir}")
+        logger.info("Stage time: " + ", ".join(f"{stage} {seconds:.1f}s" for stage, seconds in stage_timings.items()))
+        logger.info(f"Processed data saved to: {self.dataset_dir}")
+        if failures:
+            logger.info(f"Failed units: {len(failures)} (retry with --resume {manifest.run_id})")
+            for symbol, period, error in failures[:20]:
+                logger.info(f"  {symbol} [{period}]: {error}")
+        logger.info(f"Run manifest: {manifest.run_dir}")
         logger.info("="*60)
+        
+        return {
+            'run_id': manifest.run_id,
+            'symbols': len(symbols),
+            'workers': workers,
+            'quarterly_records': quarterly_records,
+            'annual_records': annual_records,
+            'total_records': quarterly_records + annual_records,
+            'failures': failures,
+            'stage_timings': dict(stage_timings),
+            'elapsed_s': elapsed.total_seconds(),
+        }
+
+
+def configure_log_context(label: str):
+    """Prefix every log line of this process with a context label"""
+    formatter = logging.Formatter(LOG_FORMAT.replace('%(name)s', f'[{label}] %(name)s'))
+    for handler in logging.getLogger().handlers:
+        handler.setFormatter(formatter)
 
 
+def run_shard(shard: int, shards: int, symbols: List[str], run_id: str, options: Dict) -> Dict:
+    """
+    Process entry point for one shard of a --workers run
+    
+    Args:
+        shard: Shard index
+        shards: Total number of shards
+        symbols: Symbols assigned to this shard
+        run_id: Coordinator's run; the shard appends to its own manifest file
+        options: FundamentalsIngestionPipeline keyword arguments
+    
+    Returns:
+        shard, quarterly_records, annual_records, failures and stage_timings
+    """
+    configure_log_context(f"shard {shard + 1}/{shards}")
+    pipeline = FundamentalsIngestionPipeline(**options)
+    pipeline.writer_name = f'shard{shard}'
+    pipeline.manifest = RunManifest.resume(pipeline.runs_dir, run_id, writer=pipeline.writer_name)
+    try:
+        quarterly_records, annual_records = pipeline.run_passes(symbols)
+    finally:
+        pipeline.end_run()
+    return {
+        'shard': shard,
+        'quarterly_records': quarterly_records,
+        'annual_records': annual_records,
+        'failures': pipeline.failures,
+        'stage_timings': dict(pipeline.stage_timings),
+    }
+
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Fundamentals ingestion pipeline")
+    parser.add_argument("--full-refresh", action="store_true",
+                        help="Ignore watermarks and re-ingest every period for every symbol")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="Continue an interrupted run, skipping symbols it already wrote")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Shard symbols across this many processes (default: 1)")
+    parser.add_argument("--validate", action="store_true",
+                        help="Validate quarterly rows before writing them and quarantine rows with HIGH issues")
+    args = parser.parse_args()
     
     # NSE IT & Services
     NSE_IT = ['TCS.NS', 'INFY.NS', 'WIPRO.NS', 'HCLTECH.NS', 'TECHM.NS', 'LTIM.NS', 'PERSISTENT.NS', 'COFORGE.NS']
@@ -838,10 +1554,10 @@ def main():
                    NSE_RETAIL + NSE_PAINTS)
     
     # Initialize pipeline
-    pipeline = FundamentalsIngestionPipeline(provider='yahoo')
+    pipeline = FundamentalsIngestionPipeline(provider='yahoo', full_refresh=args.full_refresh, validate=args.validate)
     
     # Run full ingestion
-    pipeline.run_full_ingestion(symbols=ALL_SYMBOLS)
+    pipeline.run_full_ingestion(symbols=ALL_SYMBOLS, resume_run_id=args.resume, workers=args.workers)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,152 @@
+"""
+Inline validation stage for fundamentals ingestion
+
+Runs the data_validation quarterly rules on a symbol's merged columns while
+they are still in memory, between the merge and the DB write, so freshly
+ingested periods never need a second read from the database. The whole
+fetched history is validated (gap, QoQ and rolling rules need their
+neighbours), but only issues on periods about to be written are reported.
+Rows with a HIGH severity issue about the row itself (missing or non-numeric
+fields, unparseable or future-dated labels) are quarantined instead of
+inserted. Sequence issues (quarter gaps, duplicates, QoQ and rolling
+anomalies) depend on the neighbouring periods Yahoo happened to return, so
+they are only reported. Issues go to the same CSV / Markdown report format
+as validate_data.
+"""
+
+import logging
+import math
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.data_validation.issues import Issue
+from services.data_validation.report_sink import ReportSink
+from services.data_validation.rules.registry import get_rules
+from services.data_validation.validators.executor import RuleExecutor
+
+logger = logging.getLogger(__name__)
+
+QUARANTINE_SEVERITY = 'HIGH'
+
+# Per-row checks inside the otherwise sequential quarter_continuity rule
+ROW_LEVEL_ISSUE_TYPES = {'Future-dated quarter', 'Quarter label parse failed'}
+
+# Pipeline quarter labels ('Q1 2024') as validate_data expects them ('2024-Q1')
+PIPELINE_QUARTER = re.compile(r'^Q([1-4]) (\d{4})$')
+
+QUARANTINE_DDL = """
+    CREATE TABLE IF NOT EXISTS fundamentals_quarantine (
+        id             BIGSERIAL PRIMARY KEY,
+        ticker         VARCHAR(20) NOT NULL,
+        quarter        VARCHAR(10),
+        row_data       JSONB NOT NULL,
+        issues         JSONB NOT NULL,
+        quarantined_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        UNIQUE (ticker, quarter)
+    )
+"""
+
+
+def to_period_label(quarter: Optional[str]) -> Optional[str]:
+    """'Q1 2024' -> '2024-Q1'; anything else is returned unchanged so the label rules can flag it"""
+    if quarter is None:
+        return None
+    match = PIPELINE_QUARTER.match(quarter.strip())
+    return f"{match.group(2)}-Q{match.group(1)}" if match else quarter
+
+
+def issue_period(issue: Issue) -> str:
+    """Period an issue belongs to (the later side of a 'prev -> curr' gap)"""
+    return issue.affected_period.rsplit(' -> ', 1)[-1]
+
+
+def _value(v: Any) -> Any:
+    return None if isinstance(v, float) and math.isnan(v) else v
+
+
+def validation_rows(columns: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Merged columns -> the quarterly metric rows the validation rules read (NaN -> None)"""
+    size = len(columns['ticker'])
+    empty = [None] * size
+    # Same EPS fallback as build_fundamentals_row
+    eps = [d or e for d, e in zip(columns.get('diluted_eps', empty), columns.get('eps_estimate', empty))]
+    fields = {name: np.asarray(columns[name]).tolist() if name in columns else empty
+              for name in ('revenue', 'ebitda', 'free_cash_flow', 'total_debt')}
+    return [
+        {
+            'period_label': to_period_label(columns['quarter'][i]),
+            'revenue': _value(fields['revenue'][i]),
+            'ebitda': _value(fields['ebitda'][i]),
+            'eps': _value(eps[i]),
+            'free_cash_flow': _value(fields['free_cash_flow'][i]),
+            'total_debt': _value(fields['total_debt'][i]),
+        }
+        for i in range(size)
+    ]
+
+
+class InlineValidator:
+    """Validates merged fundamentals before they are written and collects the issue report"""
+
+    def __init__(self, reports_dir: Path, name: str = 'ingest_validation'):
+        """
+        Args:
+            reports_dir: Directory for the CSV / Markdown issue report
+            name: Report file prefix (one per writer process)
+        """
+        rules = [rule.name for rule in get_rules() if rule.source == 'quarterly']
+        self.executor = RuleExecutor(rules=rules)
+        self.sink = ReportSink(Path(reports_dir), logger, name=name)
+        self.quarantined_rows = 0
+
+    def validate(self, symbol: str, columns: Dict[str, np.ndarray],
+                 new: np.ndarray) -> Tuple[np.ndarray, Dict[str, List[Issue]]]:
+        """
+        Validate one symbol's merged columns
+
+        Args:
+            symbol: Stock symbol
+            columns: Merged columns, every fetched period
+            new: Mask of the periods about to be written
+
+        Returns:
+            (mask of new periods to quarantine, period label -> reported issues)
+        """
+        rows = validation_rows(columns)
+        if not rows:
+            return np.zeros(0, dtype=bool), {}
+        results = self.executor.run(symbol, {'quarterly': rows})
+
+        labels = [str(row['period_label']) for row in rows]
+        new_labels = {label for label, is_new in zip(labels, new.tolist()) if is_new}
+        reported = []
+        held = set()
+        for rule in self.executor.rules:
+            for issue in results[rule.name]:
+                period = issue_period(issue)
+                if period not in new_labels:
+                    continue
+                reported.append(issue)
+                if issue.severity == QUARANTINE_SEVERITY and (rule.row_local or issue.issue_type in ROW_LEVEL_ISSUE_TYPES):
+                    held.add(period)
+        self.sink.add(reported)
+
+        by_period: Dict[str, List[Issue]] = defaultdict(list)
+        for issue in reported:
+            by_period[issue_period(issue)].append(issue)
+
+        quarantine = new & np.array([label in held for label in labels], dtype=bool)
+        self.quarantined_rows += int(quarantine.sum())
+        return quarantine, dict(by_period)
+
+    def close(self) -> Tuple[Path, Path]:
+        """Write the Markdown summary and log where the report went"""
+        logger.info(f"Inline validation: {self.sink.total} issues on new periods, "
+                    f"{self.quarantined_rows} rows quarantined")
+        for line in self.executor.timing_report():
+            logger.info(f"Rule time - {line}")
+        return self.sink.close()
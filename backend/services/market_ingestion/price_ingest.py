@@ -0,0 +1,316 @@
+"""
+Price History Ingestion Job
+Incremental daily OHLCV refresh of price_history
+
+- Each ticker's last stored bar is looked up in one query
+- Tickers are grouped by the day their missing range starts, so a nightly
+  refresh is a single pass of batched downloads (market_data_service)
+- New bars are loaded with COPY into a temporary staging table and merged
+  into price_history on (time, ticker); unchanged bars are not rewritten
+- Optionally mirrors every committed batch into the local memory-mapped
+  price store (services.price_store) so readers can skip the database; a
+  new or stale store is first caught up from price_history
+- Optionally refreshes the weekly / monthly rollups (price_rollups) for
+  every committed batch, from the batch's first fetched day on
+
+Run from the backend directory:
+    python -m services.market_ingestion.price_ingest
+    python -m services.market_ingestion.price_ingest --tickers AAPL,MSFT --history-days 730
+    python -m services.market_ingestion.price_ingest --store ../storage/price_store
+    python -m services.market_ingestion.price_ingest --rollups
+"""
+
+import os
+import io
+import time
+import logging
+import argparse
+from collections import defaultdict
+from datetime import datetime, date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+import psycopg2
+
+from services.market_data_service import download_daily_ohlcv
+from services.market_ingestion.price_rollups import PriceRollups
+from services.price_store import PriceStore, sync_from_db
+
+# Configure logging
+log_dir = Path(__file__).parent.parent.parent / 'logs'
+log_dir.mkdir(exist_ok=True)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler(log_dir / f'price_ingestion_{datetime.now().strftime("%Y%m%d")}.log'),
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# price_history columns in COPY order
+PRICE_COLUMNS = ['time', 'ticker', 'open', 'high', 'low', 'close', 'volume']
+
+STAGING_DDL = """
+    CREATE TEMP TABLE IF NOT EXISTS price_history_staging
+        (LIKE price_history INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+"""
+
+# Bars already stored with identical values are left alone; the last stored bar is re-fetched
+# (it may have been written mid-session) and only rewritten if the provider's values changed
+MERGE_SQL = """
+    INSERT INTO price_history (time, ticker, open, high, low, close, volume)
+    SELECT DISTINCT ON (time, ticker) time, ticker, open, high, low, close, volume
+    FROM price_history_staging
+    ORDER BY time, ticker
+    ON CONFLICT (time, ticker) DO UPDATE SET
+        open = EXCLUDED.open,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume
+    WHERE (price_history.open, price_history.high, price_history.low, price_history.close, price_history.volume)
+          IS DISTINCT FROM (EXCLUDED.open, EXCLUDED.high, EXCLUDED.low, EXCLUDED.close, EXCLUDED.volume)
+    RETURNING (xmax = 0) AS inserted
+"""
+
+
+class PriceIngestionPipeline:
+    """Incremental price_history refresh"""
+
+    def __init__(self, history_days: int = 365, batch_size: Optional[int] = None,
+                 store_dir: Optional[str] = None, rollups: bool = False):
+        """
+        Initialize pipeline
+
+        Args:
+            history_days: Lookback for tickers with no stored bars
+            batch_size: Tickers downloaded and committed per batch (env PRICE_INGEST_BATCH_SIZE)
+            store_dir: Local price store to keep in sync (env PRICE_STORE_DIR, default: none)
+            rollups: Refresh the weekly / monthly rollups after each batch
+        """
+        self.history_days = history_days
+        self.batch_size = batch_size or int(os.getenv('PRICE_INGEST_BATCH_SIZE', '500'))
+        self.store_dir = store_dir or os.getenv('PRICE_STORE_DIR')
+        self.rollups = PriceRollups() if rollups else None
+
+        # Database connection
+        self.db_config = {
+            'host': os.getenv('DB_HOST', 'localhost'),
+            'port': int(os.getenv('DB_PORT', '5433')),
+            'database': os.getenv('DB_NAME', 'stock_screener'),
+            'user': os.getenv('DB_USER', 'postgres'),
+            'password': os.getenv('DB_PASSWORD', '25101974')
+        }
+
+        # Seconds spent per stage
+        self.stage_timings: Dict[str, float] = defaultdict(float)
+
+    def get_db_connection(self):
+        """Get database connection"""
+        try:
+            conn = psycopg2.connect(**self.db_config)
+            logger.info("PostgreSQL connection established")
+            return conn
+        except Exception as e:
+            logger.error(f"Database connection failed: {e}")
+            raise
+
+    def fetch_tickers(self, conn) -> List[str]:
+        """Every ticker in the companies table"""
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT ticker FROM companies ORDER BY ticker")
+            return [ticker for (ticker,) in cursor.fetchall()]
+
+    def load_last_bars(self, conn, tickers: List[str]) -> Dict[str, Optional[datetime]]:
+        """
+        Latest stored bar time per ticker (None when the ticker has no bars)
+
+        One backward index probe on (ticker, time desc) per ticker instead of a
+        scan of the whole table.
+        """
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """SELECT t.ticker, (SELECT max(p.time) FROM price_history p WHERE p.ticker = t.ticker)
+                   FROM unnest(%s::text[]) AS t(ticker)""",
+                (list(tickers),)
+            )
+            return dict(cursor.fetchall())
+
+    def merge_store_bars(self, conn, last_bars: Dict[str, Optional[datetime]],
+                         store: PriceStore) -> Dict[str, Optional[datetime]]:
+        """
+        Restart each ticker at the older of its database and store last bar
+
+        A store created or restored after the database was filled is first
+        caught up from price_history (sync_from_db) rather than re-downloaded,
+        so only bars missing from both are fetched.
+        """
+        behind = []
+        for ticker, last_bar in last_bars.items():
+            stored = store.last_time(ticker)
+            if last_bar is not None and (stored is None or stored < last_bar):
+                behind.append(ticker)
+        if behind:
+            seeded = sync_from_db(conn, store, behind)
+            logger.info(f"Price store {self.store_dir}: seeded {seeded} bars for {len(behind)} tickers from price_history")
+
+        merged = {}
+        for ticker, last_bar in last_bars.items():
+            stored = store.last_time(ticker)
+            merged[ticker] = last_bar if last_bar is None or stored is None else min(last_bar, stored)
+        return merged
+
+    def plan_fetches(self, last_bars: Dict[str, Optional[datetime]], today: date) -> Dict[date, List[str]]:
+        """
+        Group tickers by the first day to fetch
+
+        Known tickers restart at their last stored bar's day, new tickers at the
+        history lookback. After a nightly run nearly every ticker shares one start day.
+        """
+        plan: Dict[date, List[str]] = defaultdict(list)
+        for ticker, last_bar in last_bars.items():
+            start = last_bar.date() if last_bar is not None else today - timedelta(days=self.history_days)
+            if start <= today:
+                plan[start].append(ticker)
+        return dict(sorted(plan.items()))
+
+    def copy_bars(self, prices: pd.DataFrame, cursor):
+        """Stream a (ticker, date) indexed OHLCV frame into the staging table with COPY"""
+        frame = prices.reset_index().rename(columns={'date': 'time'})[PRICE_COLUMNS]
+        buffer = io.StringIO()
+        # NaN is written as an empty field, which COPY loads as NULL
+        frame.to_csv(buffer, header=False, index=False, date_format='%Y-%m-%d %H:%M:%S')
+        buffer.seek(0)
+        cursor.copy_expert(
+            f"COPY price_history_staging ({', '.join(PRICE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+    def write_bars(self, conn, prices: pd.DataFrame) -> Dict[str, int]:
+        """
+        Merge one batch of bars into price_history in one transaction
+
+        Returns:
+            inserted / updated row counts
+        """
+        with conn.cursor() as cursor:
+            try:
+                cursor.execute(STAGING_DDL)
+                self.copy_bars(prices, cursor)
+                cursor.execute(MERGE_SQL)
+                merged = [inserted for (inserted,) in cursor.fetchall()]
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        inserted = sum(merged)
+        return {'inserted': inserted, 'updated': len(merged) - inserted}
+
+    def ingest(self, tickers: Optional[List[str]] = None) -> Dict:
+        """
+        Refresh price_history for the given tickers (default: every company)
+
+        Returns:
+            Run summary: tickers, bars fetched, rows inserted / updated, bars stored, failed batches, per-stage seconds
+        """
+        conn = self.get_db_connection()
+        start_time = time.monotonic()
+        summary = {'tickers': 0, 'fetched': 0, 'inserted': 0, 'updated': 0, 'stored': 0, 'failed': []}
+        store = PriceStore(self.store_dir, mode='a') if self.store_dir else None
+        try:
+            tickers = tickers or self.fetch_tickers(conn)
+            summary['tickers'] = len(tickers)
+            last_bars = self.load_last_bars(conn, tickers)
+            if store is not None:
+                last_bars = self.merge_store_bars(conn, last_bars, store)
+            today = date.today()
+            plan = self.plan_fetches(last_bars, today)
+            logger.info(f"Refreshing {len(tickers)} tickers in {len(plan)} start-day group(s), "
+                        f"{sum(last is None for last in last_bars.values())} without stored bars")
+
+            for start, group in plan.items():
+                for i in range(0, len(group), self.batch_size):
+                    batch = group[i:i + self.batch_size]
+                    try:
+                        fetch_start = time.monotonic()
+                        prices = download_daily_ohlcv(batch, start=start.isoformat(),
+                                                      end=(today + timedelta(days=1)).isoformat())
+                        self.stage_timings['fetch'] += time.monotonic() - fetch_start
+                        if prices.empty:
+                            logger.info(f"No new bars for {len(batch)} tickers from {start}")
+                            continue
+
+                        write_start = time.monotonic()
+                        counts = self.write_bars(conn, prices)
+                        self.stage_timings['write'] += time.monotonic() - write_start
+                    except Exception as e:
+                        logger.error(f"[FAILED] Price batch of {len(batch)} tickers from {start}: {e}")
+                        summary['failed'].extend(batch)
+                        continue
+
+                    if store is not None:
+                        # Only bars committed to price_history reach the store
+                        store_start = time.monotonic()
+                        summary['stored'] += store.write_frame(prices)
+                        store.flush()
+                        self.stage_timings['store'] += time.monotonic() - store_start
+
+                    if self.rollups is not None:
+                        # Every bar this batch changed is on or after `start`, so older buckets stand
+                        rollup_start = time.monotonic()
+                        try:
+                            self.rollups.refresh(conn, batch, since=start)
+                        except Exception as e:
+                            # The bars are committed, so a retry resumes after them; the rollups catch up
+                            # from each ticker's latest stored bucket on the next refresh
+                            logger.error(f"[FAILED] Rollup refresh for {len(batch)} tickers from {start}: {e}")
+                            summary['failed'].extend(batch)
+                        self.stage_timings['rollups'] += time.monotonic() - rollup_start
+
+                    summary['fetched'] += len(prices)
+                    summary['inserted'] += counts['inserted']
+                    summary['updated'] += counts['updated']
+                    logger.info(f"[OK] {len(batch)} tickers from {start}: {len(prices)} bars fetched, "
+                                f"{counts['inserted']} inserted, {counts['updated']} updated")
+        finally:
+            conn.close()
+            if store is not None:
+                store.close()
+
+        summary['stage_timings'] = dict(self.stage_timings)
+        summary['elapsed_s'] = time.monotonic() - start_time
+        logger.info(f"Price ingestion complete: {summary['inserted']} bars inserted, {summary['updated']} updated "
+                    f"for {summary['tickers']} tickers in {summary['elapsed_s']:.1f}s")
+        if store is not None:
+            logger.info(f"Price store {self.store_dir}: {summary['stored']} bars written for {len(store)} tickers")
+        if summary['failed']:
+            logger.info(f"Failed tickers: {len(summary['failed'])} (re-run to retry, they resume from their last bar)")
+        return summary
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Incremental price_history ingestion")
+    parser.add_argument("--tickers", help="Comma-separated tickers (default: every company)")
+    parser.add_argument("--history-days", type=int, default=365,
+                        help="Lookback for tickers with no stored bars (default: 365)")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="Tickers downloaded and committed per batch (default: 500)")
+    parser.add_argument("--store", default=None,
+                        help="Local price store directory to append new bars to (default: PRICE_STORE_DIR, none)")
+    parser.add_argument("--rollups", action="store_true",
+                        help="Refresh the weekly / monthly rollups after each batch")
+    args = parser.parse_args()
+
+    tickers = [t.strip().upper() for t in args.tickers.split(',') if t.strip()] if args.tickers else None
+    pipeline = PriceIngestionPipeline(history_days=args.history_days, batch_size=args.batch_size,
+                                      store_dir=args.store, rollups=args.rollups)
+    pipeline.ingest(tickers)
+
+
+if __name__ == "__main__":
+    main()
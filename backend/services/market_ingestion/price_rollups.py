@@ -0,0 +1,251 @@
+"""
+Weekly and monthly OHLCV rollups of price_history
+
+price_history_weekly / price_history_monthly hold one row per ticker and
+bucket (weeks start on Monday), with columns bucket, ticker, open, high,
+low, close, volume and bars. Two ways to maintain them:
+
+- timescale: when price_history is a TimescaleDB hypertable they are
+  continuous aggregates with real-time aggregation. A refresh
+  re-materializes only invalidated buckets, and the still-open bucket is
+  aggregated at query time.
+- table: plain tables upserted from price_history. A refresh re-aggregates
+  each ticker from the bucket holding its earliest changed bar (by default
+  its latest stored bucket, i.e. the open one) and leaves older buckets alone.
+  A ticker whose latest bucket lags that bar (an earlier refresh failed)
+  catches up from its latest bucket.
+
+Refreshed by the price ingestion job (--rollups) for every committed batch.
+Standalone, from the backend directory:
+    python -m services.market_ingestion.price_rollups
+    python -m services.market_ingestion.price_rollups --tickers AAPL --since 2020-01-01
+"""
+
+import os
+import logging
+import argparse
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+# rollup -> (relation, date_trunc unit, time_bucket interval)
+ROLLUPS = {
+    'weekly': ('price_history_weekly', 'week', '1 week'),
+    'monthly': ('price_history_monthly', 'month', '1 month'),
+}
+
+MODES = ('auto', 'timescale', 'table')
+
+ROLLUP_TABLE_DDL = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        bucket  TIMESTAMP NOT NULL,
+        ticker  VARCHAR(10) NOT NULL,
+        open    NUMERIC(10,4),
+        high    NUMERIC(10,4),
+        low     NUMERIC(10,4),
+        close   NUMERIC(10,4),
+        volume  BIGINT,
+        bars    INTEGER NOT NULL,
+        PRIMARY KEY (bucket, ticker)
+    );
+    CREATE INDEX IF NOT EXISTS idx_{name}_ticker_bucket ON {name}(ticker, bucket desc)
+"""
+
+CONTINUOUS_AGGREGATE_DDL = """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS {name}
+    WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+    SELECT time_bucket(INTERVAL '{interval}', time) AS bucket,
+           ticker,
+           first(open, time) AS open,
+           max(high) AS high,
+           min(low) AS low,
+           last(close, time) AS close,
+           sum(volume)::bigint AS volume,
+           count(*)::integer AS bars
+    FROM price_history
+    GROUP BY bucket, ticker
+    WITH NO DATA
+"""
+
+# Latest stored bucket per ticker (NULL when the ticker has none)
+LATEST_BUCKETS_SQL = """
+    SELECT t.ticker, (SELECT max(r.bucket) FROM {name} r WHERE r.ticker = t.ticker)
+    FROM unnest(%s::text[]) AS t(ticker)
+"""
+
+# Re-aggregate every bucket from each ticker's `since` bucket on; unchanged buckets are not rewritten
+REFRESH_TABLE_SQL = """
+    INSERT INTO {name} (bucket, ticker, open, high, low, close, volume, bars)
+    SELECT date_trunc('{unit}', p.time) AS bucket,
+           p.ticker,
+           (array_agg(p.open ORDER BY p.time))[1],
+           max(p.high),
+           min(p.low),
+           (array_agg(p.close ORDER BY p.time DESC))[1],
+           sum(p.volume),
+           count(*)
+    FROM unnest(%s::text[], %s::timestamp[]) AS w(ticker, since)
+    JOIN price_history p
+      ON p.ticker = w.ticker AND (w.since IS NULL OR p.time >= date_trunc('{unit}', w.since))
+    GROUP BY 1, 2
+    ON CONFLICT (bucket, ticker) DO UPDATE SET
+        open = EXCLUDED.open,
+        high = EXCLUDED.high,
+        low = EXCLUDED.low,
+        close = EXCLUDED.close,
+        volume = EXCLUDED.volume,
+        bars = EXCLUDED.bars
+    WHERE ({name}.open, {name}.high, {name}.low, {name}.close, {name}.volume, {name}.bars)
+          IS DISTINCT FROM (EXCLUDED.open, EXCLUDED.high, EXCLUDED.low, EXCLUDED.close, EXCLUDED.volume, EXCLUDED.bars)
+"""
+
+
+class PriceRollups:
+    """Maintains the weekly and monthly rollups of price_history"""
+
+    def __init__(self, mode: str = 'auto'):
+        """
+        Args:
+            mode: 'timescale', 'table', or 'auto' (continuous aggregates when price_history is a hypertable)
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown rollup mode '{mode}'. Choose from: {', '.join(MODES)}")
+        self.mode = mode
+        self.ready = False
+
+    def detect_mode(self, conn) -> str:
+        """Existing rollups keep their kind; otherwise timescale if price_history is a hypertable"""
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", (ROLLUPS['weekly'][0],))
+            existing = cursor.fetchone()
+            if existing:
+                # Continuous aggregates show up as views
+                return 'timescale' if existing[0] == 'v' else 'table'
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'")
+            if not cursor.fetchone():
+                return 'table'
+            cursor.execute(
+                "SELECT 1 FROM timescaledb_information.hypertables WHERE hypertable_name = 'price_history'"
+            )
+            return 'timescale' if cursor.fetchone() else 'table'
+
+    def ensure(self, conn) -> str:
+        """Resolve the mode and create the rollups if missing; returns the mode"""
+        if self.ready:
+            return self.mode
+        if self.mode == 'auto':
+            self.mode = self.detect_mode(conn)
+        ddl = CONTINUOUS_AGGREGATE_DDL if self.mode == 'timescale' else ROLLUP_TABLE_DDL
+        if self.mode == 'timescale':
+            # Continuous aggregates cannot be created inside a transaction
+            conn.commit()
+            conn.autocommit = True
+        try:
+            with conn.cursor() as cursor:
+                for name, _, interval in ROLLUPS.values():
+                    cursor.execute(ddl.format(name=name, interval=interval))
+            if not conn.autocommit:
+                conn.commit()
+        finally:
+            conn.autocommit = False
+        self.ready = True
+        logger.info(f"Price rollups: {', '.join(name for name, _, _ in ROLLUPS.values())} ({self.mode})")
+        return self.mode
+
+    def latest_buckets(self, conn, name: str, tickers: List[str]) -> Dict[str, Optional[datetime]]:
+        """Latest stored bucket per ticker"""
+        with conn.cursor() as cursor:
+            cursor.execute(LATEST_BUCKETS_SQL.format(name=name), (list(tickers),))
+            return dict(cursor.fetchall())
+
+    def refresh(self, conn, tickers: List[str], since: Optional[date] = None) -> Dict[str, int]:
+        """
+        Bring the rollups up to date after new daily bars for `tickers` landed
+
+        Args:
+            tickers: Tickers whose bars changed (table mode only; continuous aggregates track this themselves)
+            since: Earliest changed bar. Table mode: a ticker whose latest stored bucket is older
+                restarts there, and None means each ticker's latest stored bucket. Timescale mode:
+                None refreshes the whole aggregate (TimescaleDB still only re-materializes the
+                buckets invalidated since the last refresh)
+
+        Returns:
+            rollup -> buckets written (table mode; 0 for continuous aggregates)
+        """
+        mode = self.ensure(conn)
+        written = {}
+        if mode == 'timescale':
+            conn.commit()
+            conn.autocommit = True
+            try:
+                with conn.cursor() as cursor:
+                    for rollup, (name, _, interval) in ROLLUPS.items():
+                        # Only buckets wholly inside the window are refreshed, so start at the bucket holding `since`
+                        cursor.execute(
+                            f"CALL refresh_continuous_aggregate(%s, time_bucket(INTERVAL '{interval}', %s::timestamp), NULL)",
+                            (name, since)
+                        )
+                        written[rollup] = 0
+            finally:
+                conn.autocommit = False
+            return written
+
+        with conn.cursor() as cursor:
+            try:
+                for rollup, (name, unit, _) in ROLLUPS.items():
+                    latest = self.latest_buckets(conn, name, tickers)
+                    if since is None:
+                        starts = [latest.get(ticker) for ticker in tickers]
+                    else:
+                        # A rollup left behind by a failed refresh catches up from its latest bucket;
+                        # a ticker with no buckets yet is aggregated in full
+                        since_time = datetime(since.year, since.month, since.day)
+                        starts = [None if latest[ticker] is None else min(latest[ticker], since_time)
+                                  for ticker in tickers]
+                    cursor.execute(REFRESH_TABLE_SQL.format(name=name, unit=unit), (list(tickers), starts))
+                    written[rollup] = cursor.rowcount
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return written
+
+
+def main():
+    """Main entry point"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Refresh weekly / monthly price rollups")
+    parser.add_argument("--tickers", help="Comma-separated tickers (default: every company)")
+    parser.add_argument("--since", type=date.fromisoformat, default=None,
+                        help="Re-aggregate from this day's bucket (YYYY-MM-DD, default: latest stored bucket in "
+                             "table mode, the whole aggregate in timescale mode)")
+    parser.add_argument("--mode", choices=MODES, default='auto', help="Rollup backend (default: auto)")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=int(os.getenv('DB_PORT', '5433')),
+        database=os.getenv('DB_NAME', 'stock_screener'),
+        user=os.getenv('DB_USER', 'postgres'),
+        password=os.getenv('DB_PASSWORD', '25101974')
+    )
+    try:
+        if args.tickers:
+            tickers = [t.strip().upper() for t in args.tickers.split(',') if t.strip()]
+        else:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT ticker FROM companies ORDER BY ticker")
+                tickers = [ticker for (ticker,) in cursor.fetchall()]
+        written = PriceRollups(args.mode).refresh(conn, tickers, since=args.since)
+        logger.info(f"Rollups refreshed for {len(tickers)} tickers: "
+                    + ", ".join(f"{rollup} {count} buckets" for rollup, count in written.items()))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
 import os
-import time
-import requests
-from typing import Any, Dict, Optional
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from services.market_ingestion.providers.http_transport import AsyncHttpTransport, get_transport
+
+
+def _is_throttle_notice(data: Any) -> bool:
+    # Alpha Vantage answers HTTP 200 with a "Note" body (or a rate-limit "Information" body) when throttling
+    if not isinstance(data, dict):
+        return False
+    return "Note" in data or "rate limit" in str(data.get("Information", "")).lower()
 
 
 class AlphaVantageProvider:
@@ -9,40 +17,63 @@ class AlphaVantageProvider:
     Alpha Vantage Fundamental Data endpoints.
     Docs: https://www.alphavantage.co/documentation/
     """
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, sleep_s: float = 12.0):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, sleep_s: Optional[float] = None,
+                 requests_per_minute: float = 5.0, max_concurrency: int = 4):
         self.api_key = api_key or os.getenv("ALPHAVANTAGE_API_KEY") or os.getenv("MARKETDATA_API_KEY")
         if not self.api_key:
             raise RuntimeError("Missing ALPHAVANTAGE_API_KEY (or MARKETDATA_API_KEY) environment variable.")
         self.base_url = base_url or os.getenv("ALPHAVANTAGE_BASE_URL", "https://www.alphavantage.co/query")
-        self.sleep_s = float(os.getenv("ALPHAVANTAGE_SLEEP_S", str(sleep_s)))  # free tier rate limiting safety
 
-    def _get(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        # Quota (free tier: 5 requests/minute). The legacy per-call sleep maps to the same spacing.
+        sleep_s = sleep_s or float(os.getenv("ALPHAVANTAGE_SLEEP_S", "0"))
+        if sleep_s > 0:
+            requests_per_minute = 60.0 / sleep_s
+        self.requests_per_minute = float(os.getenv("ALPHAVANTAGE_REQUESTS_PER_MINUTE", str(requests_per_minute)))
+
+        self.transport = get_transport(
+            "alphavantage", self.base_url,
+            requests_per_minute=self.requests_per_minute,
+            is_throttled=_is_throttle_notice,
+            backoff_s=float(os.getenv("ALPHAVANTAGE_BACKOFF_S", "15")),
+        )
+        self.async_transport = AsyncHttpTransport(self.transport, max_concurrency=max_concurrency)
+
+    def _params(self, params: Dict[str, Any]) -> Dict[str, Any]:
         params = dict(params)
         params["apikey"] = self.api_key
+        return params
 
-        resp = requests.get(self.base_url, params=params, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-
-        # Alpha Vantage returns these on throttling / issues
-        if "Note" in data:
-            raise RuntimeError(f"AlphaVantage throttled: {data['Note']}")
+    def _check(self, data: Dict[str, Any]) -> Dict[str, Any]:
         if "Error Message" in data:
             raise RuntimeError(f"AlphaVantage error: {data['Error Message']}")
         return data
 
+    def _get(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        # Throttle notices are retried with backoff by the transport
+        return self._check(self.transport.get_json(params=self._params(params)))
+
+    async def _aget(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self._check(await self.async_transport.get_json(params=self._params(params)))
+
     def income_statement(self, symbol: str) -> Dict[str, Any]:
-        time.sleep(self.sleep_s)
         return self._get({"function": "INCOME_STATEMENT", "symbol": symbol})
 
     def balance_sheet(self, symbol: str) -> Dict[str, Any]:
-        time.sleep(self.sleep_s)
         return self._get({"function": "BALANCE_SHEET", "symbol": symbol})
 
     def cash_flow(self, symbol: str) -> Dict[str, Any]:
-        time.sleep(self.sleep_s)
         return self._get({"function": "CASH_FLOW", "symbol": symbol})
 
     def earnings(self, symbol: str) -> Dict[str, Any]:
-        time.sleep(self.sleep_s)
-        return self._get({"function": "EARNINGS", "symbol": symbol})
\ No newline at end of file
+        return self._get({"function": "EARNINGS", "symbol": symbol})
+
+    async def fetch_many(self, function: str, symbols: List[str]) -> Dict[str, Any]:
+        """
+        Fetch one endpoint (e.g. "INCOME_STATEMENT") for many symbols concurrently.
+        Failures are returned in place of the payload for that symbol.
+        """
+        results = await asyncio.gather(
+            *(self._aget({"function": function, "symbol": symbol}) for symbol in symbols),
+            return_exceptions=True,
+        )
+        return dict(zip(symbols, results))
@@ -1,7 +1,9 @@
 import os
-import requests
+import asyncio
 from typing import Any, Dict, List, Optional
 
+from services.market_ingestion.providers.http_transport import AsyncHttpTransport, get_transport
+
 
 class FMPProvider:
     """
@@ -10,21 +12,33 @@ class FMPProvider:
       /stable/income-statement?symbol=AAPL
     """
 
-    def __init__(self) -> None:
-        self.api_key = os.getenv("FMP_API_KEY", "")
-        self.base_url = os.getenv("FMP_BASE_URL", "https://financialmodelingprep.com/stable").rstrip("/")
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 requests_per_minute: float = 300.0, max_concurrency: int = 8) -> None:
+        self.api_key = api_key or os.getenv("FMP_API_KEY", "")
+        self.base_url = (base_url or os.getenv("FMP_BASE_URL", "https://financialmodelingprep.com/stable")).rstrip("/")
 
         if not self.api_key:
             raise RuntimeError("FMP_API_KEY is missing. Set it in environment variables.")
 
-    def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
-        url = f"{self.base_url}/{path.lstrip('/')}"
-        q = params or {}
+        # Quota depends on the plan (300/min on Starter), override with FMP_REQUESTS_PER_MINUTE
+        self.requests_per_minute = float(os.getenv("FMP_REQUESTS_PER_MINUTE", str(requests_per_minute)))
+        self.transport = get_transport(
+            "fmp", self.base_url,
+            requests_per_minute=self.requests_per_minute,
+            burst=max(1.0, self.requests_per_minute / 60.0),
+        )
+        self.async_transport = AsyncHttpTransport(self.transport, max_concurrency=max_concurrency)
+
+    def _params(self, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        q = dict(params or {})
         q["apikey"] = self.api_key
+        return q
 
-        resp = requests.get(url, params=q, timeout=30)
-        resp.raise_for_status()
-        return resp.json()
+    def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        return self.transport.get_json(path, self._params(params))
+
+    async def _aget(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        return await self.async_transport.get_json(path, self._params(params))
 
     # ✅ Stable endpoints
     def income_statement(self, ticker: str, period: str, limit: int) -> List[Dict[str, Any]]:
@@ -42,4 +56,15 @@ class FMPProvider:
 
     def company_profile(self, ticker: str) -> Dict[str, Any]:
         data = self._get("profile", {"symbol": ticker})
-        return data[0] if isinstance(data, list) and data else {}
\ No newline at end of file
+        return data[0] if isinstance(data, list) and data else {}
+
+    async def fetch_many(self, path: str, tickers: List[str], **params: Any) -> Dict[str, Any]:
+        """
+        Fetch one endpoint (e.g. "income-statement") for many tickers concurrently.
+        Failures are returned in place of the payload for that ticker.
+        """
+        results = await asyncio.gather(
+            *(self._aget(path, {"symbol": ticker, **params}) for ticker in tickers),
+            return_exceptions=True,
+        )
+        return dict(zip(tickers, results))
@@ -0,0 +1,151 @@
+"""
+Shared HTTP transport for market data providers
+
+- Keep-alive connection pooling through one requests.Session per provider endpoint
+- Token-bucket rate limiting sized to each provider's real quota
+- Retry with exponential backoff on throttle responses (HTTP 429 or an in-body notice)
+- Async variant for fetching many symbols concurrently
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from services.market_ingestion.rate_limit import TokenBucket
+
+
+class ThrottledError(RuntimeError):
+    """Raised when a provider keeps throttling after all retries"""
+
+
+class HttpTransport:
+    """Pooled, rate-limited JSON-over-HTTP client"""
+
+    def __init__(self, base_url: str, requests_per_minute: float, burst: float = 1.0,
+                 is_throttled: Optional[Callable[[Any], bool]] = None, max_retries: int = 3,
+                 backoff_s: float = 2.0, timeout: float = 30.0, pool_size: int = 10,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            base_url: Provider endpoint, e.g. a local stub server in tests
+            requests_per_minute: Provider quota, enforced with a token bucket
+            burst: Requests allowed back to back before the quota spacing applies
+            is_throttled: Detects throttle notices returned with HTTP 200
+            max_retries: Retries after a throttle response
+            backoff_s: First backoff delay, doubled on every retry
+            timeout: Per-request timeout in seconds
+            pool_size: Keep-alive connections kept per host
+        """
+        self.base_url = base_url.rstrip("/")
+        self.limiter = TokenBucket(requests_per_minute / 60.0, capacity=burst)
+        self.is_throttled = is_throttled or (lambda data: False)
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.timeout = timeout
+        self._sleep = sleep
+
+        self.session = requests.Session()
+        # Transport-level retries: connection errors and HTTP 429/5xx, honouring Retry-After
+        retry = Retry(total=max_retries, backoff_factor=backoff_s / 2, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=("GET",), respect_retry_after_header=True, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def url(self, path: str = "") -> str:
+        return f"{self.base_url}/{path.lstrip('/')}" if path else self.base_url
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (0-based)"""
+        return self.backoff_s * (2 ** attempt)
+
+    def request(self, url: str, params: Dict[str, Any]) -> Any:
+        """One GET on the pooled session, without rate limiting or throttle retries"""
+        resp = self.session.get(url, params=params, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def get_json(self, path: str = "", params: Optional[Dict[str, Any]] = None) -> Any:
+        """Rate-limited GET that backs off and retries while the provider reports throttling"""
+        url = self.url(path)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            data = self.request(url, params or {})
+            if not self.is_throttled(data):
+                return data
+            if attempt < self.max_retries:
+                self._sleep(self.backoff(attempt))
+        raise ThrottledError(f"Throttled by {self.base_url} after {self.max_retries} retries: {data}")
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncHttpTransport:
+    """
+    asyncio front-end over an HttpTransport
+
+    Requests run on worker threads through the same pooled session and share
+    the same token bucket, so sync and async callers respect one quota.
+    """
+
+    def __init__(self, transport: HttpTransport, max_concurrency: int = 8):
+        self.transport = transport
+        self.max_concurrency = max_concurrency
+        self._semaphores: Dict[int, asyncio.Semaphore] = {}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # One semaphore per event loop
+        loop_id = id(asyncio.get_running_loop())
+        if loop_id not in self._semaphores:
+            self._semaphores[loop_id] = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphores[loop_id]
+
+    async def get_json(self, path: str = "", params: Optional[Dict[str, Any]] = None) -> Any:
+        transport = self.transport
+        url = transport.url(path)
+        for attempt in range(transport.max_retries + 1):
+            await transport.limiter.acquire_async()
+            async with self._semaphore():
+                data = await asyncio.to_thread(transport.request, url, params or {})
+            if not transport.is_throttled(data):
+                return data
+            if attempt < transport.max_retries:
+                await asyncio.sleep(transport.backoff(attempt))
+        raise ThrottledError(f"Throttled by {transport.base_url} after {transport.max_retries} retries: {data}")
+
+
+_transports: Dict[tuple, HttpTransport] = {}
+# Settings each shared transport was created with
+_transport_settings: Dict[tuple, Dict[str, Any]] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(name: str, base_url: str, **kwargs) -> HttpTransport:
+    """
+    Return the process-wide transport for a provider endpoint
+
+    Provider instances pointing at the same endpoint share one connection
+    pool and one quota, so they must agree on its settings.
+
+    Raises:
+        ValueError: The endpoint's transport already exists with different settings
+    """
+    key = (name, base_url.rstrip("/"))
+    with _transports_lock:
+        transport = _transports.get(key)
+        if transport is None:
+            transport = HttpTransport(base_url, **kwargs)
+            _transports[key] = transport
+            _transport_settings[key] = kwargs
+        elif kwargs != _transport_settings[key]:
+            existing = _transport_settings[key]
+            changed = sorted(k for k in set(kwargs) | set(existing) if kwargs.get(k) != existing.get(k))
+            raise ValueError(f"Transport '{name}' for {key[1]} already exists with different settings: "
+                             + ", ".join(f"{k}={existing.get(k)!r} (requested {kwargs.get(k)!r})" for k in changed))
+        return transport
@@ -0,0 +1,61 @@
+"""
+Rate limiting helpers shared by the market ingestion pipelines
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`. Callers
+    reserve a token and sleep outside the lock, so concurrent workers are
+    spaced out instead of serialised behind each other.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take `tokens` from the bucket and return how long the caller must wait"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until `tokens` are available
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Async variant of acquire: waits without blocking the event loop"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
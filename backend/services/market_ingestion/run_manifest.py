@@ -0,0 +1,128 @@
+"""
+Run manifest for resumable ingestion runs
+
+Every (symbol, period) unit moves through fetched -> transformed -> written.
+Progress is appended to JSONL event files under <runs_dir>/<run_id>/, one
+file per writer, so a crashed run can be resumed from its last completed
+unit and concurrent writers never share a file.
+"""
+
+import json
+import os
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PHASES = ('fetched', 'transformed', 'written')
+FAILED = 'failed'
+
+
+class RunManifest:
+    """Append-only record of per-symbol, per-period progress for one run"""
+
+    def __init__(self, runs_dir: Path, run_id: Optional[str] = None, writer: str = 'main',
+                 metadata: Optional[Dict] = None):
+        """
+        Args:
+            runs_dir: Directory holding one sub-directory per run
+            run_id: Existing run to reopen, or None to start a new run
+            writer: Name of this writer's event file (one per process)
+            metadata: Run options stored with a new run (symbols, flags)
+        """
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        self.run_dir = Path(runs_dir) / self.run_id
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._status: Dict[Tuple[str, str], str] = {}
+        self._errors: Dict[Tuple[str, str], str] = {}
+
+        meta_path = self.run_dir / 'run.json'
+        if meta_path.exists():
+            self.metadata = json.loads(meta_path.read_text(encoding='utf-8'))
+        else:
+            self.metadata = {'run_id': self.run_id, 'started_at': datetime.now().isoformat(), **(metadata or {})}
+            meta_path.write_text(json.dumps(self.metadata, indent=2), encoding='utf-8')
+
+        self._load()
+        events_path = self.run_dir / f'events-{writer}.jsonl'
+        torn = events_path.exists() and events_path.stat().st_size > 0 and not events_path.read_bytes().endswith(b'\n')
+        self._file = open(events_path, 'a', encoding='utf-8')
+        if torn:
+            # Terminate the torn line so the next event starts on its own line
+            self._file.write('\n')
+
+    @classmethod
+    def resume(cls, runs_dir: Path, run_id: str, writer: str = 'main') -> 'RunManifest':
+        """Reopen an existing run, failing if it was never started"""
+        if not (Path(runs_dir) / run_id / 'run.json').exists():
+            raise FileNotFoundError(f"No ingestion run '{run_id}' under {runs_dir}")
+        return cls(runs_dir, run_id=run_id, writer=writer)
+
+    def _load(self):
+        """Replay every writer's events; a unit keeps the furthest phase it reached"""
+        for path in sorted(self.run_dir.glob('events-*.jsonl')):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash can leave a torn last line
+                        continue
+                    self._apply(event)
+
+    def _apply(self, event: Dict):
+        key = (event['symbol'], event['period'])
+        phase = event['phase']
+        if phase == FAILED:
+            self._errors[key] = event.get('error', '')
+            return
+        current = self._status.get(key)
+        if current is None or PHASES.index(phase) > PHASES.index(current):
+            self._status[key] = phase
+            self._errors.pop(key, None)
+
+    def record(self, symbol: str, period: str, phase: str, error: Optional[str] = None):
+        """Append a progress event for one unit"""
+        event = {'symbol': symbol, 'period': period, 'phase': phase, 'at': datetime.now().isoformat()}
+        if error is not None:
+            event['error'] = error
+        with self._lock:
+            self._apply(event)
+            self._file.write(json.dumps(event) + '\n')
+            self._file.flush()
+
+    def sync(self):
+        """Force events to disk (called after each committed write batch)"""
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def status(self, symbol: str, period: str) -> Optional[str]:
+        with self._lock:
+            return self._status.get((symbol, period))
+
+    def is_complete(self, symbol: str, period: str) -> bool:
+        return self.status(symbol, period) == 'written'
+
+    def pending(self, symbols: List[str], period: str) -> List[str]:
+        """Symbols whose unit for this period has not been written yet"""
+        return [symbol for symbol in symbols if not self.is_complete(symbol, period)]
+
+    def failures(self, period: Optional[str] = None) -> Dict[Tuple[str, str], str]:
+        """Units whose latest attempt failed"""
+        with self._lock:
+            return {key: error for key, error in self._errors.items() if period is None or key[1] == period}
+
+    def summary(self, period: str) -> Counter:
+        """Count of units per phase for one period"""
+        with self._lock:
+            return Counter(phase for (_, p), phase in self._status.items() if p == period)
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                self._file.close()
@@ -0,0 +1,113 @@
+"""
+Per-run Yahoo Finance fetch layer
+
+Builds one yf.Ticker per symbol and memoizes every remote payload
+(statements, info, holders, actions) so the quarterly and annual passes of
+a run share a single download of each. The pipeline releases a symbol
+once a pass has consumed it, keeping at most the small payloads a later
+pass still reads, so statements and ticker objects are only held for
+symbols in flight rather than for the whole universe.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+import yfinance as yf
+
+from services.market_ingestion.rate_limit import TokenBucket
+
+
+class YahooFetchSession:
+    """Thread-safe memo of yf.Ticker objects and their attribute payloads"""
+
+    def __init__(self, rate_limiter: Optional[TokenBucket] = None,
+                 ticker_factory: Callable[[str], Any] = None):
+        """
+        Args:
+            rate_limiter: Limiter acquired before every remote call (cache hits are free)
+            ticker_factory: Builds the per-symbol ticker object, defaults to yf.Ticker
+        """
+        self.rate_limiter = rate_limiter
+        self.ticker_factory = ticker_factory or yf.Ticker
+        self._tickers: Dict[str, Any] = {}
+        # symbol -> attribute -> payload
+        self._payloads: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        self._symbol_locks = defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+        # Every symbol requested this session, including released ones
+        self._seen: Set[str] = set()
+        self.remote_calls = 0
+        self.cache_hits = 0
+
+    def _symbol_lock(self, symbol: str) -> threading.Lock:
+        with self._lock:
+            return self._symbol_locks[symbol]
+
+    def ticker(self, symbol: str):
+        """Return the shared ticker object for a symbol"""
+        with self._symbol_lock(symbol):
+            ticker = self._tickers.get(symbol)
+            if ticker is None:
+                ticker = self.ticker_factory(symbol)
+                self._tickers[symbol] = ticker
+                with self._lock:
+                    self._seen.add(symbol)
+            return ticker
+
+    def get(self, symbol: str, attr: str):
+        """
+        Return a ticker attribute, fetching it at most once per session
+
+        Failed fetches are not cached, so a later pass can retry them.
+        """
+        ticker = self.ticker(symbol)
+        with self._symbol_lock(symbol):
+            with self._lock:
+                payloads = self._payloads[symbol]
+            if attr in payloads:
+                with self._lock:
+                    self.cache_hits += 1
+                return payloads[attr]
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            with self._lock:
+                self.remote_calls += 1
+            value = getattr(ticker, attr)
+            payloads[attr] = value
+            return value
+
+    def release(self, symbol: str, keep: Iterable[str] = ()):
+        """
+        Drop a symbol's ticker object and payloads
+
+        Args:
+            symbol: Stock symbol
+            keep: Attributes a later pass still reads; their payloads stay cached
+        """
+        with self._lock:
+            self._tickers.pop(symbol, None)
+            payloads = self._payloads.pop(symbol, {})
+            kept = {attr: payloads[attr] for attr in keep if attr in payloads}
+            if kept:
+                self._payloads[symbol] = kept
+            else:
+                self._symbol_locks.pop(symbol, None)
+
+    def clear(self):
+        """Drop all cached tickers and payloads"""
+        with self._lock:
+            self._tickers.clear()
+            self._payloads.clear()
+            self._seen.clear()
+            self._symbol_locks.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Remote call and cache hit counters"""
+        with self._lock:
+            return {
+                'symbols': len(self._seen),
+                'remote_calls': self.remote_calls,
+                'cache_hits': self.cache_hits,
+            }
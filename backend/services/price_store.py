@@ -0,0 +1,347 @@
+"""
+Memory-mapped local OHLCV store.
+
+Layout under the store root:
+    index.json      ticker -> {offset, capacity, length} in rows, and the file generation
+    <field>.bin     one flat array per field (time, open, high, low, close, volume);
+                    <field>.<generation>.bin once the store has been compacted
+
+Every ticker owns a contiguous region [offset, offset + capacity) in all field
+files, bars in time order. Reads are zero-copy slices of the memory-mapped
+files, located by binary search on the time column, so a universe-wide scan
+reads straight from the page cache.
+
+Writes are append-only: new bars go to the end of a ticker's region. A region
+that fills up is copied to the end of the files with twice the capacity; the
+old region is left as it was, so readers holding the previous index keep
+seeing consistent data. Re-sent bars overwrite the tail from their first bar
+onward (a corrected last bar). The index is replaced atomically on flush(), so
+bars written after the last flush are simply invisible after a crash.
+
+Abandoned regions are only reclaimed by compact(), which copies the live
+regions into a new generation of field files, publishes the index, and then
+deletes the previous files. Readers that already mapped them keep their view;
+readers opened before the compaction that have not should be reopened.
+
+Single writer, any number of readers.
+
+Build or refresh from the database (from the backend directory):
+    python -m services.price_store --root ../storage/price_store
+    python -m services.price_store --root ../storage/price_store --compact
+"""
+import argparse
+import json
+import os
+from datetime import date, datetime
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+FIELDS: Dict[str, np.dtype] = {
+    "time": np.dtype("datetime64[s]"),
+    "open": np.dtype("float64"),
+    "high": np.dtype("float64"),
+    "low": np.dtype("float64"),
+    "close": np.dtype("float64"),
+    "volume": np.dtype("int64"),
+}
+PRICE_FIELDS = [f for f in FIELDS if f != "time"]
+
+# Rows reserved for a new ticker (about two years of daily bars)
+INITIAL_CAPACITY = 512
+INDEX_VERSION = 1
+
+TimeLike = Union[str, date, datetime, np.datetime64]
+
+
+def _to_time(t: TimeLike) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(t).to_datetime64(), "s")
+
+
+class PriceStore:
+    def __init__(self, root: Union[str, Path], mode: str = "r"):
+        """
+        root: store directory
+        mode: "r" read-only, "a" read and append (creates the store if missing)
+        """
+        if mode not in ("r", "a"):
+            raise ValueError(f"Unknown mode '{mode}'. Choose from: r, a")
+        self.root = Path(root)
+        self.writable = mode == "a"
+        if self.writable:
+            self.root.mkdir(parents=True, exist_ok=True)
+
+        index_path = self.root / "index.json"
+        if index_path.exists():
+            index = json.loads(index_path.read_text())
+        elif self.writable:
+            index = {"version": INDEX_VERSION, "rows": 0, "tickers": {}}
+        else:
+            raise FileNotFoundError(f"No price store at {self.root}")
+        self.rows: int = index["rows"]
+        # Field files in use; bumped by compact()
+        self.generation: int = index.get("generation", 0)
+        # ticker -> [offset, capacity, length]
+        self.regions: Dict[str, List[int]] = {t: [r["offset"], r["capacity"], r["length"]] for t, r in index["tickers"].items()}
+        self._maps: Dict[str, np.ndarray] = {}
+
+    # -----------------------------
+    # Files
+    # -----------------------------
+    def _path(self, field: str, generation: Optional[int] = None) -> Path:
+        generation = self.generation if generation is None else generation
+        return self.root / (f"{field}.bin" if generation == 0 else f"{field}.{generation}.bin")
+
+    def _column(self, field: str) -> np.ndarray:
+        """Whole memory-mapped field file (rows entries)."""
+        if field not in self._maps:
+            if self.rows == 0:
+                self._maps[field] = np.empty(0, dtype=FIELDS[field])
+            else:
+                self._maps[field] = np.memmap(
+                    self._path(field), dtype=FIELDS[field], mode="r+" if self.writable else "r", shape=(self.rows,)
+                )
+        return self._maps[field]
+
+    def _grow(self, rows: int) -> None:
+        self._release()
+        for field, dtype in FIELDS.items():
+            with open(self._path(field), "ab") as f:
+                f.truncate(rows * dtype.itemsize)
+        self.rows = rows
+
+    def _release(self) -> None:
+        for column in self._maps.values():
+            if isinstance(column, np.memmap):
+                column.flush()
+        self._maps.clear()
+
+    # -----------------------------
+    # Reads
+    # -----------------------------
+    def tickers(self) -> List[str]:
+        return sorted(self.regions)
+
+    def __len__(self) -> int:
+        return len(self.regions)
+
+    def last_time(self, ticker: str) -> Optional[datetime]:
+        region = self.regions.get(ticker)
+        if not region or not region[2]:
+            return None
+        offset, _, length = region
+        return pd.Timestamp(self._column("time")[offset + length - 1]).to_pydatetime()
+
+    def read(
+        self, ticker: str, start: Optional[TimeLike] = None, end: Optional[TimeLike] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Bars with start <= time <= end as field -> array views into the store (no copy).
+        Unknown tickers give empty arrays.
+        """
+        fields = list(fields or FIELDS)
+        region = self.regions.get(ticker)
+        if not region:
+            return {f: np.empty(0, dtype=FIELDS[f]) for f in fields}
+        offset, _, length = region
+        lo, hi = offset, offset + length
+        times = self._column("time")[lo:hi]
+        if start is not None:
+            lo = offset + int(np.searchsorted(times, _to_time(start), side="left"))
+        if end is not None:
+            hi = offset + int(np.searchsorted(times, _to_time(end), side="right"))
+        return {f: self._column(f)[lo:max(lo, hi)] for f in fields}
+
+    def scan(
+        self, tickers: Optional[Sequence[str]] = None, start: Optional[TimeLike] = None, end: Optional[TimeLike] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Iterator[Tuple[str, Dict[str, np.ndarray]]]:
+        """(ticker, read(ticker, start, end)) for every ticker (default: all), in storage order for sequential I/O."""
+        names = [t for t in (tickers if tickers is not None else self.regions) if t in self.regions]
+        for ticker in sorted(names, key=lambda t: self.regions[t][0]):
+            yield ticker, self.read(ticker, start, end, fields)
+
+    # -----------------------------
+    # Writes
+    # -----------------------------
+    def write(self, ticker: str, times: np.ndarray, columns: Dict[str, np.ndarray]) -> int:
+        """
+        Append bars (times ascending) for one ticker; bars at or after times[0] that are
+        already stored are replaced. Returns the number of bars written.
+        """
+        if not self.writable:
+            raise PermissionError("Price store opened read-only")
+        if not len(times):
+            return 0
+        times = np.asarray(times).astype(FIELDS["time"])
+
+        region = self.regions.get(ticker)
+        if region is None:
+            region = self.regions[ticker] = [self.rows, 0, 0]
+        offset, capacity, length = region
+        keep = int(np.searchsorted(self._column("time")[offset:offset + length], times[0], side="left"))
+        needed = keep + len(times)
+
+        if needed > capacity:
+            # Move the ticker to a fresh region at the end of the files
+            new_capacity = max(INITIAL_CAPACITY, capacity * 2)
+            while new_capacity < needed:
+                new_capacity *= 2
+            new_offset = self.rows
+            self._grow(self.rows + new_capacity)
+            for field in FIELDS:
+                column = self._column(field)
+                column[new_offset:new_offset + keep] = column[offset:offset + keep]
+            offset, capacity = new_offset, new_capacity
+
+        self._column("time")[offset + keep:offset + needed] = times
+        for field in PRICE_FIELDS:
+            values = np.asarray(columns[field])
+            if field == "volume":
+                values = np.nan_to_num(values.astype(float), nan=0.0)
+            self._column(field)[offset + keep:offset + needed] = values
+        self.regions[ticker] = [offset, capacity, needed]
+        return len(times)
+
+    def write_frame(self, prices: pd.DataFrame) -> int:
+        """Write a (ticker, date) indexed OHLCV frame (market_data_service.download_daily_ohlcv)."""
+        written = 0
+        for ticker, rows in prices.groupby(level="ticker", sort=False):
+            rows = rows.sort_index()
+            times = rows.index.get_level_values(-1).to_numpy()
+            written += self.write(ticker, times, {f: rows[f].to_numpy() for f in PRICE_FIELDS})
+        return written
+
+    def flush(self) -> None:
+        """Persist the field files, then atomically publish the new index."""
+        if not self.writable:
+            return
+        for column in self._maps.values():
+            if isinstance(column, np.memmap):
+                column.flush()
+        index = {
+            "version": INDEX_VERSION,
+            "rows": self.rows,
+            "generation": self.generation,
+            "tickers": {t: {"offset": o, "capacity": c, "length": n} for t, (o, c, n) in self.regions.items()},
+        }
+        tmp = self.root / "index.json.tmp"
+        tmp.write_text(json.dumps(index))
+        os.replace(tmp, self.root / "index.json")
+
+    def compact(self) -> int:
+        """
+        Copy the live regions (capacities kept, storage order) into a new generation of
+        field files, publish it, and delete the previous files. Returns the rows reclaimed.
+        """
+        if not self.writable:
+            raise PermissionError("Price store opened read-only")
+        regions: Dict[str, List[int]] = {}
+        rows = 0
+        for ticker in sorted(self.regions, key=lambda t: self.regions[t][0]):
+            _, capacity, length = self.regions[ticker]
+            regions[ticker] = [rows, capacity, length]
+            rows += capacity
+        if rows == self.rows:
+            return 0
+
+        generation = self.generation + 1
+        for field, dtype in FIELDS.items():
+            column = self._column(field)
+            target = np.memmap(self._path(field, generation), dtype=dtype, mode="w+", shape=(rows,))
+            for ticker, (offset, _, length) in regions.items():
+                old_offset = self.regions[ticker][0]
+                target[offset:offset + length] = column[old_offset:old_offset + length]
+            target.flush()
+            del target
+
+        previous = [self._path(field) for field in FIELDS]
+        reclaimed = self.rows - rows
+        self._release()
+        self.rows, self.regions, self.generation = rows, regions, generation
+        self.flush()
+        for path in previous:
+            path.unlink(missing_ok=True)
+        return reclaimed
+
+    def close(self) -> None:
+        self.flush()
+        self._release()
+
+
+# -----------------------------
+# Database sync
+# -----------------------------
+def sync_from_db(conn, store: PriceStore, tickers: Optional[List[str]] = None, itersize: int = 50000) -> int:
+    """
+    Bring the store up to date with price_history: only bars at or after each ticker's
+    last stored bar are read, streamed through a server-side cursor. Returns bars written.
+    """
+    if tickers is None:
+        with conn.cursor() as cur:
+            cur.execute("SELECT ticker FROM companies ORDER BY ticker")
+            tickers = [t for (t,) in cur.fetchall()]
+    since = [store.last_time(t) for t in tickers]
+
+    written = 0
+    with conn.cursor(name="price_store_sync") as cur:
+        cur.itersize = itersize
+        cur.execute(
+            """
+            SELECT p.ticker, time, open::float8, high::float8, low::float8, close::float8, volume
+            FROM price_history p
+            JOIN unnest(%s::text[], %s::timestamp[]) AS w(ticker, since) ON w.ticker = p.ticker
+            WHERE w.since IS NULL OR time >= w.since
+            ORDER BY p.ticker, time
+            """,
+            (list(tickers), since),
+        )
+        # Rows arrive grouped by ticker; a ticker split across fetches continues where it stopped
+        while True:
+            rows = cur.fetchmany(itersize)
+            if not rows:
+                break
+            for ticker, run in groupby(rows, key=itemgetter(0)):
+                bars = list(run)
+                columns = {f: np.array([b[i + 2] for b in bars], dtype=float) for i, f in enumerate(PRICE_FIELDS)}
+                written += store.write(ticker, np.array([b[1] for b in bars], dtype="datetime64[s]"), columns)
+            store.flush()
+    return written
+
+
+def main():
+    import psycopg2
+
+    parser = argparse.ArgumentParser(description="Build or refresh the local price store from price_history")
+    parser.add_argument("--root", default=os.getenv("PRICE_STORE_DIR", "../storage/price_store"), help="Store directory")
+    parser.add_argument("--tickers", help="Comma-separated tickers (default: every company)")
+    parser.add_argument("--compact", action="store_true", help="Reclaim the regions left behind by relocated tickers")
+    args = parser.parse_args()
+
+    # Same defaults as the ingestion jobs that fill price_history
+    conn = psycopg2.connect(
+        host=os.getenv("DB_HOST", "localhost"),
+        port=int(os.getenv("DB_PORT", "5433")),
+        dbname=os.getenv("DB_NAME", "stock_screener"),
+        user=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD", "25101974"),
+    )
+    store = PriceStore(args.root, mode="a")
+    try:
+        tickers = [t.strip().upper() for t in args.tickers.split(",")] if args.tickers else None
+        written = sync_from_db(conn, store, tickers)
+        print(f"Wrote {written} bars for {len(store)} tickers to {args.root}")
+        if args.compact:
+            print(f"Compacted {args.root}: {store.compact()} rows reclaimed")
+    finally:
+        store.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()